@@ -0,0 +1,42 @@
+"""Hatch build hook that ships precompiled Jinja2 templates in the wheel.
+
+Templates under src/mpm/templates are compiled into Python modules and added to
+the wheel as mpm/templates/_compiled. Editable installs skip this step and render
+from the template sources, so template edits take effect immediately.
+"""
+
+import importlib.util
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+
+class CustomBuildHook(BuildHookInterface):
+    """Compile templates into a temporary directory and force-include it in the wheel."""
+
+    def initialize(self, version: str, build_data: dict[str, Any]) -> None:
+        if self.target_name != "wheel" or version == "editable":
+            return
+
+        from jinja2 import FileSystemLoader
+
+        src = Path(self.root) / "src" / "mpm"
+        # Load renderer.py directly: importing the mpm package would require its runtime dependencies
+        spec = importlib.util.spec_from_file_location("_mpm_renderer", src / "generators" / "renderer.py")
+        assert spec is not None and spec.loader is not None
+        renderer = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(renderer)
+
+        self._compiled_dir = Path(tempfile.mkdtemp(prefix="mpm-templates-"))
+        count = renderer.compile_templates(self._compiled_dir, FileSystemLoader(src / "templates"))
+        self.app.display_info(f"Precompiled {count} templates")
+
+        build_data["force_include"][str(self._compiled_dir)] = f"mpm/templates/{renderer.COMPILED_DIR_NAME}"
+
+    def finalize(self, version: str, build_data: dict[str, Any], artifact_path: str) -> None:
+        compiled_dir = getattr(self, "_compiled_dir", None)
+        if compiled_dir is not None:
+            shutil.rmtree(compiled_dir, ignore_errors=True)
@@ -0,0 +1,5 @@
+"""Allow running the CLI with `python -m mpm`."""
+
+from mpm.cli import app
+
+app(prog_name="mpm")
@@ -1,17 +1,27 @@
-"""MPM CLI - Modern Python Monorepo scaffolding tool."""
+"""MPM CLI - Modern Python Monorepo scaffolding tool.
 
+Only typer is imported at module load. Everything else (rich, pydantic, jinja2,
+questionary) is imported inside the command that needs it, so `mpm --version`,
+`--help` and shell completion stay fast.
+"""
+
+from __future__ import annotations
+
+from functools import cache
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
 
 from mpm import __version__
-from mpm.config import DocsTheme, LicenseType, ProjectConfig, ProjectStructure, PythonVersion
-from mpm.generators.project import generate_project
-from mpm.prompts import gather_project_config
-from mpm.utils import validate_project_name
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from mpm.config import LicenseType, ProjectConfig
+    from mpm.generators.package import PackageSpec
+    from mpm.generators.sync import IndexOptions
+    from mpm.utils import ProjectContext
 
 app = typer.Typer(
     name="mpm",
@@ -19,22 +29,42 @@ app = typer.Typer(
     add_completion=True,
     no_args_is_help=False,
 )
-console = Console()
+
+
+@cache
+def _console(stderr: bool = False) -> Console:
+    """Return the shared rich console, importing rich on first use."""
+    from rich.console import Console
+
+    return Console(stderr=stderr)
+
 
 # Subcommand for adding packages
 add_app = typer.Typer(help="Add a new package to an existing project")
 app.add_typer(add_app, name="add")
 
+# Subcommand for maintaining pre-resolved uv.lock seeds
+locks_app = typer.Typer(help="Manage pre-resolved uv.lock seeds used by mpm new")
+app.add_typer(locks_app, name="locks")
+
+# Subcommand for maintaining a local wheel directory for offline generation
+wheelhouse_app = typer.Typer(help="Manage local wheel directories for mpm new --offline")
+app.add_typer(wheelhouse_app, name="wheelhouse")
+
+deps_app = typer.Typer(help="Manage dependencies between workspace packages")
+app.add_typer(deps_app, name="deps")
+
 
 def version_callback(value: bool) -> None:
     if value:
-        console.print(f"mpm version {__version__}")
+        typer.echo(f"mpm version {__version__}")
         raise typer.Exit()
 
 
 @app.command("new")
 def new_project(
-    project_name: Annotated[str, typer.Argument(help="Project name")],
+    ctx: typer.Context,
+    project_name: Annotated[str | None, typer.Argument(help="Project name")] = None,
     monorepo: Annotated[bool, typer.Option("--monorepo", "-m", help="Create monorepo structure")] = False,
     single: Annotated[bool, typer.Option("--single", "-s", help="Create single package structure")] = False,
     python: Annotated[str, typer.Option("--python", "-p", help="Python version")] = "3.13",
@@ -48,9 +78,37 @@ def new_project(
     license_type: Annotated[str, typer.Option("--license", "-l", help="License type")] = "MIT",
     no_git: Annotated[bool, typer.Option(help="Skip git initialization")] = False,
     no_sync: Annotated[bool, typer.Option("--no-sync", help="Skip running uv sync after generation")] = False,
+    quiet: Annotated[
+        bool, typer.Option("--quiet", "-q", help="Write git/uv output to a log file instead of the console")
+    ] = False,
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Accept defaults (non-interactive)")] = False,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", help="Parallel render/write workers (0 = auto)")] = 0,
+    dry_run: Annotated[bool, typer.Option("--dry-run", help="List the files that would be generated")] = False,
+    offline: Annotated[bool, typer.Option("--offline", help="Run uv sync without network access")] = False,
+    wheelhouse: Annotated[
+        Path | None,
+        typer.Option("--wheelhouse", help="Install wheels from this directory (see mpm wheelhouse build)"),
+    ] = None,
+    archive: Annotated[
+        str | None,
+        typer.Option(
+            "--archive",
+            help="Write the project to a .tar.gz/.tgz/.tar.bz2/.tar.xz/.tar/.zip archive instead ('-' for stdout)",
+        ),
+    ] = None,
+    from_spec: Annotated[
+        Path | None,
+        typer.Option("--from-spec", help="Create every project listed in a fleet spec ([[project]] tables)"),
+    ] = None,
 ) -> None:
     """Create a new Modern Python Monorepo project with a given name."""
+    if from_spec is not None:
+        _check_fleet_options(ctx)
+        _create_fleet(from_spec, jobs, no_git, no_sync, offline, wheelhouse)
+        return
+    if project_name is None:
+        _console().print("[red]Error:[/red] Missing project name (or --from-spec).")
+        raise typer.Exit(1)
     _create_project(
         project_name=project_name,
         monorepo=monorepo,
@@ -66,7 +124,13 @@ def new_project(
         license_type=license_type,
         no_git=no_git,
         no_sync=no_sync,
+        quiet=quiet,
         yes=yes,
+        jobs=jobs,
+        dry_run=dry_run,
+        offline=offline,
+        wheelhouse=wheelhouse,
+        archive=archive,
     )
 
 
@@ -86,7 +150,24 @@ def main(
     license_type: Annotated[str, typer.Option("--license", "-l", help="License type")] = "MIT",
     no_git: Annotated[bool, typer.Option(help="Skip git initialization")] = False,
     no_sync: Annotated[bool, typer.Option("--no-sync", help="Skip running uv sync after generation")] = False,
+    quiet: Annotated[
+        bool, typer.Option("--quiet", "-q", help="Write git/uv output to a log file instead of the console")
+    ] = False,
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Accept defaults (non-interactive)")] = False,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", help="Parallel render/write workers (0 = auto)")] = 0,
+    dry_run: Annotated[bool, typer.Option("--dry-run", help="List the files that would be generated")] = False,
+    offline: Annotated[bool, typer.Option("--offline", help="Run uv sync without network access")] = False,
+    wheelhouse: Annotated[
+        Path | None,
+        typer.Option("--wheelhouse", help="Install wheels from this directory (see mpm wheelhouse build)"),
+    ] = None,
+    archive: Annotated[
+        str | None,
+        typer.Option(
+            "--archive",
+            help="Write the project to a .tar.gz/.tgz/.tar.bz2/.tar.xz/.tar/.zip archive instead ('-' for stdout)",
+        ),
+    ] = None,
     version: Annotated[
         bool, typer.Option("--version", "-v", callback=version_callback, is_eager=True, help="Show version")
     ] = False,
@@ -115,20 +196,43 @@ def main(
             license_type=license_type,
             no_git=no_git,
             no_sync=no_sync,
+            quiet=quiet,
             yes=yes,
+            jobs=jobs,
+            dry_run=dry_run,
+            offline=offline,
+            wheelhouse=wheelhouse,
+            archive=archive,
         )
     else:
         # Fully interactive mode
-        config = gather_project_config(None)
-        config.init_git = not no_git
-        config.auto_sync = not no_sync
-        output_path = Path.cwd() / config.project_slug
-        generate_project(config, output_path)
-        _show_success(config.project_slug)
+        from mpm.generators.project import generate_project
+        from mpm.generators.steps import get_step_log
+        from mpm.generators.warmup import Warmup
+        from mpm.prompts import gather_project_config
+
+        index = _index_options(offline, wheelhouse)
+        # Compile templates and fill the uv cache while the remaining prompts are answered
+        with Warmup(sync=not (no_sync or dry_run or archive), index=index) as warmup:
+            config = gather_project_config(None, warmup=warmup)
+            config.init_git = not no_git
+            config.auto_sync = not no_sync
+            if archive:
+                _write_project_archive(config, archive, jobs)
+                return
+            output_path = Path.cwd() / config.project_slug
+            log_path = _quiet_log_path(config.project_slug) if quiet else None
+            with get_step_log().redirect(log_path):
+                generate_project(config, output_path, jobs=jobs or None, dry_run=dry_run, index=index)
+        if not dry_run:
+            _show_log_path(log_path)
+            _show_success(config.project_slug)
 
 
 def _parse_license_type(license_str: str) -> LicenseType:
     """Parse license string to LicenseType enum."""
+    from mpm.config import LicenseType
+
     license_lower = license_str.lower()
     if license_lower == "none":
         return LicenseType.NONE
@@ -157,13 +261,24 @@ def _create_project(
     license_type: str,
     no_git: bool,
     no_sync: bool,
+    quiet: bool,
     yes: bool,
+    jobs: int,
+    dry_run: bool,
+    offline: bool,
+    wheelhouse: Path | None,
+    archive: str | None,
 ) -> None:
     """Internal function to create a project."""
+    from mpm.config import DocsTheme, ProjectConfig, ProjectStructure, PythonVersion
+    from mpm.generators.project import generate_project
+    from mpm.generators.steps import get_step_log
+    from mpm.utils import validate_project_name
+
     # Validate project name
     is_valid, error_message = validate_project_name(project_name)
     if not is_valid:
-        console.print(f"[red]Error:[/red] Invalid project name: {error_message}")
+        _console().print(f"[red]Error:[/red] Invalid project name: {error_message}")
         raise typer.Exit(1)
 
     # Determine structure: --monorepo flag enables monorepo, otherwise single package
@@ -192,14 +307,141 @@ def _create_project(
         auto_sync=not no_sync,
     )
 
+    if archive:
+        _write_project_archive(config, archive, jobs)
+        return
+
     output_path = Path.cwd() / config.project_slug
-    generate_project(config, output_path)
-    _show_success(config.project_slug)
+    index = _index_options(offline, wheelhouse)
+    log_path = _quiet_log_path(config.project_slug) if quiet else None
+    with get_step_log().redirect(log_path):
+        generate_project(config, output_path, jobs=jobs or None, dry_run=dry_run, index=index)
+    if not dry_run:
+        _show_log_path(log_path)
+        _show_success(config.project_slug)
+
+
+# mpm new options that apply to every project of a fleet; the rest come from the spec
+_FLEET_OPTIONS = {"from_spec", "jobs", "no_git", "no_sync", "offline", "wheelhouse"}
+
+
+def _check_fleet_options(ctx: typer.Context) -> None:
+    """Reject mpm new arguments that --from-spec would otherwise ignore."""
+    given = []
+    for param in ctx.command.params:
+        source = ctx.get_parameter_source(param.name or "")
+        # Compared by name: the ParameterSource enum lives in typer's bundled click
+        if param.name in _FLEET_OPTIONS or source is None or source.name in ("DEFAULT", "DEFAULT_MAP"):
+            continue
+        given.append(param.opts[0] if param.param_type_name == "option" else (param.name or "").upper())
+    if given:
+        _console().print(
+            f"[red]Error:[/red] {', '.join(given)} cannot be used with --from-spec; "
+            "set project options in the spec instead."
+        )
+        raise typer.Exit(1)
+
+
+def _create_fleet(spec: Path, jobs: int, no_git: bool, no_sync: bool, offline: bool, wheelhouse: Path | None) -> None:
+    """Create every project in a fleet spec in the current directory, on a process pool."""
+    import time
+
+    from rich.markup import escape
+
+    from mpm.generators.fleet import generate_fleet, load_fleet_spec
+    from mpm.generators.steps import format_step, format_timings
+    from mpm.generators.tree import default_jobs
+
+    try:
+        configs = load_fleet_spec(spec)
+    except (OSError, ValueError) as err:
+        # escape: the messages name [[project]] tables, which are not markup
+        _console().print(f"[red]Error:[/red] Could not read {spec}: {escape(str(err))}")
+        raise typer.Exit(1) from None
+    index = _index_options(offline, wheelhouse)
+    for config in configs:
+        config.init_git = config.init_git and not no_git
+        config.auto_sync = config.auto_sync and not no_sync
+
+    # One directory of per-project logs, named like the --quiet log files
+    log_dir = _quiet_log_path(spec.stem).with_suffix("")
+    workers = jobs or default_jobs()
+    _console().print(f"[dim]Creating {len(configs)} projects with {workers} workers...[/dim]")
+    start = time.perf_counter()
+    results = generate_fleet(
+        configs,
+        Path.cwd(),
+        jobs=workers,
+        log_dir=log_dir,
+        index=index,
+        on_done=lambda result: _console().print(format_step(result)),
+    )
+    _console().print(format_timings(results, "Project timings", "Project", time.perf_counter() - start))
+    _console().print(f"[dim]Logs: {log_dir}[/dim]")
+
+    failed = sum(not result.ok for result in results)
+    if failed:
+        _console().print(f"[red]Error:[/red] {failed} of {len(results)} projects failed")
+        raise typer.Exit(1)
+    _console().print(f"[green]\u2713[/green] Created {len(results)} projects")
+
+
+def _index_options(offline: bool, wheelhouse: Path | None) -> IndexOptions | None:
+    """Build the uv index options for --offline/--wheelhouse (None when neither is given)."""
+    from mpm.generators.sync import IndexOptions
+
+    if wheelhouse is not None and not wheelhouse.is_dir():
+        _console().print(f"[red]Error:[/red] Wheelhouse not found: {wheelhouse}")
+        raise typer.Exit(1)
+    if not offline and wheelhouse is None:
+        return None
+    return IndexOptions(offline=offline, wheelhouse=wheelhouse.resolve() if wheelhouse else None)
+
+
+def _quiet_log_path(project_slug: str) -> Path:
+    """Log file in the mpm cache for the git and uv output of mpm new --quiet."""
+    from datetime import datetime
+
+    from mpm.utils import user_cache_dir
+
+    return user_cache_dir() / "logs" / f"{project_slug}-{datetime.now():%Y%m%d-%H%M%S}.log"
+
+
+def _show_log_path(log_path: Path | None) -> None:
+    """Point at the --quiet log file, if any command wrote to it."""
+    if log_path is not None and log_path.exists():
+        _console().print(f"[dim]Command output written to {log_path}[/dim]")
+
+
+def _write_project_archive(config: ProjectConfig, archive: str, jobs: int) -> None:
+    """Render a project into an archive file or stdout."""
+    from mpm.generators.project import archive_project, post_generation_steps
+
+    # Keep stdout clean when the archive itself is written there
+    console = _console(stderr=archive == "-")
+    try:
+        tree = archive_project(config, archive, jobs=jobs or None)
+    except ValueError as err:
+        console.print(f"[red]Error:[/red] {err}")
+        raise typer.Exit(1) from None
+    except OSError as err:
+        console.print(f"[red]Error:[/red] Could not write archive {archive}: {err}")
+        raise typer.Exit(1) from None
+
+    destination = "stdout" if archive == "-" else archive
+    console.print(
+        f"[green]\u2713[/green] Wrote {len(tree)} files for [bold]{config.project_slug}[/bold] to {destination}"
+    )
+    skipped = post_generation_steps(config)
+    if skipped:
+        console.print(f"[dim]Skipped for archives: {', '.join(skipped)}[/dim]")
 
 
 def _show_success(project_slug: str) -> None:
     """Show success message."""
-    console.print(
+    from rich.panel import Panel
+
+    _console().print(
         Panel.fit(
             f"[green]\u2713[/green] Created [bold]{project_slug}[/bold]\n\n"
             f"Next steps:\n"
@@ -211,22 +453,105 @@ def _show_success(project_slug: str) -> None:
     )
 
 
+def _run_pending_sync(no_sync: bool) -> None:
+    """Run the uv sync queued by the command (once per project), or report that it was skipped."""
+    from mpm.generators.steps import format_step
+    from mpm.generators.sync import get_sync_queue
+
+    queue = get_sync_queue()
+    if not queue:
+        return
+    if no_sync:
+        reasons = ", ".join(queue.skip())
+        _console().print(f"[dim]Skipped uv sync ({reasons}); run 'uv sync' to install them[/dim]")
+        return
+
+    _console().print(f"[dim]Running uv sync for {', '.join(queue.reasons())}...[/dim]")
+    for result in queue.run():
+        _console().print(format_step(result))
+
+
+def _require_project() -> ProjectContext:
+    """Resolve the current project once for an `mpm add` command, or exit with an error."""
+    from mpm.utils import resolve_project
+
+    try:
+        project = resolve_project()
+    except (OSError, ValueError) as err:
+        _console().print(f"[red]Error:[/red] Could not read mpm.toml: {err}")
+        raise typer.Exit(1) from None
+    if project is None:
+        _console().print("[red]Error:[/red] No mpm.toml found. This command requires an mpm-managed project.")
+        _console().print("[dim]Create a new project with 'mpm new <name>' first.[/dim]")
+        raise typer.Exit(1)
+    if not project.namespace:
+        _console().print("[red]Error:[/red] Could not read namespace from mpm.toml.")
+        raise typer.Exit(1)
+    return project
+
+
+def _validate_packages(specs: list[PackageSpec]) -> None:
+    """Check every package name before anything is generated, or exit with an error."""
+    from mpm.utils import validate_project_name
+
+    seen: set[str] = set()
+    for spec in specs:
+        is_valid, error_message = validate_project_name(spec.name)
+        if not is_valid:
+            _console().print(f"[red]Error:[/red] Invalid package name '{spec.name}': {error_message}")
+            raise typer.Exit(1)
+        if spec.name in seen:
+            _console().print(f"[red]Error:[/red] Package '{spec.name}' is listed more than once.")
+            raise typer.Exit(1)
+        seen.add(spec.name)
+
+
+def _add_packages(specs: list[PackageSpec], jobs: int | None, dry_run: bool) -> None:
+    """Validate specs, resolve the project once and add every package in one pass."""
+    from mpm.generators.package import add_packages
+
+    _validate_packages(specs)
+    project = _require_project()
+    add_packages(project, specs, jobs=jobs, dry_run=dry_run)
+
+
 @add_app.callback(invoke_without_command=True)
-def add_interactive(ctx: typer.Context) -> None:
+def add_interactive(
+    ctx: typer.Context,
+    from_file: Annotated[
+        Path | None,
+        typer.Option("--from", help="Add every package listed in a manifest ([[package]] tables)"),
+    ] = None,
+    jobs: Annotated[int | None, typer.Option("--jobs", "-j", help="Worker threads for --from")] = None,
+    dry_run: Annotated[bool, typer.Option("--dry-run", help="List the files --from would generate")] = False,
+) -> None:
     """Add a package interactively if no subcommand given."""
+    if from_file is not None:
+        from rich.markup import escape
+
+        from mpm.generators.package import load_package_manifest
+
+        if ctx.invoked_subcommand is not None:
+            _console().print("[red]Error:[/red] --from cannot be combined with a subcommand.")
+            raise typer.Exit(1)
+        try:
+            specs = load_package_manifest(from_file)
+        except (OSError, ValueError) as err:
+            # escape: the messages name [[package]] tables, which are not markup
+            _console().print(f"[red]Error:[/red] Could not read {from_file}: {escape(str(err))}")
+            raise typer.Exit(1) from None
+        _add_packages(specs, jobs, dry_run)
+        return
+
     if ctx.invoked_subcommand is None:
         # Interactive mode for add
         import questionary
         from questionary import Choice
 
         from mpm.generators.package import add_package
-        from mpm.utils import find_project_root, get_namespace_from_project
+        from mpm.utils import validate_project_name
 
-        project_root = find_project_root()
-        if not project_root:
-            console.print("[red]Error:[/red] No mpm.toml found. This command requires an mpm-managed project.")
-            console.print("[dim]Create a new project with 'mpm new <name>' first.[/dim]")
-            raise typer.Exit(1)
+        project = _require_project()
 
         package_type = questionary.select(
             "Package type:",
@@ -266,205 +591,289 @@ def add_interactive(ctx: typer.Context) -> None:
                 or False
             )
 
-        namespace = get_namespace_from_project(project_root)
-        if not namespace:
-            console.print("[red]Error:[/red] Could not read namespace from mpm.toml.")
-            raise typer.Exit(1)
-
-        add_package(
-            package_name,
-            package_type,
-            description,
-            with_docker=with_docker,
-            project_root=project_root,
-            namespace=namespace,
-        )
+        add_package(project, package_name, package_type, description, with_docker=with_docker)
 
 
 @add_app.command("lib")
 def add_lib(
-    name: Annotated[str, typer.Argument(help="Library name")],
+    names: Annotated[list[str], typer.Argument(help="Library names")],
     description: Annotated[str, typer.Option("--description", "-d", help="Library description")] = "",
+    dry_run: Annotated[bool, typer.Option("--dry-run", help="List the files that would be generated")] = False,
+    jobs: Annotated[int | None, typer.Option("--jobs", "-j", help="Worker threads for rendering")] = None,
 ) -> None:
-    """Add a new library package to libs/."""
-    from mpm.generators.package import add_package
-    from mpm.utils import find_project_root, get_namespace_from_project
-
-    # Validate package name
-    is_valid, error_message = validate_project_name(name)
-    if not is_valid:
-        console.print(f"[red]Error:[/red] Invalid package name: {error_message}")
-        raise typer.Exit(1)
+    """Add one or more library packages to libs/."""
+    from mpm.generators.package import PackageSpec
 
-    project_root = find_project_root()
-    if not project_root:
-        console.print("[red]Error:[/red] No mpm.toml found. This command requires an mpm-managed project.")
-        console.print("[dim]Create a new project with 'mpm new <name>' first.[/dim]")
-        raise typer.Exit(1)
-
-    namespace = get_namespace_from_project(project_root)
-    if not namespace:
-        console.print("[red]Error:[/red] Could not read namespace from mpm.toml.")
-        raise typer.Exit(1)
-
-    add_package(name, "lib", description, project_root=project_root, namespace=namespace)
+    _add_packages([PackageSpec(name, "lib", description) for name in names], jobs, dry_run)
 
 
 @add_app.command("app")
 def add_app_cmd(
-    name: Annotated[str, typer.Argument(help="Application name")],
+    names: Annotated[list[str], typer.Argument(help="Application names")],
     description: Annotated[str, typer.Option("--description", "-d", help="App description")] = "",
     docker: Annotated[bool, typer.Option("--docker", help="Include Dockerfile")] = False,
+    dry_run: Annotated[bool, typer.Option("--dry-run", help="List the files that would be generated")] = False,
+    jobs: Annotated[int | None, typer.Option("--jobs", "-j", help="Worker threads for rendering")] = None,
 ) -> None:
-    """Add a new application package to apps/."""
-    from mpm.generators.package import add_package
-    from mpm.utils import find_project_root, get_namespace_from_project
-
-    # Validate package name
-    is_valid, error_message = validate_project_name(name)
-    if not is_valid:
-        console.print(f"[red]Error:[/red] Invalid package name: {error_message}")
-        raise typer.Exit(1)
-
-    project_root = find_project_root()
-    if not project_root:
-        console.print("[red]Error:[/red] No mpm.toml found. This command requires an mpm-managed project.")
-        console.print("[dim]Create a new project with 'mpm new <name>' first.[/dim]")
-        raise typer.Exit(1)
-
-    namespace = get_namespace_from_project(project_root)
-    if not namespace:
-        console.print("[red]Error:[/red] Could not read namespace from mpm.toml.")
-        raise typer.Exit(1)
+    """Add one or more application packages to apps/."""
+    from mpm.generators.package import PackageSpec
 
-    add_package(name, "app", description, with_docker=docker, project_root=project_root, namespace=namespace)
+    _add_packages([PackageSpec(name, "app", description, docker) for name in names], jobs, dry_run)
 
 
 @add_app.command("docker")
 def add_docker() -> None:
     """Add Docker configuration to an existing project."""
-    from mpm.generators.features import add_docker_feature
-    from mpm.utils import find_project_root, load_mpm_config, save_mpm_config
+    _add_features(["docker"])
 
-    project_root = find_project_root()
-    if not project_root:
-        console.print("[red]Error:[/red] No mpm.toml found. This command requires an mpm-managed project.")
-        console.print("[dim]Create a new project with 'mpm new <name>' first.[/dim]")
-        raise typer.Exit(1)
 
-    mpm_config_path = project_root / "mpm.toml"
-    mpm_config = load_mpm_config(mpm_config_path)
+@add_app.command("ci")
+def add_ci() -> None:
+    """Add GitHub Actions CI to an existing project."""
+    _add_features(["ci"])
+
 
-    if mpm_config.with_docker:
-        console.print("[yellow]Docker is already enabled for this project.[/yellow]")
-        return
+@add_app.command("pypi")
+def add_pypi() -> None:
+    """Add PyPI publishing workflow to an existing project."""
+    _add_features(["pypi"])
 
-    add_docker_feature(project_root, mpm_config)
 
-    # Update mpm.toml
-    mpm_config.with_docker = True
-    save_mpm_config(mpm_config, mpm_config_path)
+@add_app.command("docs")
+def add_docs(
+    theme: Annotated[str, typer.Option("--theme", "-t", help="Docs theme: material or shadcn")] = "material",
+    no_sync: Annotated[bool, typer.Option("--no-sync", help="Skip installing the docs dependencies")] = False,
+) -> None:
+    """Add MkDocs documentation to an existing project."""
+    _add_features(["docs"], theme=theme, no_sync=no_sync)
 
-    console.print("[green]\u2713[/green] Added Docker configuration")
 
+@add_app.command("features")
+def add_feature_set(
+    features: Annotated[list[str], typer.Argument(help="Features to add: docker, ci, pypi, docs")],
+    theme: Annotated[str, typer.Option("--theme", "-t", help="Docs theme: material or shadcn")] = "material",
+    no_sync: Annotated[bool, typer.Option("--no-sync", help="Skip installing new dependencies")] = False,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", help="Parallel render/write workers (0 = auto)")] = 0,
+) -> None:
+    """Add several features at once, e.g. mpm add features docker ci pypi docs.
 
-@add_app.command("ci")
-def add_ci() -> None:
-    """Add GitHub Actions CI to an existing project."""
-    from mpm.generators.features import add_ci_feature
-    from mpm.utils import find_project_root, load_mpm_config, save_mpm_config
+    mpm.toml is read and written once, all files are rendered in one pass
+    and dependencies are installed with a single uv sync.
+    """
+    _add_features(features, theme=theme, no_sync=no_sync, jobs=jobs)
 
-    project_root = find_project_root()
-    if not project_root:
-        console.print("[red]Error:[/red] No mpm.toml found. This command requires an mpm-managed project.")
-        console.print("[dim]Create a new project with 'mpm new <name>' first.[/dim]")
-        raise typer.Exit(1)
 
-    mpm_config_path = project_root / "mpm.toml"
-    mpm_config = load_mpm_config(mpm_config_path)
+# Messages for each feature: already enabled, added
+_FEATURE_MESSAGES = {
+    "docker": ("Docker is already enabled for this project.", "Added Docker configuration"),
+    "ci": ("CI is already enabled for this project.", "Added GitHub Actions CI"),
+    "pypi": ("PyPI publishing is already enabled for this project.", "Added PyPI publishing workflow"),
+    "docs": ("Docs are already enabled for this project.", "Added MkDocs documentation"),
+}
+
+
+def _add_features(names: list[str], theme: str = "material", no_sync: bool = False, jobs: int = 0) -> None:
+    """Add features to the current project, loading and saving mpm.toml once."""
+    from mpm.config import DocsTheme
+    from mpm.generators.features import Feature, add_features, enabled_features, mark_enabled
 
-    if mpm_config.with_ci:
-        console.print("[yellow]CI is already enabled for this project.[/yellow]")
+    choices = [feature.value for feature in Feature]
+    unknown = [name for name in names if name.lower() not in choices]
+    if unknown:
+        _console().print(f"[red]Error:[/red] Unknown feature '{unknown[0]}'. Choose from: {', '.join(choices)}")
+        raise typer.Exit(1)
+    requested = {Feature(name.lower()) for name in names}
+
+    project = _require_project()
+    enabled = enabled_features(project.config)
+    for feature in Feature:
+        if feature in requested and feature in enabled:
+            _console().print(f"[yellow]{_FEATURE_MESSAGES[feature.value][0]}[/yellow]")
+    # Always added in the same order, whatever order they were given in
+    pending = [feature for feature in Feature if feature in requested and feature not in enabled]
+    if not pending:
         return
 
-    add_ci_feature(project_root, mpm_config)
+    # The theme only matters (and is only checked) when docs are being added
+    docs_theme = DocsTheme.MATERIAL
+    if Feature.DOCS in pending:
+        try:
+            docs_theme = DocsTheme(theme)
+        except ValueError:
+            _console().print(f"[red]Error:[/red] Invalid theme '{theme}'. Use 'material' or 'shadcn'.")
+            raise typer.Exit(1) from None
+
+    if Feature.PYPI in pending and Feature.CI not in enabled and Feature.CI not in pending:
+        _console().print("[yellow]Warning:[/yellow] CI is not enabled. Consider adding CI first with 'mpm add ci'.")
+
+    summary = add_features(project.root, project.config, pending, theme=docs_theme, jobs=jobs or None)
+    _console().print(f"[dim]Files: {summary}[/dim]")
 
     # Update mpm.toml
-    mpm_config.with_ci = True
-    save_mpm_config(mpm_config, mpm_config_path)
+    mark_enabled(project.config, pending, docs_theme)
+    project.save_config()
+
+    _run_pending_sync(no_sync)
+    for feature in pending:
+        _console().print(f"[green]\u2713[/green] {_FEATURE_MESSAGES[feature.value][1]}")
+    if Feature.DOCS in pending:
+        _console().print("[dim]Run 'uv run poe docs' to start the docs server[/dim]")
+
+
+@locks_app.command("build")
+def locks_build(
+    output: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="Directory to write seeds to (default: the mpm cache)"),
+    ] = None,
+    python: Annotated[
+        list[str] | None,
+        typer.Option("--python", "-p", help="Python version to build seeds for (repeatable, default: all)"),
+    ] = None,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", help="Parallel uv lock runs (0 = auto)")] = 0,
+) -> None:
+    """Resolve uv.lock seeds for every standard project shape.
 
-    console.print("[green]\u2713[/green] Added GitHub Actions CI")
+    Run after changing the dependencies in the templates. Use
+    --output src/mpm/locks to ship the seeds with mpm.
+    """
+    from mpm.config import PythonVersion
+    from mpm.generators.lockseed import SEEDS_DIR_NAME, build_lock_seeds, seed_configs
+    from mpm.generators.steps import format_step
+    from mpm.generators.tree import default_jobs
+    from mpm.utils import user_cache_dir
 
+    try:
+        versions = [PythonVersion(version) for version in python] if python else None
+    except ValueError as err:
+        _console().print(f"[red]Error:[/red] {err}")
+        raise typer.Exit(1) from None
 
-@add_app.command("pypi")
-def add_pypi() -> None:
-    """Add PyPI publishing workflow to an existing project."""
-    from mpm.generators.features import add_pypi_feature
-    from mpm.utils import find_project_root, load_mpm_config, save_mpm_config
+    output = output or user_cache_dir() / SEEDS_DIR_NAME
+    configs = seed_configs(versions)
+    _console().print(f"[dim]Resolving {len(configs)} lock seeds into {output}...[/dim]")
+    results = build_lock_seeds(configs, output, jobs=jobs or default_jobs())
+    for result in results:
+        _console().print(format_step(result))
 
-    project_root = find_project_root()
-    if not project_root:
-        console.print("[red]Error:[/red] No mpm.toml found. This command requires an mpm-managed project.")
-        console.print("[dim]Create a new project with 'mpm new <name>' first.[/dim]")
+    failed = sum(not result.ok for result in results)
+    if failed:
+        _console().print(f"[red]Error:[/red] {failed} of {len(results)} seeds failed")
         raise typer.Exit(1)
+    _console().print(f"[green]\u2713[/green] Built {len(results)} lock seeds")
 
-    mpm_config_path = project_root / "mpm.toml"
-    mpm_config = load_mpm_config(mpm_config_path)
 
-    if mpm_config.with_pypi:
-        console.print("[yellow]PyPI publishing is already enabled for this project.[/yellow]")
-        return
+@wheelhouse_app.command("build")
+def wheelhouse_build(
+    directory: Annotated[Path, typer.Argument(help="Directory to download wheels into")],
+    python: Annotated[
+        list[str] | None,
+        typer.Option("--python", "-p", help="Python version to download wheels for (repeatable, default: all)"),
+    ] = None,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", help="Parallel downloads (0 = auto)")] = 0,
+) -> None:
+    """Download the wheels of every standard project shape into a directory.
 
-    if not mpm_config.with_ci:
-        console.print("[yellow]Warning:[/yellow] CI is not enabled. Consider adding CI first with 'mpm add ci'.")
+    Use it with mpm new --offline --wheelhouse DIRECTORY on machines
+    without network access.
+    """
+    from mpm.config import PythonVersion
+    from mpm.generators.lockseed import seed_configs
+    from mpm.generators.steps import format_step
+    from mpm.generators.tree import default_jobs
+    from mpm.generators.wheelhouse import build_wheelhouse
 
-    add_pypi_feature(project_root, mpm_config)
+    try:
+        versions = [PythonVersion(version) for version in python] if python else None
+    except ValueError as err:
+        _console().print(f"[red]Error:[/red] {err}")
+        raise typer.Exit(1) from None
 
-    # Update mpm.toml
-    mpm_config.with_pypi = True
-    save_mpm_config(mpm_config, mpm_config_path)
+    configs = seed_configs(versions)
+    _console().print(f"[dim]Downloading wheels for {len(configs)} project shapes into {directory}...[/dim]")
+    results = build_wheelhouse(configs, directory, jobs=jobs or default_jobs())
+    for result in results:
+        _console().print(format_step(result))
 
-    console.print("[green]\u2713[/green] Added PyPI publishing workflow")
+    failed = sum(not result.ok for result in results)
+    if failed:
+        _console().print(f"[red]Error:[/red] {failed} of {len(results)} project shapes failed")
+        raise typer.Exit(1)
+    wheels = len(list(directory.glob("*.whl")))
+    _console().print(f"[green]\u2713[/green] Wheelhouse ready: {wheels} wheels in {directory}")
 
 
-@add_app.command("docs")
-def add_docs(
-    theme: Annotated[str, typer.Option("--theme", "-t", help="Docs theme: material or shadcn")] = "material",
+@app.command("graph")
+def graph(
+    output_format: Annotated[str, typer.Option("--format", "-f", help="Output format: json or dot")] = "json",
+    output: Annotated[Path | None, typer.Option("--output", "-o", help="Write the graph to a file")] = None,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", help="Parallel parser processes (0 = auto)")] = 0,
 ) -> None:
-    """Add MkDocs documentation to an existing project."""
-    from mpm.config import DocsTheme
-    from mpm.generators.features import add_docs_feature
-    from mpm.utils import find_project_root, load_mpm_config, save_mpm_config
+    """Print which workspace packages import which, from a scan of their modules.
 
-    project_root = find_project_root()
-    if not project_root:
-        console.print("[red]Error:[/red] No mpm.toml found. This command requires an mpm-managed project.")
-        console.print("[dim]Create a new project with 'mpm new <name>' first.[/dim]")
-        raise typer.Exit(1)
-
-    mpm_config_path = project_root / "mpm.toml"
-    mpm_config = load_mpm_config(mpm_config_path)
+    Parse results are cached in .mpm/imports, so later runs only parse
+    changed files.
+    """
+    from mpm.generators.tree import default_jobs
+    from mpm.graph import GraphFormat, build_import_graph
 
-    if mpm_config.with_docs:
-        console.print("[yellow]Docs are already enabled for this project.[/yellow]")
-        return
-
-    # Parse theme
     try:
-        docs_theme = DocsTheme(theme)
+        graph_format = GraphFormat(output_format.lower())
     except ValueError:
-        console.print(f"[red]Error:[/red] Invalid theme '{theme}'. Use 'material' or 'shadcn'.")
+        _console().print(f"[red]Error:[/red] Unknown format '{output_format}' (expected json or dot)")
         raise typer.Exit(1) from None
 
-    add_docs_feature(project_root, mpm_config, docs_theme)
+    project = _require_project()
+    result = build_import_graph(project.root, project.namespace, jobs=jobs or default_jobs())
+    text = result.to_json() if graph_format == GraphFormat.JSON else result.to_dot()
+    if output is not None:
+        output.write_text(text + "\n")
+    else:
+        typer.echo(text)
+    _console(stderr=True).print(
+        f"[dim]{len(result.members)} packages, {result.files} files ({result.parsed} parsed)[/dim]"
+    )
 
-    # Update mpm.toml
-    mpm_config.with_docs = True
-    mpm_config.docs_theme = docs_theme
-    save_mpm_config(mpm_config, mpm_config_path)
 
-    console.print("[green]\u2713[/green] Added MkDocs documentation")
-    console.print("[dim]Run 'uv run poe docs' to start the docs server[/dim]")
+@deps_app.command("sync")
+def deps_sync(
+    prune: Annotated[
+        bool, typer.Option("--prune", help="Remove workspace dependencies that are no longer imported")
+    ] = False,
+    no_sync: Annotated[bool, typer.Option("--no-sync", help="Skip running uv sync afterwards")] = False,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", help="Parallel parser processes and writers (0 = auto)")] = 0,
+) -> None:
+    """Declare the workspace packages each package imports in its pyproject.toml.
+
+    Adds them to dependencies with a [tool.uv.sources] workspace entry, then
+    reports dependency cycles.
+    """
+    from mpm.generators.deps import sync_dependencies
+    from mpm.generators.sync import get_sync_queue
+    from mpm.generators.tree import FileStatus, WriteSummary, default_jobs
+    from mpm.graph import build_import_graph, find_cycles
+
+    project = _require_project()
+    jobs = jobs or default_jobs()
+    graph = build_import_graph(project.root, project.namespace, jobs=jobs)
+    updates = sync_dependencies(project.root, graph, prune=prune, jobs=jobs)
+
+    summary = WriteSummary()
+    for update in updates:
+        if summary.record(update.status) != FileStatus.UNCHANGED:
+            path = update.path.relative_to(project.root)
+            _console().print(f"[green]\u2713[/green] Updated {path} [dim]({', '.join(update.changes())})[/dim]")
+    _console().print(f"[dim]Files: {summary}[/dim]")
+    if summary.written:
+        get_sync_queue().request(project.root, "internal dependencies", all_packages=True)
+        _run_pending_sync(no_sync)
+
+    cycles = find_cycles(graph.edges)
+    for cycle in cycles:
+        _console().print(f"[yellow]\u26a0[/yellow] Dependency cycle between: {', '.join(cycle)}")
+    if cycles:
+        _console().print(f"[red]Error:[/red] {len(cycles)} dependency cycles found")
+        raise typer.Exit(1)
 
 
 if __name__ == "__main__":
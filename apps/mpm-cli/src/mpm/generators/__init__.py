@@ -1,13 +1,29 @@
 """Project generators for MPM CLI."""
 
-from mpm.generators.package import add_package, generate_app_package, generate_lib_package
-from mpm.generators.project import generate_project
-from mpm.generators.renderer import TemplateRenderer
+from mpm.generators.package import (
+    PackageSpec,
+    add_package,
+    add_packages,
+    generate_app_package,
+    generate_lib_package,
+)
+from mpm.generators.plan import RenderPlan
+from mpm.generators.project import archive_project, generate_project, render_project
+from mpm.generators.renderer import TemplateRenderer, get_renderer
+from mpm.generators.tree import FileStatus, FileTree
 
 __all__ = [
+    "FileStatus",
+    "FileTree",
+    "PackageSpec",
+    "RenderPlan",
     "TemplateRenderer",
     "add_package",
+    "add_packages",
+    "archive_project",
     "generate_app_package",
     "generate_lib_package",
     "generate_project",
+    "get_renderer",
+    "render_project",
 ]
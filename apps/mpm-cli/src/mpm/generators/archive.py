@@ -0,0 +1,116 @@
+"""Archive output - stream a rendered FileTree into a tar or zip archive."""
+
+import io
+import os
+import tarfile
+import time
+import zipfile
+from pathlib import PurePosixPath
+from typing import BinaryIO, Literal
+
+from mpm.generators.tree import FileTree
+
+# tarfile stream modes used for tar archives
+TarStreamMode = Literal["w|gz", "w|bz2", "w|xz", "w|"]
+
+# A tar stream mode, or "zip" for zip archives
+ArchiveFormat = TarStreamMode | Literal["zip"]
+
+# Archive suffix -> archive format
+ARCHIVE_FORMATS: dict[str, ArchiveFormat] = {
+    ".tar.gz": "w|gz",
+    ".tgz": "w|gz",
+    ".tar.bz2": "w|bz2",
+    ".tar.xz": "w|xz",
+    ".tar": "w|",
+    ".zip": "zip",
+}
+
+# Format used when writing to stdout ("-")
+STDOUT_FORMAT: ArchiveFormat = "w|gz"
+
+FILE_MODE = 0o644
+DIR_MODE = 0o755
+
+
+def archive_format(target: str) -> ArchiveFormat:
+    """Return the archive format for a target file name, based on its suffix.
+
+    Raises:
+        ValueError: If the suffix is not a supported archive type.
+    """
+    if target == "-":
+        return STDOUT_FORMAT
+    name = target.lower()
+    for suffix, fmt in ARCHIVE_FORMATS.items():
+        if name.endswith(suffix):
+            return fmt
+    supported = ", ".join(ARCHIVE_FORMATS)
+    raise ValueError(f"Unsupported archive type '{target}' (use one of: {supported})")
+
+
+def _archive_mtime() -> int:
+    """Timestamp for archive members (honours SOURCE_DATE_EPOCH for reproducible archives)."""
+    return int(os.environ.get("SOURCE_DATE_EPOCH", time.time()))
+
+
+def _all_directories(tree: FileTree) -> list[PurePosixPath]:
+    """Every directory in the tree, parents first."""
+    directories: set[PurePosixPath] = set()
+    for leaf in tree.directories():
+        directories.add(leaf)
+        directories.update(parent for parent in leaf.parents if parent != PurePosixPath("."))
+    return sorted(directories)
+
+
+def write_archive(tree: FileTree, fileobj: BinaryIO, fmt: ArchiveFormat, prefix: str) -> None:
+    """Stream a tree into an archive without writing it to disk first.
+
+    Args:
+        tree: Rendered files
+        fileobj: Binary stream to write to (need not be seekable)
+        fmt: Format from archive_format()
+        prefix: Top-level directory name for all members (usually the project slug)
+    """
+    root = PurePosixPath(prefix)
+    mtime = _archive_mtime()
+
+    if fmt == "zip":
+        _write_zip(tree, fileobj, root, mtime)
+    else:
+        _write_tar(tree, fileobj, fmt, root, mtime)
+
+
+def _write_tar(tree: FileTree, fileobj: BinaryIO, fmt: TarStreamMode, root: PurePosixPath, mtime: int) -> None:
+    with tarfile.open(fileobj=fileobj, mode=fmt) as archive:
+        for directory in [PurePosixPath("."), *_all_directories(tree)]:
+            info = tarfile.TarInfo(str(root / directory))
+            info.type = tarfile.DIRTYPE
+            info.mode = DIR_MODE
+            info.mtime = mtime
+            archive.addfile(info)
+
+        for path in tree:
+            tree_file = tree.files[path]
+            info = tarfile.TarInfo(str(root / path))
+            info.size = len(tree_file.content)
+            info.mode = tree_file.mode if tree_file.mode is not None else FILE_MODE
+            info.mtime = mtime
+            archive.addfile(info, io.BytesIO(tree_file.content))
+
+
+def _write_zip(tree: FileTree, fileobj: BinaryIO, root: PurePosixPath, mtime: int) -> None:
+    # Zip timestamps cannot predate 1980
+    date_time = max(time.localtime(mtime)[:6], (1980, 1, 1, 0, 0, 0))
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for directory in [PurePosixPath("."), *_all_directories(tree)]:
+            info = zipfile.ZipInfo(f"{root / directory}/", date_time=date_time)
+            info.external_attr = (0o040000 | DIR_MODE) << 16 | 0x10
+            archive.writestr(info, b"")
+
+        for path in tree:
+            tree_file = tree.files[path]
+            info = zipfile.ZipInfo(str(root / path), date_time=date_time)
+            info.external_attr = (0o100000 | (tree_file.mode or FILE_MODE)) << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, tree_file.content)
@@ -0,0 +1,126 @@
+"""Internal dependency sync - declare the workspace packages each package imports.
+
+The import graph (see mpm.graph) says which workspace packages a package
+uses; each one is added to the package's `dependencies` with a
+`[tool.uv.sources]` entry pointing at the workspace. All pyproject.toml files
+are updated in one parallel pass, and files that already declare everything
+are not written.
+"""
+
+import copy
+import re
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import tomli_w
+
+from mpm.generators.tree import FileStatus, default_jobs, write_if_changed
+from mpm.graph import ImportGraph
+from mpm.utils import normalize_name
+
+_REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def requirement_name(requirement: str) -> str:
+    """Normalized project name of a requirement string, e.g. 'Greeter>=1.0' -> 'greeter'."""
+    return normalize_name(_project_name(requirement))
+
+
+def _project_name(requirement: str) -> str:
+    """Project name of a requirement string as written."""
+    match = _REQUIREMENT_NAME.match(requirement)
+    return match.group(1) if match else ""
+
+
+@dataclass(frozen=True, slots=True)
+class DependencyUpdate:
+    """Result of syncing one package: its pyproject.toml path, write status and changes."""
+
+    path: Path
+    status: FileStatus
+    added: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    sources: tuple[str, ...] = ()
+
+    def changes(self) -> list[str]:
+        """Short description of each change, e.g. '+core', '-legacy', 'core source'."""
+        return [
+            *(f"+{name}" for name in self.added),
+            *(f"-{name}" for name in self.removed),
+            *(f"{name} source" for name in self.sources if name not in self.added),
+        ]
+
+
+def sync_package_dependencies(
+    pyproject_path: Path, internal: set[str], workspace: set[str], prune: bool = False
+) -> DependencyUpdate:
+    """Declare the internal packages a package imports in its pyproject.toml.
+
+    Like the docs feature, the file is rewritten with tomli_w (comments are
+    lost), and only when something changed.
+
+    Args:
+        pyproject_path: The package's pyproject.toml
+        internal: Workspace packages the package imports
+        workspace: Every workspace package name
+        prune: Also remove workspace packages that are declared but no longer imported
+    """
+    with open(pyproject_path, "rb") as f:
+        pyproject = tomllib.load(f)
+    project = pyproject.get("project")
+    if not isinstance(project, dict):
+        # Not a project (yet): nothing to declare dependencies in
+        return DependencyUpdate(pyproject_path, FileStatus.UNCHANGED)
+    original = copy.deepcopy(pyproject)
+
+    workspace_names = {normalize_name(name) for name in workspace}
+    wanted = {normalize_name(name): name for name in internal}
+    dependencies: list[str] = list(project.get("dependencies", []))
+    declared = {requirement_name(requirement) for requirement in dependencies}
+
+    removed = []
+    if prune:
+        removed = [
+            requirement
+            for requirement in dependencies
+            if requirement_name(requirement) in workspace_names and requirement_name(requirement) not in wanted
+        ]
+        dependencies = [requirement for requirement in dependencies if requirement not in removed]
+
+    added = [wanted[name] for name in sorted(wanted) if name not in declared]
+    if added or removed:
+        project["dependencies"] = [*dependencies, *added]
+
+    sources = pyproject.get("tool", {}).get("uv", {}).get("sources", {})
+    missing = [name for name in sorted(wanted.values()) if name not in sources]
+    stale = [name for name in map(_project_name, removed) if sources.get(name) == {"workspace": True}]
+    if missing or stale:
+        sources = pyproject.setdefault("tool", {}).setdefault("uv", {}).setdefault("sources", {})
+        sources.update((name, {"workspace": True}) for name in missing)
+        for name in stale:
+            del sources[name]
+
+    if pyproject == original:
+        return DependencyUpdate(pyproject_path, FileStatus.UNCHANGED)
+    status = write_if_changed(pyproject_path, tomli_w.dumps(pyproject).encode("utf-8"))
+    return DependencyUpdate(pyproject_path, status, tuple(added), tuple(removed), tuple(missing))
+
+
+def sync_dependencies(
+    root: Path, graph: ImportGraph, prune: bool = False, jobs: int | None = None
+) -> list[DependencyUpdate]:
+    """Sync the internal dependencies of every workspace package, in parallel.
+
+    Returns:
+        One update per package, sorted by package name.
+    """
+    workspace = set(graph.members)
+
+    def sync(name: str) -> DependencyUpdate:
+        pyproject_path = root / graph.members[name].path / "pyproject.toml"
+        return sync_package_dependencies(pyproject_path, graph.edges[name], workspace, prune)
+
+    with ThreadPoolExecutor(max_workers=jobs or default_jobs()) as pool:
+        return list(pool.map(sync, sorted(graph.members)))
@@ -1,17 +1,140 @@
 """Feature generators for adding features to existing projects."""
 
+from enum import Enum
 from pathlib import Path
 
 from rich.console import Console
 
 from mpm.config import DocsTheme, MpmConfig, ProjectStructure
-from mpm.generators.renderer import TemplateRenderer
+from mpm.generators.plan import RenderPlan
+from mpm.generators.renderer import get_renderer
+from mpm.generators.sync import get_sync_queue
+from mpm.generators.tree import FileStatus, WriteSummary, write_if_changed
+from mpm.workspace import workspace_members
 
 console = Console()
 
+# Message shown for each file, by write result
+_STATUS_LABELS = {
+    FileStatus.ADDED: "Created",
+    FileStatus.MODIFIED: "Updated",
+    FileStatus.UNCHANGED: "Unchanged",
+    FileStatus.SKIPPED: "Kept existing",
+}
 
-def add_docker_feature(project_root: Path, config: MpmConfig) -> None:
-    """Add Docker configuration to an existing project.
+
+def _report(summary: WriteSummary, status: FileStatus, name: str) -> None:
+    """Count a write result and print one line for it."""
+    summary.record(status)
+    console.print(f"[dim]{_STATUS_LABELS[status]} {name}[/dim]")
+
+
+class Feature(str, Enum):
+    DOCKER = "docker"
+    CI = "ci"
+    PYPI = "pypi"
+    DOCS = "docs"
+
+
+def enabled_features(config: MpmConfig) -> set[Feature]:
+    """Features already recorded in mpm.toml."""
+    flags = {
+        Feature.DOCKER: config.with_docker,
+        Feature.CI: config.with_ci,
+        Feature.PYPI: config.with_pypi,
+        Feature.DOCS: config.with_docs,
+    }
+    return {feature for feature, enabled in flags.items() if enabled}
+
+
+def mark_enabled(config: MpmConfig, features: list[Feature], theme: DocsTheme = DocsTheme.MATERIAL) -> None:
+    """Record features in the mpm.toml configuration (the caller saves it)."""
+    for feature in features:
+        if feature == Feature.DOCKER:
+            config.with_docker = True
+        elif feature == Feature.CI:
+            config.with_ci = True
+        elif feature == Feature.PYPI:
+            config.with_pypi = True
+        else:
+            config.with_docs = True
+            config.docs_theme = theme
+
+
+def add_features(
+    project_root: Path,
+    config: MpmConfig,
+    features: list[Feature],
+    theme: DocsTheme = DocsTheme.MATERIAL,
+    jobs: int | None = None,
+) -> WriteSummary:
+    """Add several features to an existing project in a single pass.
+
+    The files of every feature go into one render plan, which is rendered and
+    written together. Files that already have the generated content are not
+    rewritten. Installing new dependencies is queued on the process-wide
+    SyncQueue, so the caller runs at most one sync.
+
+    Args:
+        project_root: Path to project root
+        config: MpmConfig configuration
+        features: Features to add
+        theme: Documentation theme, when adding docs
+        jobs: Number of render/write workers
+
+    Returns:
+        Counts of files written, unchanged and skipped.
+    """
+    plan = RenderPlan(project_root)
+    summary = WriteSummary()
+
+    if Feature.DOCKER in features:
+        _plan_docker(plan, project_root, config)
+    if Feature.CI in features:
+        _plan_ci(plan, project_root, config)
+    if Feature.PYPI in features:
+        _plan_pypi(plan, project_root, config)
+    if Feature.DOCS in features:
+        # Update pyproject.toml with docs dependencies
+        status = _update_pyproject_toml_for_docs(project_root, theme)
+        _report(summary, status, "pyproject.toml with docs dependencies")
+        if status != FileStatus.UNCHANGED:
+            # Installed once the command is done (see SyncQueue)
+            get_sync_queue().request(
+                project_root, "docs dependencies", all_packages=config.structure == ProjectStructure.MONOREPO
+            )
+        _plan_docs(plan, project_root, config, theme)
+
+    plan.execute(get_renderer(), jobs=jobs, on_write=lambda path, status: _report(summary, status, str(path)))
+    return summary
+
+
+def add_docker_feature(project_root: Path, config: MpmConfig) -> WriteSummary:
+    """Add Docker configuration to an existing project (see _plan_docker)."""
+    return add_features(project_root, config, [Feature.DOCKER])
+
+
+def add_ci_feature(project_root: Path, config: MpmConfig) -> WriteSummary:
+    """Add GitHub Actions CI to an existing project."""
+    return add_features(project_root, config, [Feature.CI])
+
+
+def add_pypi_feature(project_root: Path, config: MpmConfig) -> WriteSummary:
+    """Add PyPI publishing workflow to an existing project."""
+    return add_features(project_root, config, [Feature.PYPI])
+
+
+def add_docs_feature(project_root: Path, config: MpmConfig, theme: DocsTheme = DocsTheme.MATERIAL) -> WriteSummary:
+    """Add MkDocs documentation to an existing project.
+
+    An existing docs/index.md is kept, so hand-written docs are never replaced.
+    Installing the new dependencies is queued on the process-wide SyncQueue.
+    """
+    return add_features(project_root, config, [Feature.DOCS], theme=theme)
+
+
+def _plan_docker(plan: RenderPlan, project_root: Path, config: MpmConfig) -> None:
+    """Plan Docker configuration.
 
     For monorepo:
     - If apps with Dockerfiles exist, generates docker-compose.yml and docker-bake.hcl
@@ -20,8 +143,6 @@ def add_docker_feature(project_root: Path, config: MpmConfig) -> None:
     For single package:
     - Generates Dockerfile, docker-compose.yml, docker-bake.hcl, and .dockerignore
     """
-    renderer = TemplateRenderer()
-
     ctx = {
         "project_slug": config.project_slug,
         "namespace": config.project_name,
@@ -32,60 +153,41 @@ def add_docker_feature(project_root: Path, config: MpmConfig) -> None:
     }
 
     # Always generate .dockerignore
-    renderer.copy_static("docker/.dockerignore", project_root / ".dockerignore")
-    console.print("[dim]Created .dockerignore[/dim]")
+    plan.copy_static("docker/.dockerignore", project_root / ".dockerignore")
 
     if config.structure == ProjectStructure.SINGLE:
         # Single package: generate Dockerfile at root
-        renderer.render_to_file("docker/Dockerfile.jinja", project_root / "Dockerfile", ctx)
-        renderer.render_to_file("docker/docker-compose.yml.jinja", project_root / "docker-compose.yml", ctx)
-        renderer.render_to_file("docker/docker-bake.hcl.jinja", project_root / "docker-bake.hcl", ctx)
-        console.print("[dim]Created Dockerfile, docker-compose.yml, docker-bake.hcl[/dim]")
+        for name in ("Dockerfile", "docker-compose.yml", "docker-bake.hcl"):
+            plan.render_to_file(f"docker/{name}.jinja", project_root / name, ctx)
+        return
+
+    # Monorepo: check for existing apps with Dockerfiles (from the workspace index)
+    apps_with_docker = [app.name for app in workspace_members(project_root, "app") if app.has_dockerfile]
+
+    if apps_with_docker:
+        # Generate docker-compose.yml and docker-bake.hcl referencing existing apps
+        ctx["apps_with_docker"] = apps_with_docker
+        console.print(f"[dim]Docker services for apps: {apps_with_docker}[/dim]")
+        for name in ("docker-compose.yml", "docker-bake.hcl"):
+            plan.render_to_file(f"docker/{name}.jinja", project_root / name, ctx)
     else:
-        # Monorepo: check for existing apps with Dockerfiles
-        apps_dir = project_root / "apps"
-        apps_with_docker = []
-
-        if apps_dir.exists():
-            for app_dir in apps_dir.iterdir():
-                if app_dir.is_dir() and (app_dir / "Dockerfile").exists():
-                    apps_with_docker.append(app_dir.name)
-
-        if apps_with_docker:
-            # Generate docker-compose.yml and docker-bake.hcl referencing existing apps
-            ctx["apps_with_docker"] = apps_with_docker
-            # For samples, the app is 'printer'
-            if config.with_samples or apps_with_docker:
-                renderer.render_to_file("docker/docker-compose.yml.jinja", project_root / "docker-compose.yml", ctx)
-                renderer.render_to_file("docker/docker-bake.hcl.jinja", project_root / "docker-bake.hcl", ctx)
-                console.print(f"[dim]Created docker-compose.yml, docker-bake.hcl for apps: {apps_with_docker}[/dim]")
-        else:
-            console.print("[yellow]Note:[/yellow] No apps with Dockerfiles found.")
-            console.print("[dim]Add apps with 'mpm add app <name> --docker' to generate docker-compose.yml[/dim]")
+        console.print("[yellow]Note:[/yellow] No apps with Dockerfiles found.")
+        console.print("[dim]Add apps with 'mpm add app <name> --docker' to generate docker-compose.yml[/dim]")
 
 
-def add_ci_feature(project_root: Path, config: MpmConfig) -> None:
-    """Add GitHub Actions CI to an existing project."""
-    renderer = TemplateRenderer()
-
+def _plan_ci(plan: RenderPlan, project_root: Path, config: MpmConfig) -> None:
+    """Plan the GitHub Actions PR workflow."""
     ctx = {
         "structure": config.structure,
         "project_slug": config.project_slug,
         "namespace": config.project_name,
         "python_version": config.python_version,
     }
+    plan.render_to_file("ci/pr.yml.jinja", project_root / ".github" / "workflows" / "pr.yml", ctx)
 
-    workflows_dir = project_root / ".github" / "workflows"
-    workflows_dir.mkdir(parents=True, exist_ok=True)
-
-    renderer.render_to_file("ci/pr.yml.jinja", workflows_dir / "pr.yml", ctx)
-    console.print("[dim]Created .github/workflows/pr.yml[/dim]")
-
-
-def add_pypi_feature(project_root: Path, config: MpmConfig) -> None:
-    """Add PyPI publishing workflow to an existing project."""
-    renderer = TemplateRenderer()
 
+def _plan_pypi(plan: RenderPlan, project_root: Path, config: MpmConfig) -> None:
+    """Plan the PyPI release workflow."""
     ctx = {
         "structure": config.structure,
         "project_slug": config.project_slug,
@@ -93,26 +195,11 @@ def add_pypi_feature(project_root: Path, config: MpmConfig) -> None:
         "python_version": config.python_version,
         "with_samples": config.with_samples,
     }
+    plan.render_to_file("ci/release.yml.jinja", project_root / ".github" / "workflows" / "release.yml", ctx)
 
-    workflows_dir = project_root / ".github" / "workflows"
-    workflows_dir.mkdir(parents=True, exist_ok=True)
-
-    renderer.render_to_file("ci/release.yml.jinja", workflows_dir / "release.yml", ctx)
-    console.print("[dim]Created .github/workflows/release.yml[/dim]")
-
-
-def add_docs_feature(project_root: Path, config: MpmConfig, theme: DocsTheme = DocsTheme.MATERIAL) -> None:
-    """Add MkDocs documentation to an existing project.
-
-    Args:
-        project_root: Path to project root
-        config: MpmConfig configuration
-        theme: Documentation theme (material or shadcn)
-    """
-    import subprocess
-
-    renderer = TemplateRenderer()
 
+def _plan_docs(plan: RenderPlan, project_root: Path, config: MpmConfig, theme: DocsTheme) -> None:
+    """Plan mkdocs.yml for the theme and docs/index.md (an existing index is kept)."""
     ctx = {
         "project_slug": config.project_slug,
         "project_description": config.project_description,
@@ -121,42 +208,18 @@ def add_docs_feature(project_root: Path, config: MpmConfig, theme: DocsTheme = D
         "namespace": config.project_name,
         "python_version": config.python_version,
     }
+    plan.render_to_file(f"docs/{theme.value}/mkdocs.yml.jinja", project_root / "mkdocs.yml", ctx)
+    plan.render_to_file("docs/index.md.jinja", project_root / "docs" / "index.md", ctx, overwrite=False)
 
-    # Update pyproject.toml with docs dependencies
-    _update_pyproject_toml_for_docs(project_root, theme)
-    console.print("[dim]Updated pyproject.toml with docs dependencies[/dim]")
-
-    # Run uv sync to install dependencies
-    console.print("[dim]Running uv sync to install dependencies...[/dim]")
-    subprocess.run(["uv", "sync", "--quiet"], cwd=project_root, capture_output=True)
-
-    # Generate mkdocs.yml using appropriate theme template
-    theme_dir = f"docs/{theme.value}"
-    renderer.render_to_file(f"{theme_dir}/mkdocs.yml.jinja", project_root / "mkdocs.yml", ctx)
-    console.print("[dim]Created mkdocs.yml[/dim]")
-
-    # Create docs/index.md
-    docs_dir = project_root / "docs"
-    docs_dir.mkdir(exist_ok=True)
 
-    index_content = f"""# Welcome to {config.project_slug}
-
-{config.project_description or "Documentation for " + config.project_slug}
-
-## Getting Started
-
-TODO: Add getting started guide.
-"""
-    (docs_dir / "index.md").write_text(index_content)
-    console.print("[dim]Created docs/index.md[/dim]")
-
-
-def _update_pyproject_toml_for_docs(project_root: Path, theme: DocsTheme) -> None:
+def _update_pyproject_toml_for_docs(project_root: Path, theme: DocsTheme) -> FileStatus:
     """Update pyproject.toml to add docs dependencies and poe tasks.
 
     This uses tomli_w to rewrite the TOML file, which means comments are lost.
-    However, since mpm generates pyproject.toml, this is acceptable.
+    However, since mpm generates pyproject.toml, this is acceptable. The file
+    is not touched when the docs dependencies and tasks are already present.
     """
+    import copy
     import tomllib
 
     import tomli_w
@@ -165,6 +228,7 @@ def _update_pyproject_toml_for_docs(project_root: Path, theme: DocsTheme) -> Non
 
     with open(pyproject_path, "rb") as f:
         pyproject = tomllib.load(f)
+    original = copy.deepcopy(pyproject)
 
     # Add mkdocs dependencies to dependency-groups.dev
     dev_deps = pyproject.setdefault("dependency-groups", {}).setdefault("dev", [])
@@ -199,6 +263,9 @@ def _update_pyproject_toml_for_docs(project_root: Path, theme: DocsTheme) -> Non
         if "docs-build" not in tasks:
             tasks["docs-build"] = "mkdocs build"
 
+    # Nothing to add: leave the file (and its formatting) as it is
+    if pyproject == original:
+        return FileStatus.UNCHANGED
+
     # Write back
-    with open(pyproject_path, "wb") as f:
-        tomli_w.dump(pyproject, f)
+    return write_if_changed(pyproject_path, tomli_w.dumps(pyproject).encode("utf-8"))
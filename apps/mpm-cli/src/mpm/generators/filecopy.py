@@ -0,0 +1,128 @@
+"""Fast file copies - reflink, copy_file_range or hardlink, with a plain copy as the fallback."""
+
+import errno
+import os
+import shutil
+from enum import Enum
+from pathlib import Path
+
+# Set to "hardlink" to link static files instead of copying them
+COPY_MODE_ENV = "MPM_STATIC_COPY"
+
+# ioctl request number for FICLONE (share all extents of one file with another) on Linux
+FICLONE = 0x40049409
+
+# errno values meaning "this kernel/filesystem cannot do that", as opposed to a real I/O error.
+# EXDEV (source and destination on different filesystems) is handled per call instead.
+_UNSUPPORTED_ERRNOS = {
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EPERM,
+    errno.EBADF,
+    getattr(errno, "EOPNOTSUPP", errno.EINVAL),
+    getattr(errno, "ENOTSUP", errno.EINVAL),
+}
+
+# Strategies that failed as unsupported once; they are not retried in this process
+_unsupported: set[str] = set()
+
+
+class CopyMode(str, Enum):
+    # Reflink, then copy_file_range, then a plain copy
+    AUTO = "auto"
+    # Hardlink to the source (falls back to AUTO across filesystems).
+    # Only safe for read-only consumers: editing the file in place edits the source.
+    HARDLINK = "hardlink"
+
+
+def default_copy_mode() -> CopyMode:
+    """Return the copy mode selected by MPM_STATIC_COPY (AUTO when unset or unknown)."""
+    value = os.environ.get(COPY_MODE_ENV, "").lower()
+    return CopyMode.HARDLINK if value == CopyMode.HARDLINK.value else CopyMode.AUTO
+
+
+def copy_file(src: Path, dst: Path, mode: CopyMode = CopyMode.AUTO) -> str:
+    """Copy src to dst (replacing it) with the cheapest method the filesystem supports.
+
+    Tries, in order: a hardlink (HARDLINK mode only), a reflink (FICLONE, which
+    shares data blocks on btrfs, XFS and similar), os.copy_file_range (an in-kernel
+    copy), and finally a plain read/write copy.
+
+    Returns:
+        The method used: "hardlink", "reflink", "copy_file_range" or "copy".
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+
+    if mode == CopyMode.HARDLINK and "hardlink" not in _unsupported and _hardlink(src, dst):
+        return "hardlink"
+
+    with open(src, "rb") as fsrc:
+        # Write through a fresh inode so an existing hardlink to the source is never modified
+        dst.unlink(missing_ok=True)
+        with open(dst, "wb") as fdst:
+            if "reflink" not in _unsupported and _reflink(fsrc.fileno(), fdst.fileno()):
+                return "reflink"
+            if "copy_file_range" not in _unsupported and _copy_file_range(fsrc.fileno(), fdst.fileno()):
+                return "copy_file_range"
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst)
+    return "copy"
+
+
+def _unsupported_error(strategy: str, err: OSError) -> bool:
+    """Record a strategy the platform cannot do. Returns False for genuine I/O errors."""
+    if err.errno in _UNSUPPORTED_ERRNOS:
+        _unsupported.add(strategy)
+        return True
+    return False
+
+
+def _hardlink(src: Path, dst: Path) -> bool:
+    tmp = dst.with_name(f".{dst.name}.mpm-link")
+    try:
+        tmp.unlink(missing_ok=True)
+        os.link(src, tmp)
+        os.replace(tmp, dst)
+        return True
+    except OSError as err:
+        tmp.unlink(missing_ok=True)
+        # Cross-device links fail per destination, not per platform; only give up on EPERM/ENOSYS
+        if err.errno != errno.EXDEV and not _unsupported_error("hardlink", err):
+            raise
+        return False
+
+
+def _reflink(src_fd: int, dst_fd: int) -> bool:
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        _unsupported.add("reflink")
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError as err:
+        if err.errno == errno.EXDEV:
+            return False
+        if not _unsupported_error("reflink", err):
+            raise
+        return False
+
+
+def _copy_file_range(src_fd: int, dst_fd: int) -> bool:
+    if not hasattr(os, "copy_file_range"):
+        _unsupported.add("copy_file_range")
+        return False
+    try:
+        while os.copy_file_range(src_fd, dst_fd, 1 << 30):
+            pass
+        return True
+    except OSError as err:
+        if err.errno == errno.EXDEV:
+            return False
+        if not _unsupported_error("copy_file_range", err):
+            raise
+        return False
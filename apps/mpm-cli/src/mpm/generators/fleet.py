@@ -0,0 +1,158 @@
+"""Fleet generation - create many projects from one spec file on a process pool.
+
+`mpm new --from-spec fleet.toml` reads one `[[project]]` table per project
+(ProjectConfig fields, with `name` as given to `mpm new`) on top of optional
+`[defaults]`. Projects are generated by worker processes, so rendering, git
+init and uv sync of different projects run in parallel without paying the
+interpreter and import startup per project. Templates are compiled once in
+the parent and inherited by forked workers on Linux (elsewhere each spawned
+worker compiles them once); all workers share the uv cache.
+"""
+
+import multiprocessing
+import sys
+import tomllib
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from mpm.config import ProjectConfig, ProjectStructure
+from mpm.generators.steps import Step, StepResult, run_step
+from mpm.generators.sync import IndexOptions
+
+
+def load_fleet_spec(path: Path) -> list[ProjectConfig]:
+    """Read the project configurations listed in a fleet spec.
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid TOML or an entry is invalid
+    """
+    from mpm.utils import validate_project_name
+
+    data = tomllib.loads(path.read_text())
+    defaults = data.get("defaults", {})
+    if not isinstance(defaults, dict):
+        raise ValueError("[defaults] must be a table")
+    entries = data.get("project", [])
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path.name} lists no [[project]] entries")
+
+    allowed = set(ProjectConfig.model_fields) - {"project_name", "project_slug"}
+    configs: list[ProjectConfig] = []
+    slugs: set[str] = set()
+    for number, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"project #{number} must be a [[project]] table")
+        values: dict[str, Any] = {**defaults, **entry}
+        name = values.pop("name", None)
+        if not isinstance(name, str) or not name:
+            raise ValueError(f"project #{number} has no name")
+        is_valid, error_message = validate_project_name(name)
+        if not is_valid:
+            raise ValueError(f"invalid project name '{name}': {error_message}")
+        unknown = sorted(set(values) - allowed)
+        if unknown:
+            raise ValueError(f"project '{name}' has unknown settings: {', '.join(unknown)}")
+
+        config = ProjectConfig(
+            project_name=name.replace("-", "_"), project_slug=name.replace("_", "-").lower(), **values
+        )
+        if config.project_slug in slugs:
+            raise ValueError(f"project '{config.project_slug}' is listed more than once")
+        slugs.add(config.project_slug)
+        configs.append(config)
+    return configs
+
+
+def generate_fleet(
+    configs: list[ProjectConfig],
+    output_dir: Path,
+    jobs: int,
+    log_dir: Path,
+    index: IndexOptions | None = None,
+    on_done: Callable[[StepResult], None] | None = None,
+) -> list[StepResult]:
+    """Generate every project into output_dir on up to jobs worker processes.
+
+    Each project's console and git/uv output goes to `<log_dir>/<slug>.log`.
+    A project fails when generation raises or one of its post-generation
+    steps (git init, uv sync) fails.
+
+    Args:
+        configs: Projects to generate
+        output_dir: Directory the project directories are created in
+        jobs: Maximum number of worker processes
+        log_dir: Directory for the per-project logs
+        index: Offline mode and wheelhouse for uv sync
+        on_done: Called from the calling process as each project finishes
+
+    Returns:
+        Results in the order of configs, timed per project.
+    """
+    structures = sorted({config.structure for config in configs})
+    if sys.platform == "linux":
+        # Compile once here; forked workers inherit the warm renderer
+        _compile_templates(structures)
+        context = multiprocessing.get_context("fork")
+    else:
+        # fork is unsafe on macOS (and unavailable on Windows)
+        context = multiprocessing.get_context("spawn")
+
+    results: dict[str, StepResult] = {}
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(jobs, len(configs))),
+        mp_context=context,
+        initializer=_compile_templates,
+        initargs=(structures,),
+    ) as pool:
+        futures = [pool.submit(fleet_step, config, output_dir, log_dir, index) for config in configs]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.name] = result
+            if on_done is not None:
+                on_done(result)
+    return [results[config.project_slug] for config in configs]
+
+
+def fleet_step(config: ProjectConfig, output_dir: Path, log_dir: Path, index: IndexOptions | None) -> StepResult:
+    """Generate one project of a fleet (runs in a worker process)."""
+    return run_step(Step(config.project_slug, lambda: _generate_member(config, output_dir, log_dir, index)))
+
+
+def _generate_member(
+    config: ProjectConfig, output_dir: Path, log_dir: Path, index: IndexOptions | None
+) -> tuple[bool, str]:
+    from mpm.generators import project
+    from mpm.generators.steps import get_step_log
+
+    log_path = log_dir / f"{config.project_slug}.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    failed: list[str] = []
+
+    def record(result: StepResult) -> None:
+        if not result.ok:
+            failed.append(result.name)
+
+    with open(log_path, "a", encoding="utf-8") as log, get_step_log().redirect(log_path):
+        previous, project.console.file = project.console.file, log
+        try:
+            # One render thread per worker: the projects themselves are the parallelism
+            project.generate_project(config, output_dir / config.project_slug, jobs=1, index=index, on_step=record)
+        finally:
+            project.console.file = previous
+    if failed:
+        return False, f"{config.project_slug}: {', '.join(failed)} failed (see {log_path})"
+    return True, f"{config.project_slug}: created"
+
+
+def _compile_templates(structures: list[ProjectStructure]) -> None:
+    """Compile the templates the fleet's structures use into this process's renderer."""
+    from mpm.generators.renderer import get_renderer
+    from mpm.generators.warmup import warmup_templates
+
+    env = get_renderer().env
+    for structure in structures:
+        for name in warmup_templates(structure):
+            env.get_template(name)
@@ -0,0 +1,160 @@
+"""Lock seeds - pre-resolved uv.lock files for standard project shapes.
+
+The dev toolchain of a generated project only depends on a few settings
+(Python version, structure, samples, docs theme). A seed is the uv.lock of a
+placeholder project with those settings; new projects get a copy with the
+project name filled in, so `uv sync --frozen` installs without resolving.
+
+Each seed records a fingerprint of the dependency-relevant parts of the
+placeholder's pyproject.toml files. A seed is only used when the new project
+has the same fingerprint, so seeds never outlive a template change.
+"""
+
+import hashlib
+import json
+import subprocess
+import tempfile
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from importlib.resources import files
+from pathlib import Path, PurePosixPath
+
+from mpm.config import DocsTheme, ProjectConfig, ProjectStructure, PythonVersion
+from mpm.generators.steps import Step, StepResult, run_step
+from mpm.generators.tree import FileTree
+
+# Name of the placeholder project the seeds are resolved for
+SEED_PROJECT_SLUG = "mpm-lock-seed"
+
+# Directory (in the mpm package and in the user cache) holding <key>.lock seeds
+SEEDS_DIR_NAME = "locks"
+
+# First line of a seed file, followed by the fingerprint
+FINGERPRINT_HEADER = "# mpm lock seed fingerprint: "
+
+# pyproject.toml tables that feed into uv.lock
+_LOCK_INPUT_KEYS = ("dependency-groups", "build-system")
+_LOCK_PROJECT_KEYS = ("name", "requires-python", "dependencies", "optional-dependencies")
+
+
+def seed_key(config: ProjectConfig) -> str:
+    """Return the seed name for a configuration, e.g. 'py3.13-monorepo-samples-material'."""
+    parts = [f"py{config.python_version.value}", config.structure.value]
+    if config.structure == ProjectStructure.MONOREPO and config.with_samples:
+        parts.append("samples")
+    parts.append(config.docs_theme.value if config.with_docs else "nodocs")
+    return "-".join(parts)
+
+
+def seed_configs(python_versions: list[PythonVersion] | None = None) -> list[ProjectConfig]:
+    """Placeholder configurations for every standard project shape."""
+    shapes = [
+        (ProjectStructure.SINGLE, False),
+        (ProjectStructure.MONOREPO, False),
+        (ProjectStructure.MONOREPO, True),
+    ]
+    docs: list[DocsTheme | None] = [None, *DocsTheme]
+    return [
+        ProjectConfig(
+            project_name=SEED_PROJECT_SLUG.replace("-", "_"),
+            project_slug=SEED_PROJECT_SLUG,
+            structure=structure,
+            python_version=python_version,
+            with_samples=with_samples,
+            with_docs=theme is not None,
+            docs_theme=theme or DocsTheme.MATERIAL,
+            init_git=False,
+            auto_sync=False,
+        )
+        for python_version in python_versions or list(PythonVersion)
+        for structure, with_samples in shapes
+        for theme in docs
+    ]
+
+
+def lock_fingerprint(tree: FileTree) -> str:
+    """Hash the parts of every pyproject.toml in a tree that uv.lock depends on.
+
+    The root project's name is left out: it is substituted when a seed is used.
+    """
+    inputs = {}
+    for path in tree:
+        if path.name != "pyproject.toml":
+            continue
+        entry = lock_inputs(tomllib.loads(tree.read_text(path)))
+        if path == PurePosixPath("pyproject.toml"):
+            entry["project"].pop("name")
+        inputs[str(path)] = entry
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def lock_inputs(pyproject: dict) -> dict:
+    """The parts of a parsed pyproject.toml that uv resolves from."""
+    entry = {key: pyproject.get(key) for key in _LOCK_INPUT_KEYS}
+    entry["project"] = {key: pyproject.get("project", {}).get(key) for key in _LOCK_PROJECT_KEYS}
+    entry["uv"] = pyproject.get("tool", {}).get("uv")
+    return entry
+
+
+def seed_dirs() -> list[Path]:
+    """Directories searched for seeds: the user cache first, then seeds shipped with mpm."""
+    from mpm.utils import user_cache_dir
+
+    dirs = [user_cache_dir() / SEEDS_DIR_NAME]
+    shipped = files("mpm").joinpath(SEEDS_DIR_NAME)
+    if isinstance(shipped, Path):
+        dirs.append(shipped)
+    return dirs
+
+
+def find_lock_seed(config: ProjectConfig, tree: FileTree) -> bytes | None:
+    """Return the uv.lock content for a rendered project, or None if no matching seed exists."""
+    key = seed_key(config)
+    fingerprint = None
+    for directory in seed_dirs():
+        try:
+            header, _, lock = (directory / f"{key}.lock").read_text().partition("\n")
+        except OSError:
+            continue
+        fingerprint = fingerprint or lock_fingerprint(tree)
+        if header != FINGERPRINT_HEADER + fingerprint:
+            continue
+        from mpm.utils import normalize_name
+
+        project = normalize_name(config.project_slug)
+        return lock.replace(f'"{SEED_PROJECT_SLUG}"', f'"{project}"').encode("utf-8")
+    return None
+
+
+def build_lock_seed(config: ProjectConfig, output: Path) -> tuple[bool, str]:
+    """Resolve the placeholder project for config with `uv lock` and store its seed in output.
+
+    Returns:
+        A tuple of (succeeded, message to show).
+    """
+    from mpm.generators.project import render_project
+
+    key = seed_key(config)
+    with tempfile.TemporaryDirectory(prefix="mpm-lock-seed-") as tmp:
+        project = Path(tmp) / SEED_PROJECT_SLUG
+        tree = render_project(config, project)
+        tree.flush()
+        try:
+            result = subprocess.run(["uv", "lock"], cwd=project, capture_output=True, text=True)
+        except FileNotFoundError:
+            return False, f"{key}: uv not found"
+        if result.returncode != 0:
+            error_msg = result.stderr.strip() if result.stderr else "Unknown error"
+            return False, f"{key}: uv lock failed (exit {result.returncode}): {error_msg}"
+        lock = (project / "uv.lock").read_text()
+
+    output.mkdir(parents=True, exist_ok=True)
+    (output / f"{key}.lock").write_text(f"{FINGERPRINT_HEADER}{lock_fingerprint(tree)}\n{lock}")
+    return True, f"{key}.lock"
+
+
+def build_lock_seeds(configs: list[ProjectConfig], output: Path, jobs: int) -> list[StepResult]:
+    """Build seeds for several configurations, running up to jobs `uv lock` processes at once."""
+    steps = [Step(seed_key(config), lambda config=config: build_lock_seed(config, output)) for config in configs]
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        return list(pool.map(run_step, steps))
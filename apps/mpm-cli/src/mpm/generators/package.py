@@ -1,64 +1,116 @@
 """Package generator - creates lib and app packages."""
 
+import tomllib
+from dataclasses import dataclass
 from pathlib import Path
 
 from rich.console import Console
 
-from mpm.generators.renderer import TemplateRenderer
+from mpm.generators.plan import RenderPlan
+from mpm.generators.renderer import get_renderer
+from mpm.generators.tree import FileTree
+from mpm.utils import ProjectContext
 
 console = Console()
 
+PACKAGE_TYPES = ("lib", "app")
+
+
+@dataclass(frozen=True, slots=True)
+class PackageSpec:
+    """A package to add: its name, "lib" or "app", description and Docker flag (apps only)."""
+
+    name: str
+    package_type: str = "lib"
+    description: str = ""
+    with_docker: bool = False
+
+    @property
+    def location(self) -> str:
+        return f"{'libs' if self.package_type == 'lib' else 'apps'}/{self.name}"
+
+
+def load_package_manifest(path: Path) -> list[PackageSpec]:
+    """Read the packages listed in a manifest for `mpm add --from`.
+
+    The manifest holds one `[[package]]` table per package, with a `name` and
+    optional `type` ("lib" by default, or "app"), `description` and `docker`.
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid TOML or an entry is malformed
+    """
+    data = tomllib.loads(path.read_text())
+    entries = data.get("package", [])
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path.name} lists no [[package]] entries")
+
+    specs = []
+    for number, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"package #{number} must be a [[package]] table")
+        name = entry.get("name")
+        package_type = entry.get("type", "lib")
+        if not isinstance(name, str) or not name:
+            raise ValueError(f"package #{number} has no name")
+        if package_type not in PACKAGE_TYPES:
+            raise ValueError(f"package '{name}' has unknown type '{package_type}' (expected lib or app)")
+        specs.append(
+            PackageSpec(
+                name,
+                package_type,
+                description=str(entry.get("description", "")),
+                with_docker=bool(entry.get("docker", False)),
+            )
+        )
+    return specs
+
 
 def generate_lib_package(
-    renderer: TemplateRenderer,
+    plan: RenderPlan,
     project_root: Path,
     package_name: str,
     namespace: str,
     ctx: dict,
     is_sample: bool = False,
 ) -> None:
-    """Generate a library package in libs/."""
+    """Plan a library package in libs/."""
     lib_dir = project_root / "libs" / package_name
-    lib_dir.mkdir(parents=True, exist_ok=True)
 
     # Build context for this package
     pkg_ctx = {
         **ctx,
         "package_name": package_name,
-        "package_description": f"{package_name.capitalize()} library",
+        "package_description": ctx.get("package_description") or f"{package_name.capitalize()} library",
         "namespace": namespace,
     }
 
     # Generate pyproject.toml (use sample template for greeter with cowsay)
     if is_sample and package_name == "greeter":
-        renderer.render_to_file("samples/greeter/pyproject.toml.jinja", lib_dir / "pyproject.toml", pkg_ctx)
+        plan.render_to_file("samples/greeter/pyproject.toml.jinja", lib_dir / "pyproject.toml", pkg_ctx)
     else:
-        renderer.render_to_file("monorepo/libs/pyproject.toml.jinja", lib_dir / "pyproject.toml", pkg_ctx)
+        plan.render_to_file("monorepo/libs/pyproject.toml.jinja", lib_dir / "pyproject.toml", pkg_ctx)
 
     # Generate namespace package structure
     ns_dir = lib_dir / namespace / package_name
-    ns_dir.mkdir(parents=True, exist_ok=True)
 
     # Generate __init__.py (use sample if is_sample, otherwise empty)
     if is_sample and package_name == "greeter":
-        renderer.render_to_file("samples/greeter/__init__.py.jinja", ns_dir / "__init__.py", pkg_ctx)
+        plan.render_to_file("samples/greeter/__init__.py.jinja", ns_dir / "__init__.py", pkg_ctx)
     else:
-        renderer.render_to_file("monorepo/libs/__init__.py.jinja", ns_dir / "__init__.py", pkg_ctx)
+        plan.render_to_file("monorepo/libs/__init__.py.jinja", ns_dir / "__init__.py", pkg_ctx)
 
     # Create py.typed markers at both namespace and subpackage levels
-    (lib_dir / namespace / "py.typed").touch()
-    (ns_dir / "py.typed").touch()
+    plan.touch(lib_dir / namespace / "py.typed")
+    plan.touch(ns_dir / "py.typed")
 
     # Create tests directory
     tests_dir = lib_dir / "tests"
-    tests_dir.mkdir(exist_ok=True)
-    renderer.render_to_file("monorepo/libs/test_import.py.jinja", tests_dir / f"test_{package_name}_import.py", pkg_ctx)
-
-    console.print(f"[green]\u2713[/green] Created library: libs/{package_name}")
+    plan.render_to_file("monorepo/libs/test_import.py.jinja", tests_dir / f"test_{package_name}_import.py", pkg_ctx)
 
 
 def generate_app_package(
-    renderer: TemplateRenderer,
+    plan: RenderPlan,
     project_root: Path,
     package_name: str,
     namespace: str,
@@ -66,15 +118,14 @@ def generate_app_package(
     with_docker: bool = False,
     is_sample: bool = False,
 ) -> None:
-    """Generate an application package in apps/."""
+    """Plan an application package in apps/."""
     app_dir = project_root / "apps" / package_name
-    app_dir.mkdir(parents=True, exist_ok=True)
 
     # Build context for this package
     pkg_ctx = {
         **ctx,
         "package_name": package_name,
-        "package_description": f"{package_name.capitalize()} application",
+        "package_description": ctx.get("package_description") or f"{package_name.capitalize()} application",
         "namespace": namespace,
         "with_docker": with_docker,
     }
@@ -84,83 +135,119 @@ def generate_app_package(
         pkg_ctx["depends_on_greeter"] = True
 
     # Generate pyproject.toml
-    renderer.render_to_file("monorepo/apps/pyproject.toml.jinja", app_dir / "pyproject.toml", pkg_ctx)
+    plan.render_to_file("monorepo/apps/pyproject.toml.jinja", app_dir / "pyproject.toml", pkg_ctx)
 
     # Generate namespace package structure
     ns_dir = app_dir / namespace / package_name
-    ns_dir.mkdir(parents=True, exist_ok=True)
 
     # Generate __init__.py (use sample if is_sample, otherwise empty)
     if is_sample and package_name == "printer":
-        renderer.render_to_file("samples/printer/__init__.py.jinja", ns_dir / "__init__.py", pkg_ctx)
+        plan.render_to_file("samples/printer/__init__.py.jinja", ns_dir / "__init__.py", pkg_ctx)
     else:
-        renderer.render_to_file("monorepo/apps/__init__.py.jinja", ns_dir / "__init__.py", pkg_ctx)
+        plan.render_to_file("monorepo/apps/__init__.py.jinja", ns_dir / "__init__.py", pkg_ctx)
 
     # Create py.typed markers at both namespace and subpackage levels
-    (app_dir / namespace / "py.typed").touch()
-    (ns_dir / "py.typed").touch()
+    plan.touch(app_dir / namespace / "py.typed")
+    plan.touch(ns_dir / "py.typed")
 
     # Create tests directory
     tests_dir = app_dir / "tests"
-    tests_dir.mkdir(exist_ok=True)
-    renderer.render_to_file("monorepo/apps/test_import.py.jinja", tests_dir / f"test_{package_name}_import.py", pkg_ctx)
+    plan.render_to_file("monorepo/apps/test_import.py.jinja", tests_dir / f"test_{package_name}_import.py", pkg_ctx)
 
     # Generate Dockerfile if requested
     if with_docker:
-        renderer.render_to_file("docker/Dockerfile.jinja", app_dir / "Dockerfile", pkg_ctx)
-
-    console.print(f"[green]\u2713[/green] Created application: apps/{package_name}")
+        plan.render_to_file("docker/Dockerfile.jinja", app_dir / "Dockerfile", pkg_ctx)
 
 
 def add_package(
+    project: ProjectContext,
     name: str,
     package_type: str,
     description: str = "",
     with_docker: bool = False,
-    project_root: Path | None = None,
-    namespace: str | None = None,
-) -> None:
+    dry_run: bool = False,
+) -> FileTree:
     """Add a new package to an existing mpm-managed project.
 
-    Requires mpm.toml to exist at the project root. Reads namespace and python_version
-    from the configuration.
+    The namespace and python_version come from the project's mpm.toml. With
+    dry_run, the package is rendered in memory and listed without writing anything.
 
-    Raises:
-        SystemExit: If mpm.toml is not found.
+    Args:
+        project: The project, resolved once by the caller
+        name: Package name
+        package_type: "lib" or "app"
+        description: Package description for pyproject.toml
+        with_docker: Include a Dockerfile (apps only)
+        dry_run: List the files instead of writing them
+
+    Returns:
+        The rendered file tree.
     """
-    import sys
+    return add_packages(project, [PackageSpec(name, package_type, description, with_docker)], dry_run=dry_run)
 
-    from mpm.utils import find_mpm_config, load_mpm_config
 
-    renderer = TemplateRenderer()
-    root = project_root or Path.cwd()
+def add_packages(
+    project: ProjectContext,
+    specs: list[PackageSpec],
+    jobs: int | None = None,
+    dry_run: bool = False,
+) -> FileTree:
+    """Add several packages to an existing mpm-managed project in one pass.
 
-    # Require mpm.toml
-    mpm_config_path = find_mpm_config(root)
-    if mpm_config_path is None:
-        console.print("[red]Error:[/red] No mpm.toml found. This command requires an mpm-managed project.")
-        console.print("[dim]Create a new project with 'mpm new <name>' first.[/dim]")
-        sys.exit(1)
+    Every package is planned into one RenderPlan, which renders and writes all
+    files on a shared thread pool. Names are expected to be validated already.
 
-    assert mpm_config_path is not None  # type narrowing for static analysis
-    mpm_config = load_mpm_config(mpm_config_path)
-    namespace = namespace or mpm_config.project_name
-    python_version = mpm_config.python_version
-    console.print("[dim]Using configuration from mpm.toml[/dim]")
+    Args:
+        project: The project, resolved once by the caller
+        specs: Packages to add
+        jobs: Number of worker threads (defaults to default_jobs())
+        dry_run: List the files instead of writing them
 
-    ctx = {
-        "package_name": name,
-        "package_description": description or f"{name.capitalize()} package",
-        "namespace": namespace,
-        "python_version": python_version,
-        "with_docker": with_docker,
-    }
+    Returns:
+        The rendered file tree.
+    """
+    root = project.root
+    namespace = project.namespace
+    python_version = project.config.python_version
+    console.print("[dim]Using configuration from mpm.toml[/dim]")
 
-    if package_type == "lib":
-        generate_lib_package(renderer, root, name, namespace, ctx)
+    plan = RenderPlan(root)
+    for spec in specs:
+        ctx = {
+            "package_name": spec.name,
+            "package_description": spec.description,
+            "namespace": namespace,
+            "python_version": python_version,
+            "with_docker": spec.with_docker,
+        }
+        if spec.package_type == "lib":
+            generate_lib_package(plan, root, spec.name, namespace, ctx)
+        else:
+            generate_app_package(plan, root, spec.name, namespace, ctx, with_docker=spec.with_docker)
+
+    if len(specs) == 1:
+        [spec] = specs
+        target = spec.location
+        kind = "library" if spec.package_type == "lib" else "application"
+        created = f"{kind}: {target}"
     else:
-        generate_app_package(renderer, root, name, namespace, ctx, with_docker=with_docker)
+        libs = sum(spec.package_type == "lib" for spec in specs)
+        target = f"{len(specs)} packages"
+        created = f"{libs} libraries and {len(specs) - libs} applications"
+
+    if dry_run:
+        tree = plan.render_tree(get_renderer(), jobs)
+        console.print(f"[bold]Dry run:[/bold] would create {len(tree)} files in {target}")
+        for path in tree:
+            console.print(f"  {path} [dim]({len(tree[path])} bytes)[/dim]")
+        return tree
+
+    tree, summary = plan.execute(get_renderer(), jobs)
+    console.print(f"[green]\u2713[/green] Created {created}")
+    console.print(f"[dim]Files: {summary}[/dim]")
 
     console.print("\n[bold]Next steps:[/bold]")
-    console.print("  [dim]uv sync --all-packages[/dim]  Install the new package")
-    console.print("  [dim]uv run una sync[/dim]         Auto-detect internal dependencies after adding imports")
+    noun = "packages" if len(specs) > 1 else "package"
+    console.print(f"  [dim]uv sync --all-packages[/dim]  Install the new {noun}")
+    console.print("  [dim]mpm deps sync[/dim]           Declare internal dependencies after adding imports")
+    return tree
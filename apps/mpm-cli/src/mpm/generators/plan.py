@@ -0,0 +1,118 @@
+"""Render plans - collect the files to generate, then render and write them in one pass."""
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from mpm.generators.renderer import TemplateRenderer
+from mpm.generators.tree import FileStatus, FileTree, WriteSummary, default_jobs
+
+
+@dataclass(frozen=True, slots=True)
+class PlanEntry:
+    """A single output file in a render plan.
+
+    Exactly one of template (rendered with context) or static (copied verbatim)
+    is set; when neither is set the file is created empty. Entries with
+    overwrite unset never replace an existing file.
+    """
+
+    path: Path
+    template: str | None = None
+    static: str | None = None
+    context: dict[str, Any] | None = None
+    overwrite: bool = True
+
+
+class RenderPlan:
+    """Ordered list of files to generate under a root directory.
+
+    Generators record files with the same calls they would make on a
+    TemplateRenderer. Nothing is rendered until render_tree(), which produces
+    an in-memory FileTree, and nothing touches the filesystem until that tree
+    is flushed. Output is identical for any job count.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.entries: list[PlanEntry] = []
+        # Directories that must exist even if no file is written into them
+        self.directories: list[Path] = []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def render_to_file(
+        self, template_path: str, output_path: Path, context: dict[str, Any], overwrite: bool = True
+    ) -> None:
+        """Record a template render.
+
+        The context is copied, so later changes by the caller do not affect this entry.
+        """
+        self.entries.append(PlanEntry(output_path, template=template_path, context=dict(context), overwrite=overwrite))
+
+    def copy_static(self, src_path: str, dest_path: Path) -> None:
+        """Record a static (non-template) file copy."""
+        self.entries.append(PlanEntry(dest_path, static=src_path))
+
+    def touch(self, path: Path) -> None:
+        """Record an empty file (e.g. a py.typed marker)."""
+        self.entries.append(PlanEntry(path))
+
+    def mkdir(self, path: Path) -> None:
+        """Record a directory that must exist even if no file is written into it."""
+        self.directories.append(path)
+
+    def render_tree(self, renderer: TemplateRenderer, jobs: int | None = None) -> FileTree:
+        """Render every planned file into an in-memory tree.
+
+        Args:
+            renderer: Renderer used for templates and static files
+            jobs: Number of worker threads (defaults to default_jobs(); 1 runs serially)
+        """
+        tree = FileTree(self.root)
+        for directory in self.directories:
+            tree.add_directory(directory)
+
+        jobs = jobs or default_jobs()
+        if jobs <= 1 or len(self.entries) <= 1:
+            contents = [_render_entry(renderer, entry) for entry in self.entries]
+        else:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                contents = list(pool.map(lambda entry: _render_entry(renderer, entry), self.entries))
+
+        # Insert in plan order so later entries for the same path win, as with direct writes
+        for entry, content in zip(self.entries, contents, strict=True):
+            source = renderer.static_source(entry.static) if entry.static is not None else None
+            tree.add_file(entry.path, content, source=source, overwrite=entry.overwrite)
+        return tree
+
+    def execute(
+        self,
+        renderer: TemplateRenderer,
+        jobs: int | None = None,
+        on_write: Callable[[PurePosixPath, FileStatus], None] | None = None,
+    ) -> tuple[FileTree, WriteSummary]:
+        """Render the plan and write it to disk.
+
+        Args:
+            renderer: Renderer used for templates and static files
+            jobs: Number of render/write workers
+            on_write: Called with each written path and its write result (see FileTree.flush)
+
+        Returns:
+            The rendered tree and the counts of files written and left unchanged.
+        """
+        tree = self.render_tree(renderer, jobs=jobs)
+        return tree, tree.flush(jobs=jobs, copy_mode=renderer.copy_mode, on_write=on_write)
+
+
+def _render_entry(renderer: TemplateRenderer, entry: PlanEntry) -> bytes:
+    """Produce the bytes of a single plan entry."""
+    if entry.template is not None:
+        return renderer.render(entry.template, entry.context or {}).encode("utf-8")
+    if entry.static is not None:
+        return renderer.read_static(entry.static)
+    return b""
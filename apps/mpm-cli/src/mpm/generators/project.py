@@ -1,6 +1,7 @@
 """Project generator - creates the full project structure."""
 
-import subprocess
+import sys
+from collections.abc import Callable
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -8,105 +9,255 @@ from rich.console import Console
 
 from mpm import __version__
 from mpm.config import DocsTheme, ProjectConfig, ProjectStructure
-from mpm.generators.renderer import TemplateRenderer
+from mpm.generators.archive import archive_format, write_archive
+from mpm.generators.plan import RenderPlan
+from mpm.generators.renderer import get_renderer
+from mpm.generators.steps import (
+    Step,
+    StepResult,
+    error_details,
+    format_step,
+    format_timings,
+    run_command,
+    run_steps,
+)
+from mpm.generators.sync import IndexOptions, run_uv, uv_sync_command
+from mpm.generators.tree import FileTree
 
 console = Console()
 
 
-def generate_project(config: ProjectConfig, output_path: Path) -> None:
-    """Generate a complete project from configuration."""
-    renderer = TemplateRenderer()
+def generate_project(
+    config: ProjectConfig,
+    output_path: Path,
+    jobs: int | None = None,
+    dry_run: bool = False,
+    index: IndexOptions | None = None,
+    on_step: Callable[[StepResult], None] | None = None,
+) -> FileTree:
+    """Generate a complete project from configuration.
+
+    Generation runs in two phases: the generators first build a RenderPlan of
+    every file, then the plan is rendered into an in-memory FileTree which is
+    flushed to disk (in parallel when jobs > 1). When a matching lock seed
+    exists, it is added as uv.lock and uv sync runs with --frozen. Lock seeds
+    pin PyPI, so they are not used when installing from a wheelhouse, and dry
+    runs do not look for them.
+
+    Args:
+        config: Project configuration
+        output_path: Directory to create the project in
+        jobs: Number of render/write workers (defaults to the CPU count, capped)
+        dry_run: Render in memory and list the files without writing anything
+        index: Offline mode and wheelhouse for uv sync
+        on_step: Called with the result of each post-generation step (git init, uv sync)
+
+    Returns:
+        The rendered file tree.
+    """
+    renderer = get_renderer()
+    context = _project_context(config)
+
+    tree = _plan_project(config, output_path, context).render_tree(renderer, jobs=jobs)
+
+    if dry_run:
+        _show_dry_run(tree, config)
+        return tree
+
+    frozen = (index is None or index.wheelhouse is None) and _add_lock_seed(config, tree)
+
+    console.print(f"[dim]Creating project at {output_path}...[/dim]")
+
+    summary = tree.flush(jobs=jobs, copy_mode=renderer.copy_mode)
+    console.print(f"[dim]Files: {summary}[/dim]")
+
+    if config.with_samples and config.structure == ProjectStructure.MONOREPO:
+        console.print("[green]\u2713[/green] Created library: libs/greeter")
+        console.print("[green]\u2713[/green] Created application: apps/printer")
+    if config.with_agents_md:
+        console.print("[green]\u2713[/green] Generated AGENTS.md and CLAUDE.md")
+
+    # git init and uv sync are independent, so they run concurrently
+    steps: list[Step] = []
+    if config.init_git:
+        steps.append(Step("git init", lambda: _init_git(output_path)))
+    if config.auto_sync:
+        steps.append(Step("uv sync", lambda: _sync_environment(config, output_path, tree, frozen, jobs, index)))
+    if steps:
+        console.print(f"[dim]Running {', '.join(step.name for step in steps)}...[/dim]")
+
+    def report(result: StepResult) -> None:
+        _report_step(result)
+        if on_step is not None:
+            on_step(result)
+
+    results = run_steps(steps, on_done=report)
+    if results:
+        console.print(format_timings(results))
+
+    # Show appropriate success message
+    if all(result.ok for result in results):
+        console.print("[green]✓[/green] Project generated successfully")
+    else:
+        console.print("[yellow]⚠[/yellow] Project generated with warnings")
+
+    return tree
+
+
+def render_project(config: ProjectConfig, output_path: Path, jobs: int | None = None) -> FileTree:
+    """Render a project into an in-memory tree without touching disk.
+
+    The tree can be flushed, diffed against an existing directory, or discarded.
+    Post-generation steps (git init, uv sync) are not run.
+    """
+    context = _project_context(config)
+    return _plan_project(config, output_path, context).render_tree(get_renderer(), jobs=jobs)
+
+
+def archive_project(config: ProjectConfig, target: str, jobs: int | None = None) -> FileTree:
+    """Render a project straight into an archive, without creating the project directory.
+
+    Args:
+        config: Project configuration
+        target: Archive path (.tar.gz, .tgz, .tar.bz2, .tar.xz, .tar or .zip), or "-" for a
+            gzipped tar on stdout
+        jobs: Number of render workers
+
+    Returns:
+        The rendered file tree.
+
+    Raises:
+        ValueError: If the archive type is not supported.
+        OSError: If the archive file cannot be written (its directory is checked before rendering).
+    """
+    fmt = archive_format(target)
+    if target != "-" and not Path(target).absolute().parent.is_dir():
+        raise FileNotFoundError(f"directory {Path(target).absolute().parent} does not exist")
+    tree = render_project(config, Path(config.project_slug), jobs=jobs)
+
+    if target == "-":
+        write_archive(tree, sys.stdout.buffer, fmt, config.project_slug)
+        sys.stdout.buffer.flush()
+    else:
+        with open(target, "wb") as f:
+            write_archive(tree, f, fmt, config.project_slug)
+    return tree
+
+
+def _project_context(config: ProjectConfig) -> dict:
+    """Build the template context shared by all project templates."""
     context = config.model_dump()
     # Add namespace to context (it's a property, not a field)
     context["namespace"] = config.namespace
     # Add current year for LICENSE
     context["current_year"] = datetime.now().year
+    return context
 
-    console.print(f"[dim]Creating project at {output_path}...[/dim]")
 
-    # Create output directory
-    output_path.mkdir(parents=True, exist_ok=True)
+def _plan_project(config: ProjectConfig, output_path: Path, context: dict) -> RenderPlan:
+    """Plan every file of the project (nothing is rendered or written)."""
+    plan = RenderPlan(output_path)
 
     # Generate base files (always)
-    _generate_base_files(renderer, output_path, context)
+    _generate_base_files(plan, output_path, context)
 
     # Generate structure-specific files
     if config.structure == ProjectStructure.MONOREPO:
-        _generate_monorepo_structure(renderer, output_path, context)
+        _generate_monorepo_structure(plan, output_path, context)
         if config.with_samples:
-            _generate_sample_packages(renderer, output_path, context)
+            _generate_sample_packages(plan, output_path, context)
     else:
-        _generate_single_package(renderer, output_path, context)
+        _generate_single_package(plan, output_path, context)
 
     # Generate optional features
     if config.with_precommit:
-        _generate_precommit(renderer, output_path, context)
+        _generate_precommit(plan, output_path, context)
 
     if config.with_agents_md:
-        _generate_agents_md(renderer, output_path, context)
+        _generate_agents_md(plan, output_path, context)
 
     if config.with_docker:
-        _generate_docker_files(renderer, output_path, context)
+        _generate_docker_files(plan, output_path, context)
 
     if config.with_ci:
-        _generate_ci_files(renderer, output_path, context, config.with_pypi)
+        _generate_ci_files(plan, output_path, context, config.with_pypi)
 
     if config.with_docs:
-        _generate_docs(renderer, output_path, context, config.docs_theme)
+        _generate_docs(plan, output_path, context, config.docs_theme)
 
     # Generate VS Code configuration
-    _generate_vscode_config(renderer, output_path, context)
+    _generate_vscode_config(plan, output_path, context)
 
-    # Track warnings for final status message
-    warnings_occurred = False
+    return plan
 
-    # Initialize git
-    if config.init_git:
-        if not _init_git(output_path):
-            warnings_occurred = True
 
-    # Run uv sync to install dependencies
+def post_generation_steps(config: ProjectConfig) -> list[str]:
+    """Names of the steps that run against the written project (skipped for dry runs and archives)."""
+    steps: list[str] = []
+    if config.init_git:
+        steps.append("git init")
     if config.auto_sync:
-        if not _run_uv_sync(output_path, config.structure):
-            warnings_occurred = True
+        steps.append("uv sync")
+    return steps
 
-    # Show appropriate success message
-    if warnings_occurred:
-        console.print("[yellow]⚠[/yellow] Project generated with warnings")
-    else:
-        console.print("[green]✓[/green] Project generated successfully")
 
+def _add_lock_seed(config: ProjectConfig, tree: FileTree) -> bool:
+    """Add a pre-resolved uv.lock to the tree if a seed matches the project.
+
+    Returns:
+        True if a seed was added (uv sync can then skip resolution with --frozen).
+    """
+    from mpm.generators.lockseed import find_lock_seed, seed_key
+
+    lock = find_lock_seed(config, tree)
+    if lock is None:
+        return False
+    tree.add_file("uv.lock", lock)
+    console.print(f"[dim]Using pre-resolved uv.lock ({seed_key(config)})[/dim]")
+    return True
 
-def _generate_base_files(renderer: TemplateRenderer, output: Path, ctx: dict) -> None:
+
+def _show_dry_run(tree: FileTree, config: ProjectConfig) -> None:
+    """List the files a dry run would create."""
+    console.print(f"[bold]Dry run:[/bold] would create {len(tree)} files in {tree.root}")
+    for path in tree:
+        console.print(f"  {path} [dim]({len(tree[path])} bytes)[/dim]")
+
+    skipped = post_generation_steps(config)
+    if skipped:
+        console.print(f"[dim]Skipped: {', '.join(skipped)}[/dim]")
+
+
+def _generate_base_files(plan: RenderPlan, output: Path, ctx: dict) -> None:
     """Generate base project files."""
     # Add mpm version and timestamp to context for mpm.toml
     ctx["mpm_version"] = __version__
     ctx["created_at"] = datetime.now(UTC).isoformat()
 
     # Generate mpm.toml FIRST (stores configuration for future `mpm add` commands)
-    renderer.render_to_file("base/mpm.toml.jinja", output / "mpm.toml", ctx)
+    plan.render_to_file("base/mpm.toml.jinja", output / "mpm.toml", ctx)
 
-    renderer.render_to_file("base/pyproject.toml.jinja", output / "pyproject.toml", ctx)
-    renderer.render_to_file("base/README.md.jinja", output / "README.md", ctx)
-    renderer.render_to_file("base/.python-version.jinja", output / ".python-version", ctx)
-    renderer.copy_static("base/.gitignore", output / ".gitignore")
+    plan.render_to_file("base/pyproject.toml.jinja", output / "pyproject.toml", ctx)
+    plan.render_to_file("base/README.md.jinja", output / "README.md", ctx)
+    plan.render_to_file("base/.python-version.jinja", output / ".python-version", ctx)
+    plan.copy_static("base/.gitignore", output / ".gitignore")
 
     if ctx.get("license_type") and ctx["license_type"] != "none":
-        renderer.render_to_file("base/LICENSE.jinja", output / "LICENSE", ctx)
+        plan.render_to_file("base/LICENSE.jinja", output / "LICENSE", ctx)
 
 
-def _generate_monorepo_structure(_renderer: TemplateRenderer, output: Path, _ctx: dict) -> None:
+def _generate_monorepo_structure(plan: RenderPlan, output: Path, _ctx: dict) -> None:
     """Generate monorepo directory structure."""
-    (output / "libs").mkdir(exist_ok=True)
-    (output / "apps").mkdir(exist_ok=True)
+    plan.mkdir(output / "libs")
+    plan.mkdir(output / "apps")
 
 
-def _generate_sample_packages(renderer: TemplateRenderer, output: Path, ctx: dict) -> None:
+def _generate_sample_packages(plan: RenderPlan, output: Path, ctx: dict) -> None:
     """Generate sample greeter lib and printer app."""
     from mpm.generators.package import generate_app_package, generate_lib_package
 
     generate_lib_package(
-        renderer,
+        plan,
         output,
         package_name="greeter",
         namespace=ctx["namespace"],
@@ -114,7 +265,7 @@ def _generate_sample_packages(renderer: TemplateRenderer, output: Path, ctx: dic
         is_sample=True,
     )
     generate_app_package(
-        renderer,
+        plan,
         output,
         package_name="printer",
         namespace=ctx["namespace"],
@@ -124,32 +275,29 @@ def _generate_sample_packages(renderer: TemplateRenderer, output: Path, ctx: dic
     )
 
 
-def _generate_single_package(renderer: TemplateRenderer, output: Path, ctx: dict) -> None:
+def _generate_single_package(plan: RenderPlan, output: Path, ctx: dict) -> None:
     """Generate single package structure."""
     src_dir = output / "src" / ctx["namespace"]
-    src_dir.mkdir(parents=True, exist_ok=True)
-    renderer.render_to_file("single/__init__.py.jinja", src_dir / "__init__.py", ctx)
-    (src_dir / "py.typed").touch()
+    plan.render_to_file("single/__init__.py.jinja", src_dir / "__init__.py", ctx)
+    plan.touch(src_dir / "py.typed")
 
     # Add tests directory for single package
     tests_dir = output / "tests"
-    tests_dir.mkdir(exist_ok=True)
-    renderer.render_to_file("single/test_import.py.jinja", tests_dir / "test_import.py", ctx)
+    plan.render_to_file("single/test_import.py.jinja", tests_dir / "test_import.py", ctx)
 
 
-def _generate_precommit(renderer: TemplateRenderer, output: Path, _ctx: dict) -> None:
+def _generate_precommit(plan: RenderPlan, output: Path, _ctx: dict) -> None:
     """Generate pre-commit configuration."""
-    renderer.copy_static("tooling/.pre-commit-config.yaml", output / ".pre-commit-config.yaml")
+    plan.copy_static("tooling/.pre-commit-config.yaml", output / ".pre-commit-config.yaml")
 
 
-def _generate_agents_md(renderer: TemplateRenderer, output: Path, ctx: dict) -> None:
+def _generate_agents_md(plan: RenderPlan, output: Path, ctx: dict) -> None:
     """Generate AGENTS.md and CLAUDE.md for AI assistants."""
-    renderer.render_to_file("base/AGENTS.md.jinja", output / "AGENTS.md", ctx)
-    renderer.render_to_file("base/CLAUDE.md.jinja", output / "CLAUDE.md", ctx)
-    console.print("[green]\u2713[/green] Generated AGENTS.md and CLAUDE.md")
+    plan.render_to_file("base/AGENTS.md.jinja", output / "AGENTS.md", ctx)
+    plan.render_to_file("base/CLAUDE.md.jinja", output / "CLAUDE.md", ctx)
 
 
-def _generate_docker_files(renderer: TemplateRenderer, output: Path, ctx: dict) -> None:
+def _generate_docker_files(plan: RenderPlan, output: Path, ctx: dict) -> None:
     """Generate Docker configuration files."""
     structure = ctx.get("structure")
     is_monorepo = structure == ProjectStructure.MONOREPO or (
@@ -158,117 +306,97 @@ def _generate_docker_files(renderer: TemplateRenderer, output: Path, ctx: dict)
     has_samples = ctx.get("with_samples", False)
 
     # Always generate .dockerignore (useful even if user adds docker later)
-    renderer.copy_static("docker/.dockerignore", output / ".dockerignore")
+    plan.copy_static("docker/.dockerignore", output / ".dockerignore")
 
     # For single package mode, generate root Dockerfile and docker-compose/bake
     if not is_monorepo:
-        renderer.render_to_file("docker/Dockerfile.jinja", output / "Dockerfile", ctx)
-        renderer.render_to_file("docker/docker-compose.yml.jinja", output / "docker-compose.yml", ctx)
-        renderer.render_to_file("docker/docker-bake.hcl.jinja", output / "docker-bake.hcl", ctx)
+        plan.render_to_file("docker/Dockerfile.jinja", output / "Dockerfile", ctx)
+        plan.render_to_file("docker/docker-compose.yml.jinja", output / "docker-compose.yml", ctx)
+        plan.render_to_file("docker/docker-bake.hcl.jinja", output / "docker-bake.hcl", ctx)
     # For monorepo WITH samples, generate docker-compose/bake (Dockerfile is in apps/printer)
     elif has_samples:
-        renderer.render_to_file("docker/docker-compose.yml.jinja", output / "docker-compose.yml", ctx)
-        renderer.render_to_file("docker/docker-bake.hcl.jinja", output / "docker-bake.hcl", ctx)
+        plan.render_to_file("docker/docker-compose.yml.jinja", output / "docker-compose.yml", ctx)
+        plan.render_to_file("docker/docker-bake.hcl.jinja", output / "docker-bake.hcl", ctx)
     # For monorepo WITHOUT samples, skip docker-compose/bake (no Dockerfiles exist yet)
     # User can add apps with `mpm add app <name> --docker` later
 
 
-def _generate_ci_files(renderer: TemplateRenderer, output: Path, ctx: dict, with_pypi: bool) -> None:
+def _generate_ci_files(plan: RenderPlan, output: Path, ctx: dict, with_pypi: bool) -> None:
     """Generate GitHub Actions workflows."""
     workflows = output / ".github" / "workflows"
-    workflows.mkdir(parents=True, exist_ok=True)
-    renderer.render_to_file("ci/pr.yml.jinja", workflows / "pr.yml", ctx)
+    plan.render_to_file("ci/pr.yml.jinja", workflows / "pr.yml", ctx)
     if with_pypi:
-        renderer.render_to_file("ci/release.yml.jinja", workflows / "release.yml", ctx)
+        plan.render_to_file("ci/release.yml.jinja", workflows / "release.yml", ctx)
 
 
-def _generate_docs(renderer: TemplateRenderer, output: Path, ctx: dict, theme: DocsTheme) -> None:
-    """Generate MkDocs documentation.
+def _generate_docs(plan: RenderPlan, output: Path, ctx: dict, theme: DocsTheme) -> None:
+    """Generate MkDocs documentation (mkdocs.yml for the theme and docs/index.md)."""
+    plan.render_to_file(f"docs/{theme.value}/mkdocs.yml.jinja", output / "mkdocs.yml", ctx)
+    plan.render_to_file("docs/index.md.jinja", output / "docs" / "index.md", ctx)
 
-    Uses `mkdocs new` to create the initial scaffold (docs/index.md),
-    then replaces mkdocs.yml with our customized theme configuration.
-    """
-    theme_dir = f"docs/{theme.value}"
 
-    # First, ensure dependencies are synced so mkdocs is available
-    subprocess.run(
-        ["uv", "sync", "--quiet"],
-        cwd=output,
-        capture_output=True,
-    )
-
-    # Use mkdocs new to create the docs/ directory and initial index.md
-    # This ensures compatibility with MkDocs conventions
-    result = subprocess.run(
-        ["uv", "run", "mkdocs", "new", "."],
-        cwd=output,
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode == 0:
-        console.print("[green]\u2713[/green] Initialized docs with mkdocs")
-    else:
-        console.print(f"[yellow]\u26a0[/yellow] mkdocs new failed: {result.stderr}")
-
-    # Replace mkdocs.yml with our customized theme configuration
-    # (mkdocs new creates a minimal one, we need our full config)
-    renderer.render_to_file(f"{theme_dir}/mkdocs.yml.jinja", output / "mkdocs.yml", ctx)
-
-
-def _generate_vscode_config(renderer: TemplateRenderer, output: Path, ctx: dict) -> None:
+def _generate_vscode_config(plan: RenderPlan, output: Path, ctx: dict) -> None:
     """Generate VS Code configuration files."""
     vscode_dir = output / ".vscode"
-    vscode_dir.mkdir(exist_ok=True)
-    renderer.copy_static("vscode/extensions.json", vscode_dir / "extensions.json")
-    renderer.render_to_file("vscode/settings.json.jinja", vscode_dir / "settings.json", ctx)
+    plan.copy_static("vscode/extensions.json", vscode_dir / "extensions.json")
+    plan.render_to_file("vscode/settings.json.jinja", vscode_dir / "settings.json", ctx)
+
+
+def _report_step(result: StepResult) -> None:
+    """Print the outcome and duration of a post-generation step."""
+    console.print(format_step(result))
 
 
-def _init_git(output: Path) -> bool:
+def _init_git(output: Path) -> tuple[bool, str]:
     """Initialize git repository.
 
     Returns:
-        True if git init succeeded, False otherwise.
+        A tuple of (succeeded, message to show).
     """
     try:
-        result = subprocess.run(["git", "init"], cwd=output, capture_output=True, text=True)
+        result = run_command(["git", "init"], output, "git init")
         if result.returncode == 0:
-            console.print("[green]✓[/green] Initialized git repository")
-            return True
-        else:
-            error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-            console.print(f"[yellow]⚠[/yellow] Failed to initialize git: {error_msg}")
-            return False
+            return True, "Initialized git repository"
+        return False, f"Failed to initialize git: {error_details(result)}"
     except FileNotFoundError:
-        console.print("[yellow]⚠[/yellow] Failed to initialize git: git not found")
-        return False
-    except subprocess.CalledProcessError as e:
-        error_msg = e.stderr.strip() if e.stderr else str(e)
-        console.print(f"[yellow]⚠[/yellow] Failed to initialize git: {error_msg}")
-        return False
+        return False, "Failed to initialize git: git not found"
 
 
-def _run_uv_sync(output: Path, structure: ProjectStructure) -> bool:
-    """Run uv sync to install dependencies.
+def _sync_environment(
+    config: ProjectConfig,
+    output: Path,
+    tree: FileTree,
+    frozen: bool,
+    jobs: int | None,
+    index: IndexOptions | None = None,
+) -> tuple[bool, str]:
+    """Install dependencies, cloning a cached environment when MPM_VENV_CACHE is enabled.
 
     Returns:
-        True if uv sync succeeded, False otherwise.
+        A tuple of (succeeded, message to show).
     """
-    try:
-        # For monorepos, use --all-packages to sync all workspace members
-        if structure == ProjectStructure.MONOREPO:
-            cmd = ["uv", "sync", "--all-packages"]
-        else:
-            cmd = ["uv", "sync"]
-
-        console.print("[dim]Running uv sync...[/dim]")
-        result = subprocess.run(cmd, cwd=output, capture_output=True, text=True)
-        if result.returncode == 0:
-            console.print("[green]✓[/green] Dependencies installed")
-            return True
-        else:
-            error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-            console.print(f"[yellow]⚠[/yellow] uv sync failed: {error_msg}")
-            return False
-    except FileNotFoundError:
-        console.print("[yellow]⚠[/yellow] uv not found, skipping dependency installation")
-        return False
+    from mpm.generators.venvcache import default_venv_cache, venv_key
+
+    cache = default_venv_cache()
+    if cache is None:
+        return _run_uv_sync(output, config.structure, frozen=frozen, index=index)
+
+    key = venv_key(tree)
+    if cache.restore(key, output, jobs=jobs):
+        return True, "Dependencies installed from the environment cache"
+    ok, message = _run_uv_sync(output, config.structure, frozen=frozen, index=index)
+    if ok:
+        cache.store(key, output)
+    return ok, message
+
+
+def _run_uv_sync(
+    output: Path, structure: ProjectStructure, frozen: bool = False, index: IndexOptions | None = None
+) -> tuple[bool, str]:
+    """Run uv sync to install dependencies (with --frozen when uv.lock came from a seed).
+
+    Returns:
+        A tuple of (succeeded, message to show).
+    """
+    # For monorepos, use --all-packages to sync all workspace members
+    return run_uv(uv_sync_command(structure == ProjectStructure.MONOREPO, frozen=frozen, index=index), output)
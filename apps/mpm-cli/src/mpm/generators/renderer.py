@@ -1,11 +1,44 @@
 """Jinja2 template renderer using importlib.resources."""
 
-import shutil
-from importlib.resources import as_file, files
+import os
+from collections.abc import Callable, Iterator
+from functools import cache
+from hashlib import sha1
+from importlib.resources import files
+from importlib.resources.abc import Traversable
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from jinja2 import BaseLoader, Environment, TemplateNotFound
+import jinja2
+from jinja2 import BaseLoader, ChoiceLoader, Environment, FileSystemBytecodeCache, ModuleLoader, TemplateNotFound
+from jinja2.bccache import Bucket, BytecodeCache
+
+if TYPE_CHECKING:
+    from mpm.generators.filecopy import CopyMode
+    from mpm.generators.tree import FileStatus
+
+# Environment options shared by the runtime renderer and the template precompiler.
+# Precompiled modules are only valid for the options they were compiled with.
+ENV_OPTIONS: dict[str, Any] = {
+    "keep_trailing_newline": True,
+    "trim_blocks": True,
+    "lstrip_blocks": True,
+}
+
+# Directory (inside mpm.templates) holding precompiled templates in built wheels
+COMPILED_DIR_NAME = "_compiled"
+
+# Marker file recording the Jinja2 version the templates were compiled with
+COMPILED_MARKER = "JINJA2_VERSION"
+
+# Set to 1 to persist compiled template bytecode between runs
+BYTECODE_CACHE_ENV = "MPM_TEMPLATE_CACHE"
+
+# Default size limit for the on-disk bytecode cache
+BYTECODE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# Number of compiled templates kept in memory by each Environment (LRU)
+TEMPLATE_CACHE_SIZE = 64
 
 
 class PackageTemplateLoader(BaseLoader):
@@ -18,20 +51,169 @@ class PackageTemplateLoader(BaseLoader):
         try:
             resource = files(self.package).joinpath(template)
             source = resource.read_text()
-            return source, template, lambda: True
+            return source, template, _uptodate_check(resource)
         except (FileNotFoundError, TypeError, AttributeError) as err:
             raise TemplateNotFound(template) from err
 
+    def list_templates(self) -> list[str]:
+        return sorted(_walk_resources(files(self.package), ""))
+
+
+def _uptodate_check(resource: Traversable) -> Callable[[], bool]:
+    """Build the uptodate callback for a template resource.
+
+    Templates on a real filesystem are stale once their mtime changes. Resources
+    inside a zip archive cannot change while the process runs.
+    """
+    if not isinstance(resource, Path):
+        return lambda: True
+
+    mtime = resource.stat().st_mtime_ns
+
+    def uptodate() -> bool:
+        try:
+            return resource.stat().st_mtime_ns == mtime
+        except OSError:
+            return False
+
+    return uptodate
+
+
+def _walk_resources(node: Traversable, prefix: str) -> Iterator[str]:
+    """Yield '/'-separated names of all .jinja files below a resource directory."""
+    for child in node.iterdir():
+        name = f"{prefix}{child.name}"
+        if child.is_dir():
+            if child.name not in (COMPILED_DIR_NAME, "__pycache__"):
+                yield from _walk_resources(child, f"{name}/")
+        elif child.name.endswith(".jinja"):
+            yield name
+
+
+def find_compiled_templates(package: str = "mpm.templates") -> Path | None:
+    """Locate precompiled templates shipped with the package.
+
+    Returns None when running from a source checkout, or when the templates were
+    compiled with a different Jinja2 version than the one installed.
+    """
+    compiled = files(package).joinpath(COMPILED_DIR_NAME)
+    if not isinstance(compiled, Path) or not compiled.is_dir():
+        return None
+
+    marker = compiled / COMPILED_MARKER
+    if not marker.is_file() or marker.read_text().strip() != jinja2.__version__:
+        return None
+    return compiled
+
+
+def compile_templates(target: Path, loader: BaseLoader | None = None) -> int:
+    """Precompile all .jinja templates into Python modules under target.
+
+    Used by the wheel build hook. The output is loaded at runtime with ModuleLoader.
+
+    Returns:
+        The number of templates compiled.
+    """
+    env = Environment(loader=loader or PackageTemplateLoader(), **ENV_OPTIONS)
+    names = env.list_templates(filter_func=lambda name: name.endswith(".jinja"))
+    env.compile_templates(target, zip=None, filter_func=lambda name: name in names, ignore_errors=False)
+    (target / COMPILED_MARKER).write_text(jinja2.__version__)
+    return len(names)
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """On-disk Jinja2 bytecode cache shared between mpm invocations.
+
+    Entries are keyed by mpm version and template name; Jinja2 stores a checksum
+    of the template source with each entry and recompiles when it no longer
+    matches. Least recently used entries are evicted once the cache grows past
+    max_bytes.
+    """
+
+    def __init__(self, directory: Path, version: str, max_bytes: int = BYTECODE_CACHE_MAX_BYTES) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(directory))
+        self.version = version
+        self.max_bytes = max_bytes
+
+    def get_cache_key(self, name: str, filename: str | None = None) -> str:
+        return sha1(f"{self.version}|{name}".encode()).hexdigest()
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        super().load_bytecode(bucket)
+        if bucket.code is not None:
+            # Record the hit so eviction keeps recently used entries
+            try:
+                os.utime(self._get_cache_filename(bucket))
+            except OSError:
+                pass
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        super().dump_bytecode(bucket)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for entry in Path(self.directory).glob(self.pattern % "*"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+
+def default_bytecode_cache() -> BytecodeCache | None:
+    """Return the on-disk bytecode cache if enabled via MPM_TEMPLATE_CACHE=1."""
+    if os.environ.get(BYTECODE_CACHE_ENV, "").lower() not in ("1", "true", "yes"):
+        return None
+
+    from mpm import __version__
+    from mpm.utils import user_cache_dir
+
+    try:
+        return TemplateBytecodeCache(user_cache_dir() / "templates", __version__)
+    except OSError:
+        # An unwritable cache dir must never break generation
+        return None
+
 
 class TemplateRenderer:
-    """Render Jinja2 templates from package resources."""
+    """Render Jinja2 templates from package resources.
+
+    Precompiled templates are used when available (installed wheels), with the
+    package source loader as a fallback (development checkouts). Templates
+    compiled from source can be persisted with a bytecode cache. Static files
+    are copied with copy_mode (see mpm.generators.filecopy).
+    """
+
+    def __init__(
+        self,
+        compiled_dir: Path | None = None,
+        bytecode_cache: BytecodeCache | None = None,
+        copy_mode: "CopyMode | None" = None,
+    ) -> None:
+        from mpm.generators.filecopy import default_copy_mode
+
+        self.copy_mode = copy_mode or default_copy_mode()
+
+        compiled_dir = compiled_dir or find_compiled_templates()
+        loader: BaseLoader = PackageTemplateLoader()
+        if compiled_dir is not None:
+            loader = ChoiceLoader([ModuleLoader(compiled_dir), loader])
 
-    def __init__(self) -> None:
         self.env = Environment(
-            loader=PackageTemplateLoader(),
-            keep_trailing_newline=True,
-            trim_blocks=True,
-            lstrip_blocks=True,
+            loader=loader,
+            bytecode_cache=bytecode_cache or default_bytecode_cache(),
+            cache_size=TEMPLATE_CACHE_SIZE,
+            **ENV_OPTIONS,
         )
 
     def render(self, template_path: str, context: dict[str, Any]) -> str:
@@ -39,15 +221,46 @@ class TemplateRenderer:
         template = self.env.get_template(template_path)
         return template.render(**context)
 
-    def render_to_file(self, template_path: str, output_path: Path, context: dict[str, Any]) -> None:
-        """Render a template and write to output file."""
+    def render_to_file(
+        self, template_path: str, output_path: Path, context: dict[str, Any], overwrite: bool = True
+    ) -> "FileStatus":
+        """Render a template and write to output file, unless it already has that content."""
+        from mpm.generators.tree import write_if_changed
+
         content = self.render(template_path, context)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(content)
-
-    def copy_static(self, src_path: str, dest_path: Path) -> None:
-        """Copy a static (non-template) file."""
-        ref = files("mpm.templates").joinpath(src_path)
-        with as_file(ref) as src:
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy(src, dest_path)
+        return write_if_changed(output_path, content.encode("utf-8"), overwrite=overwrite)
+
+    def read_static(self, src_path: str) -> bytes:
+        """Read a static (non-template) file."""
+        return files("mpm.templates").joinpath(src_path).read_bytes()
+
+    def static_source(self, src_path: str) -> Path | None:
+        """Return the on-disk path of a static file, or None when templates live in a zip."""
+        resource = files("mpm.templates").joinpath(src_path)
+        return resource if isinstance(resource, Path) else None
+
+    def copy_static(self, src_path: str, dest_path: Path, overwrite: bool = True) -> "FileStatus":
+        """Copy a static (non-template) file, unless the destination already matches.
+
+        Files on a real filesystem are reflinked, copied in-kernel or hardlinked
+        depending on copy_mode and what the filesystem supports.
+        """
+        from mpm.generators.tree import write_if_changed
+
+        return write_if_changed(
+            dest_path,
+            self.read_static(src_path),
+            overwrite=overwrite,
+            source=self.static_source(src_path),
+            copy_mode=self.copy_mode,
+        )
+
+
+@cache
+def get_renderer() -> TemplateRenderer:
+    """Return the process-wide renderer shared by all generators.
+
+    Sharing one Environment means each template is compiled at most once per
+    process, however many generators render it.
+    """
+    return TemplateRenderer()
@@ -0,0 +1,207 @@
+"""Post-generation steps - independent commands run concurrently with per-step timing.
+
+Commands run by steps stream their output live, line by line, to the step log:
+the console by default, or a log file (mpm new --quiet).
+"""
+
+import os
+import subprocess
+import threading
+import time
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.table import Table
+
+
+@dataclass(frozen=True, slots=True)
+class Step:
+    """A named unit of work that reports (ok, message) when done.
+
+    Steps handed to run_steps() together must not depend on each other.
+    """
+
+    name: str
+    func: Callable[[], tuple[bool, str]]
+
+
+@dataclass(frozen=True, slots=True)
+class StepResult:
+    """Outcome of a step: success flag, message to show, and wall time in seconds."""
+
+    name: str
+    ok: bool
+    message: str
+    duration: float
+
+
+def format_step(result: StepResult) -> str:
+    """Rich markup for a finished step: status mark, message and duration."""
+    mark = "[green]✓[/green]" if result.ok else "[yellow]⚠[/yellow]"
+    return f"{mark} {result.message} [dim]({result.duration:.1f}s)[/dim]"
+
+
+def format_timings(
+    results: list[StepResult], title: str = "Step timings", label: str = "Step", total: float | None = None
+) -> "Table":
+    """A table of how long each step took, with the total wall time of concurrent steps.
+
+    The total defaults to the longest step, i.e. the wall time when all steps ran at once.
+    """
+    from rich.table import Table
+
+    table = Table(title=title, title_justify="left", show_footer=True)
+    table.add_column(label, footer="Total")
+    table.add_column("Status")
+    if total is None:
+        total = max((result.duration for result in results), default=0.0)
+    table.add_column("Time", justify="right", footer=f"{total:.1f}s")
+    for result in results:
+        status = "[green]ok[/green]" if result.ok else "[yellow]failed[/yellow]"
+        table.add_row(result.name, status, f"{result.duration:.1f}s")
+    return table
+
+
+class StepLog:
+    """Destination of the output of commands run by steps.
+
+    Lines go to the console, prefixed with the step name and the time since the
+    command started, or to a log file when a path is set.
+    """
+
+    def __init__(self, console: "Console | None" = None, path: Path | None = None) -> None:
+        self.console = console
+        self.path = path
+        self._file: IO[str] | None = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def redirect(self, path: Path | None) -> Generator[None]:
+        """Send output to path (appending) instead of the console inside the block.
+
+        A path of None leaves the log as it is.
+        """
+        if path is None:
+            yield
+            return
+        previous = self.path
+        self.close()
+        self.path = path
+        try:
+            yield
+        finally:
+            self.close()
+            self.path = previous
+
+    def write(self, name: str, elapsed: float, line: str) -> None:
+        """Record one line of output of a step's command."""
+        with self._lock:
+            if self.path is not None:
+                if self._file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(f"[{name} {elapsed:.1f}s] {line}\n")
+                self._file.flush()
+            elif self.console is not None:
+                from rich.markup import escape
+
+                self.console.print(f"[dim]{escape(name)} {elapsed:5.1f}s │[/dim] {escape(line)}", highlight=False)
+
+    def close(self) -> None:
+        """Close the log file, if one is open."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+@cache
+def get_step_log() -> StepLog:
+    """Return the process-wide step log (the console until redirected)."""
+    from rich.console import Console
+
+    return StepLog(Console())
+
+
+def run_command(cmd: list[str], cwd: Path, name: str) -> subprocess.CompletedProcess[str]:
+    """Run a step's command, streaming its output (stdout and stderr) to the step log as it is printed.
+
+    Returns:
+        The completed process; stdout holds the output that was streamed.
+
+    Raises:
+        FileNotFoundError: If the command is not installed.
+    """
+    log = get_step_log()
+    lines: list[str] = []
+    start = time.perf_counter()
+    read_fd, write_fd = os.pipe()
+
+    def pump() -> None:
+        with open(read_fd, "rb") as pipe:
+            for raw in pipe:
+                line = raw.decode("utf-8", "replace").rstrip()
+                lines.append(line)
+                log.write(name, time.perf_counter() - start, line)
+
+    reader = threading.Thread(target=pump, name=f"mpm-output-{name}", daemon=True)
+    reader.start()
+    try:
+        # Output goes to the pipe; text=True only types the (empty) result as str
+        result = subprocess.run(cmd, cwd=cwd, stdout=write_fd, stderr=subprocess.STDOUT, text=True)
+    finally:
+        os.close(write_fd)
+        reader.join()
+    return subprocess.CompletedProcess(cmd, result.returncode, "\n".join(lines), result.stderr)
+
+
+def error_details(result: subprocess.CompletedProcess[str], max_lines: int = 10) -> str:
+    """The last lines a failed command printed, for the step message."""
+    text = (result.stderr or result.stdout or "").strip()
+    return "\n".join(text.splitlines()[-max_lines:]) or "Unknown error"
+
+
+def run_step(step: Step) -> StepResult:
+    """Run a single step, timing it and turning unexpected errors into a failed result."""
+    start = time.perf_counter()
+    try:
+        ok, message = step.func()
+    except Exception as err:  # a failing step must not take the other steps down
+        ok, message = False, f"{step.name} failed: {err}"
+    return StepResult(step.name, ok, message, time.perf_counter() - start)
+
+
+def run_steps(
+    steps: list[Step],
+    on_done: Callable[[StepResult], None] | None = None,
+) -> list[StepResult]:
+    """Run independent steps in parallel, one thread each.
+
+    The steps mostly wait on subprocesses, so threads run them truly concurrently.
+
+    Args:
+        steps: Steps to run
+        on_done: Called from the calling thread as each step finishes (in completion order)
+
+    Returns:
+        Results in the order the steps were given.
+    """
+    if not steps:
+        return []
+
+    results: dict[str, StepResult] = {}
+    with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+        futures = [pool.submit(run_step, step) for step in steps]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.name] = result
+            if on_done is not None:
+                on_done(result)
+    return [results[step.name] for step in steps]
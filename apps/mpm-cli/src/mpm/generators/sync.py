@@ -0,0 +1,127 @@
+"""Deferred dependency sync - commands record why a project needs `uv sync`, one sync runs at the end."""
+
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+from mpm.generators.steps import Step, StepResult, error_details, run_command, run_step
+
+
+@dataclass(frozen=True, slots=True)
+class SyncRequest:
+    """A change that needs the project environment to be re-synced."""
+
+    root: Path
+    reason: str
+    # Monorepos sync every workspace member (uv sync --all-packages)
+    all_packages: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class IndexOptions:
+    """Where uv may fetch packages from."""
+
+    # Never touch the network (uv --offline): only the uv cache and the wheelhouse are used
+    offline: bool = False
+    # Local directory of wheels, passed to uv as a --find-links index
+    wheelhouse: Path | None = None
+
+    def args(self) -> list[str]:
+        """uv command-line arguments for these options."""
+        args = []
+        if self.offline:
+            args.append("--offline")
+            if self.wheelhouse is not None:
+                # Resolve against the wheelhouse only, not against stale cached PyPI metadata
+                args.append("--no-index")
+        if self.wheelhouse is not None:
+            args.extend(["--find-links", str(self.wheelhouse)])
+        return args
+
+
+class SyncQueue:
+    """Pending `uv sync` runs, coalesced per project root.
+
+    Generators call request() when they change dependencies instead of running
+    uv themselves; the CLI calls run() (or skip()) once the command is done, so
+    any number of changes costs a single dependency resolution.
+    """
+
+    def __init__(self) -> None:
+        self.requests: list[SyncRequest] = []
+
+    def __len__(self) -> int:
+        return len(self.requests)
+
+    def request(self, root: Path, reason: str, all_packages: bool = False) -> None:
+        """Record that root needs a sync."""
+        self.requests.append(SyncRequest(root, reason, all_packages))
+
+    def reasons(self) -> list[str]:
+        """Reasons recorded so far, without duplicates."""
+        return list(dict.fromkeys(request.reason for request in self.requests))
+
+    def commands(self) -> dict[Path, list[str]]:
+        """The uv command to run for each project root."""
+        commands: dict[Path, list[str]] = {}
+        for request in self.requests:
+            all_packages = request.all_packages or "--all-packages" in commands.get(request.root, [])
+            commands[request.root] = uv_sync_command(all_packages)
+        return commands
+
+    def run(self) -> list[StepResult]:
+        """Run one uv sync per recorded project root and clear the queue.
+
+        Returns:
+            One timed result per sync, carrying uv's exit status on failure.
+        """
+        commands = self.commands()
+        self.requests.clear()
+        return [
+            run_step(Step(" ".join(cmd), lambda cmd=cmd, root=root: run_uv(cmd, root)))
+            for root, cmd in commands.items()
+        ]
+
+    def skip(self) -> list[str]:
+        """Drop all pending syncs, returning the reasons that were recorded."""
+        reasons = self.reasons()
+        self.requests.clear()
+        return reasons
+
+
+def uv_sync_command(all_packages: bool, frozen: bool = False, index: IndexOptions | None = None) -> list[str]:
+    """The uv sync command line.
+
+    Monorepos sync every workspace member; frozen installs uv.lock as-is, without resolving.
+    """
+    cmd = ["uv", "sync"]
+    if all_packages:
+        cmd.append("--all-packages")
+    if frozen:
+        cmd.append("--frozen")
+    if index is not None:
+        cmd.extend(index.args())
+    return cmd
+
+
+def run_uv(cmd: list[str], root: Path) -> tuple[bool, str]:
+    """Run a uv command in root.
+
+    Output is streamed to the step log while uv runs.
+
+    Returns:
+        A tuple of (succeeded, message to show); failures include uv's exit status.
+    """
+    try:
+        result = run_command(cmd, root, " ".join(cmd[:2]))
+    except FileNotFoundError:
+        return False, "uv not found, skipping dependency installation"
+    if result.returncode == 0:
+        return True, "Dependencies installed"
+    return False, f"{' '.join(cmd[:2])} failed (exit {result.returncode}): {error_details(result)}"
+
+
+@cache
+def get_sync_queue() -> SyncQueue:
+    """Return the process-wide sync queue."""
+    return SyncQueue()
@@ -0,0 +1,245 @@
+"""In-memory file trees - generated output held as path -> bytes until flushed to disk."""
+
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path, PurePath, PurePosixPath
+
+from mpm.generators.filecopy import CopyMode, copy_file
+
+# Upper bound for the automatic number of render/write workers
+MAX_DEFAULT_JOBS = 8
+
+
+def default_jobs() -> int:
+    """Number of render/write workers used when --jobs is not given."""
+    return min(MAX_DEFAULT_JOBS, os.cpu_count() or 1)
+
+
+class FileStatus(str, Enum):
+    ADDED = "added"
+    MODIFIED = "modified"
+    UNCHANGED = "unchanged"
+    SKIPPED = "skipped"
+
+
+@dataclass(slots=True)
+class WriteSummary:
+    """Counts of files written, left unchanged, and skipped by a write pass."""
+
+    written: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+
+    def record(self, status: FileStatus) -> FileStatus:
+        """Count a write result and return it unchanged."""
+        if status in (FileStatus.ADDED, FileStatus.MODIFIED):
+            self.written += 1
+        elif status == FileStatus.UNCHANGED:
+            self.unchanged += 1
+        else:
+            self.skipped += 1
+        return status
+
+    def __str__(self) -> str:
+        return f"{self.written} written, {self.unchanged} unchanged, {self.skipped} skipped"
+
+
+def write_if_changed(
+    target: Path,
+    content: bytes,
+    mode: int | None = None,
+    overwrite: bool = True,
+    source: Path | None = None,
+    copy_mode: CopyMode = CopyMode.AUTO,
+) -> FileStatus:
+    """Write content to target unless the file already holds exactly that content.
+
+    Unchanged files are left untouched so their mtime survives, which keeps
+    test, lint and Docker layer caches valid when regenerating over a tree.
+
+    Args:
+        target: File to write (parent directories are created)
+        content: Bytes to write
+        mode: Optional permission bits to apply
+        overwrite: If False, an existing file with different content is kept
+        source: File on disk that holds content; copied with copy_file() instead of writing
+        copy_mode: How to copy source (see CopyMode)
+
+    Returns:
+        ADDED, MODIFIED, UNCHANGED or SKIPPED.
+    """
+    try:
+        size = target.stat().st_size
+    except FileNotFoundError:
+        status = FileStatus.ADDED
+    else:
+        # Size differs -> content differs; only read the file back when it could match
+        if size == len(content) and target.read_bytes() == content:
+            if mode is not None and target.stat().st_mode & 0o7777 != mode:
+                target.chmod(mode)
+            return FileStatus.UNCHANGED
+        if not overwrite:
+            return FileStatus.SKIPPED
+        status = FileStatus.MODIFIED
+
+    if source is not None:
+        copy_file(source, target, copy_mode)
+    else:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+    if mode is not None:
+        target.chmod(mode)
+    return status
+
+
+@dataclass(frozen=True, slots=True)
+class TreeFile:
+    """Content and optional permission bits of a file in a FileTree.
+
+    source is set for files copied verbatim from disk, so flushing can copy
+    (or reflink) that file instead of writing content. Files with overwrite
+    unset are only created, never replaced.
+    """
+
+    content: bytes
+    mode: int | None = None
+    source: Path | None = None
+    overwrite: bool = True
+
+
+class FileTree:
+    """Generated files keyed by POSIX path relative to a root directory.
+
+    Nothing is written until flush(), so a tree can be inspected, diffed
+    against what is on disk, or discarded without any filesystem I/O.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.files: dict[PurePosixPath, TreeFile] = {}
+        # Directories that must exist even when empty
+        self.empty_dirs: set[PurePosixPath] = set()
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __iter__(self) -> Iterator[PurePosixPath]:
+        return iter(sorted(self.files))
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str | PurePath) and self._key(path) in self.files
+
+    def __getitem__(self, path: str | PurePath) -> bytes:
+        return self.files[self._key(path)].content
+
+    def _key(self, path: str | PurePath) -> PurePosixPath:
+        """Normalise a path under root, or one already relative to it, to a tree key."""
+        if isinstance(path, Path) and (path.is_absolute() or path.is_relative_to(self.root)):
+            path = path.relative_to(self.root)
+        return PurePosixPath(*PurePath(path).parts)
+
+    def add_file(
+        self,
+        path: str | PurePath,
+        content: bytes,
+        mode: int | None = None,
+        source: Path | None = None,
+        overwrite: bool = True,
+    ) -> None:
+        """Add or replace a file (source and overwrite: see TreeFile)."""
+        self.files[self._key(path)] = TreeFile(content, mode, source, overwrite)
+
+    def add_directory(self, path: str | PurePath) -> None:
+        """Add a directory that should exist even if it stays empty."""
+        key = self._key(path)
+        if key != PurePosixPath("."):
+            self.empty_dirs.add(key)
+
+    def read_text(self, path: str | PurePath) -> str:
+        return self[path].decode("utf-8")
+
+    def directories(self) -> list[PurePosixPath]:
+        """Return the minimal set of directories to create (ancestors are implied)."""
+        wanted = set(self.empty_dirs)
+        wanted.update(path.parent for path in self.files if path.parent != PurePosixPath("."))
+
+        ancestors: set[PurePosixPath] = set()
+        for directory in wanted:
+            ancestors.update(directory.parents)
+        return sorted(wanted - ancestors)
+
+    def diff(self, root: Path | None = None) -> dict[PurePosixPath, FileStatus]:
+        """Compare the tree with the files on disk under root (defaults to self.root)."""
+        base = root or self.root
+        statuses: dict[PurePosixPath, FileStatus] = {}
+        for path in self:
+            try:
+                on_disk = (base / path).read_bytes()
+            except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+                statuses[path] = FileStatus.ADDED
+                continue
+            same = on_disk == self.files[path].content
+            statuses[path] = FileStatus.UNCHANGED if same else FileStatus.MODIFIED
+        return statuses
+
+    def flush(
+        self,
+        root: Path | None = None,
+        jobs: int | None = None,
+        overwrite: bool = True,
+        copy_mode: CopyMode = CopyMode.AUTO,
+        on_write: Callable[[PurePosixPath, FileStatus], None] | None = None,
+    ) -> WriteSummary:
+        """Write the tree to disk under root (defaults to self.root).
+
+        Directories are created first, then files are written on a thread pool.
+        Files whose content on disk already matches are not rewritten.
+
+        Args:
+            root: Directory to write into
+            jobs: Number of writer threads
+            overwrite: If False, existing files with different content are kept (skipped)
+            copy_mode: How files with a source are copied
+            on_write: Called with each path and its write result, in tree order
+        """
+        base = root or self.root
+        base.mkdir(parents=True, exist_ok=True)
+        for directory in self.directories():
+            (base / directory).mkdir(parents=True, exist_ok=True)
+
+        def write(path: PurePosixPath) -> FileStatus:
+            tree_file = self.files[path]
+            return write_if_changed(
+                base / path,
+                tree_file.content,
+                tree_file.mode,
+                overwrite=overwrite and tree_file.overwrite,
+                source=tree_file.source,
+                copy_mode=copy_mode,
+            )
+
+        summary = WriteSummary()
+        paths = list(self)
+        jobs = jobs or default_jobs()
+        if jobs <= 1 or len(paths) <= 1:
+            return self._record(summary, paths, map(write, paths), on_write)
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            # Consume results so worker exceptions propagate
+            return self._record(summary, paths, pool.map(write, paths), on_write)
+
+    def _record(
+        self,
+        summary: WriteSummary,
+        paths: list[PurePosixPath],
+        statuses: Iterable[FileStatus],
+        on_write: Callable[[PurePosixPath, FileStatus], None] | None,
+    ) -> WriteSummary:
+        for path, status in zip(paths, statuses, strict=True):
+            summary.record(status)
+            if on_write is not None:
+                on_write(path, status)
+        return summary
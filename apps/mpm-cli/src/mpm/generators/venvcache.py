@@ -0,0 +1,236 @@
+"""Environment cache - reuse fully synced .venv directories across new projects.
+
+Opt-in with MPM_VENV_CACHE=1 (reflink/copy) or MPM_VENV_CACHE=hardlink. Entries
+are keyed by the rendered pyproject.toml files and uv.lock; for a root project
+that is not installed only its dependencies count, so monorepos that differ
+only in name share an entry. A hit clones the cached .venv into the new project (file data
+is shared through reflinks or hardlinks) and rewrites the few files that embed
+the project path.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+
+from mpm.generators.filecopy import CopyMode, copy_file
+from mpm.generators.tree import FileTree, default_jobs
+
+# Set to 1 (or "hardlink") to enable the environment cache
+VENV_CACHE_ENV = "MPM_VENV_CACHE"
+
+# Per-entry metadata: the project directory the cached .venv was built in
+ROOT_MARKER = "ROOT"
+
+# Per-entry metadata: the root project name in the cached uv.lock
+NAME_MARKER = "NAME"
+
+VENV_DIR = ".venv"
+LOCK_FILE = "uv.lock"
+
+
+def venv_key(tree: FileTree) -> str:
+    """Hash every pyproject.toml and uv.lock in a rendered project.
+
+    When the root project is not installed (`package = false`, as in a
+    monorepo), only the parts of its pyproject.toml that uv resolves from count,
+    without its name (as in lockseed.lock_fingerprint), and its name in uv.lock
+    is masked: the environment does not depend on them.
+    """
+    from mpm.generators.lockseed import lock_inputs
+
+    root_name = _unpackaged_root_name(tree)
+    digest = hashlib.sha256()
+    for path in tree:
+        if path.name not in ("pyproject.toml", LOCK_FILE):
+            continue
+        content = tree[path]
+        if root_name is not None and path == PurePosixPath("pyproject.toml"):
+            inputs = lock_inputs(tomllib.loads(tree.read_text(path)))
+            inputs["project"].pop("name")
+            content = json.dumps(inputs, sort_keys=True).encode()
+        elif root_name is not None and path == PurePosixPath(LOCK_FILE):
+            content = content.replace(f'"{root_name}"'.encode(), b'"\0"')
+        digest.update(f"{path}\0".encode())
+        digest.update(content)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _unpackaged_root_name(tree: FileTree) -> str | None:
+    """The normalized name of the root project if uv does not install it, else None."""
+    from mpm.utils import normalize_name
+
+    if "pyproject.toml" not in tree:
+        return None
+    data = tomllib.loads(tree.read_text("pyproject.toml"))
+    name = data.get("project", {}).get("name")
+    if not isinstance(name, str) or data.get("tool", {}).get("uv", {}).get("package", True):
+        return None
+    return normalize_name(name)
+
+
+def _project_name(project: Path) -> str:
+    """The normalized name in project/pyproject.toml, or "" if it cannot be read."""
+    from mpm.utils import normalize_name
+
+    try:
+        with open(project / "pyproject.toml", "rb") as f:
+            return normalize_name(tomllib.load(f).get("project", {}).get("name", ""))
+    except (OSError, ValueError):
+        return ""
+
+
+def _needs_fixup(relative: Path) -> bool:
+    """Whether a file in a venv can embed the absolute path of the project."""
+    name = relative.name
+    return (
+        relative.parts[0] in ("bin", "Scripts")
+        or name == "pyvenv.cfg"
+        or name.endswith(".pth")
+        or name == "direct_url.json"
+    )
+
+
+class VenvCache:
+    """Directory of cached environments, one `<key>/.venv` (plus its uv.lock) per entry."""
+
+    def __init__(self, directory: Path, mode: CopyMode = CopyMode.AUTO) -> None:
+        self.directory = directory
+        self.mode = mode
+
+    def entry(self, key: str) -> Path:
+        return self.directory / key
+
+    def restore(self, key: str, project: Path, jobs: int | None = None) -> bool:
+        """Clone the cached environment for key into project/.venv.
+
+        The cached uv.lock is copied too, with the root project renamed, unless
+        the project already has one.
+
+        Returns:
+            False on a cache miss (or a cached environment whose interpreter is gone).
+        """
+        entry = self.entry(key)
+        try:
+            old_root = (entry / ROOT_MARKER).read_text()
+        except OSError:
+            return False
+        if not _interpreter_exists(entry / VENV_DIR):
+            return False
+
+        target = project / VENV_DIR
+        if target.exists():
+            shutil.rmtree(target)
+        _clone_tree(entry / VENV_DIR, target, self.mode, old_root, str(project), jobs)
+        if (entry / LOCK_FILE).is_file() and not (project / LOCK_FILE).exists():
+            lock = (entry / LOCK_FILE).read_text()
+            old_name, new_name = _read_marker(entry / NAME_MARKER), _project_name(project)
+            if old_name and new_name:
+                lock = lock.replace(f'"{old_name}"', f'"{new_name}"')
+            (project / LOCK_FILE).write_text(lock)
+        return True
+
+    def store(self, key: str, project: Path) -> None:
+        """Add project/.venv to the cache (no-op if the entry exists)."""
+        entry = self.entry(key)
+        if entry.exists():
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=self.directory))
+        try:
+            # Always copy (or reflink) into the cache, so edits in the project never reach it
+            _clone_tree(project / VENV_DIR, staging / VENV_DIR, CopyMode.AUTO, None, None)
+            if (project / LOCK_FILE).is_file():
+                shutil.copyfile(project / LOCK_FILE, staging / LOCK_FILE)
+            (staging / NAME_MARKER).write_text(_project_name(project))
+            (staging / ROOT_MARKER).write_text(str(project))
+            os.replace(staging, entry)
+        except OSError:
+            # Another process stored the same entry first, or the cache is unwritable
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def default_venv_cache() -> VenvCache | None:
+    """Return the environment cache if enabled via MPM_VENV_CACHE."""
+    value = os.environ.get(VENV_CACHE_ENV, "").lower()
+    if value == CopyMode.HARDLINK.value:
+        mode = CopyMode.HARDLINK
+    elif value in ("1", "true", "yes"):
+        mode = CopyMode.AUTO
+    else:
+        return None
+
+    from mpm.utils import user_cache_dir
+
+    return VenvCache(user_cache_dir() / "venvs", mode)
+
+
+def _read_marker(path: Path) -> str:
+    try:
+        return path.read_text()
+    except OSError:
+        return ""
+
+
+def _interpreter_exists(venv: Path) -> bool:
+    """Check that the base interpreter recorded in pyvenv.cfg is still installed."""
+    try:
+        config = (venv / "pyvenv.cfg").read_text()
+    except OSError:
+        return False
+    for line in config.splitlines():
+        key, _, value = line.partition("=")
+        if key.strip() == "home":
+            return Path(value.strip()).is_dir()
+    return True
+
+
+def _clone_tree(
+    src: Path,
+    dst: Path,
+    mode: CopyMode,
+    old_root: str | None,
+    new_root: str | None,
+    jobs: int | None = None,
+) -> None:
+    """Recreate src at dst: directories, symlinks and files (files in parallel).
+
+    When old_root is given, files that can embed the project path are rewritten
+    with new_root instead of being linked.
+    """
+    files: list[tuple[Path, Path]] = []
+    for dirpath, dirnames, filenames in os.walk(src):
+        current = Path(dirpath)
+        target_dir = dst / current.relative_to(src)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for name in [*dirnames, *filenames]:
+            path = current / name
+            if path.is_symlink():
+                link = os.readlink(path)
+                if old_root is not None and new_root is not None:
+                    link = link.replace(old_root, new_root)
+                os.symlink(link, target_dir / name)
+                if name in dirnames:
+                    dirnames.remove(name)
+            elif name in filenames:
+                files.append((path, target_dir / name))
+
+    def clone(pair: tuple[Path, Path]) -> None:
+        path, target = pair
+        if old_root is not None and new_root is not None and _needs_fixup(path.relative_to(src)):
+            content = path.read_bytes()
+            if old_root.encode() in content:
+                target.write_bytes(content.replace(old_root.encode(), new_root.encode()))
+                shutil.copymode(path, target)
+                return
+        copy_file(path, target, mode)
+        shutil.copymode(path, target)
+
+    with ThreadPoolExecutor(max_workers=jobs or default_jobs()) as pool:
+        for _ in pool.map(clone, files):
+            pass
@@ -0,0 +1,130 @@
+"""Background warm-up - speculative work done while interactive prompts are answered.
+
+As soon as the project structure is known, the templates it can use are
+compiled into the shared renderer. Once the Python version is chosen too, the
+dev dependencies of a placeholder project are synced in a temporary directory,
+which fills the uv cache (and installs the interpreter if needed), so the real
+uv sync only links cached wheels.
+"""
+
+import subprocess
+import tempfile
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from mpm.config import ProjectConfig, ProjectStructure, PythonVersion
+from mpm.generators.sync import IndexOptions, uv_sync_command
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+# Template directories that only one structure renders
+_STRUCTURE_ONLY = {
+    ProjectStructure.MONOREPO: ("monorepo/", "samples/"),
+    ProjectStructure.SINGLE: ("single/",),
+}
+
+# Name of the placeholder project synced to warm the uv cache
+WARMUP_PROJECT_SLUG = "mpm-warmup"
+
+
+def warmup_templates(structure: ProjectStructure) -> list[str]:
+    """Names of the templates a project with the given structure can render."""
+    from mpm.generators.renderer import PackageTemplateLoader
+
+    excluded = tuple(prefix for other, prefixes in _STRUCTURE_ONLY.items() if other != structure for prefix in prefixes)
+    return [
+        name
+        for name in PackageTemplateLoader().list_templates()
+        if name.endswith(".jinja") and not name.startswith(excluded)
+    ]
+
+
+class Warmup:
+    """Background threads started from the prompts, finished (or cancelled) with the command.
+
+    Use as a context manager: leaving normally waits for the warm-up to finish,
+    leaving with an exception (e.g. Ctrl-C during a prompt) stops it.
+    """
+
+    def __init__(self, sync: bool = True, index: IndexOptions | None = None) -> None:
+        self.sync = sync
+        self.index = index
+        self._threads: list[threading.Thread] = []
+        self._process: subprocess.Popen[bytes] | None = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Warmup":
+        return self
+
+    def __exit__(self, exc_type: object, *_: object) -> None:
+        if exc_type is not None:
+            self.cancel()
+        self.join()
+
+    def start(self, name: str, func: Callable[..., None], *args: object) -> None:
+        """Run func(*args) in a background thread."""
+        thread = threading.Thread(target=self._run, args=(func, *args), name=f"mpm-warmup-{name}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def compile_templates(self, structure: ProjectStructure) -> None:
+        """Compile the templates for structure into the shared renderer."""
+        from mpm.generators.renderer import get_renderer
+
+        # Create the shared renderer here, so the generators later use the one being warmed
+        self.start("templates", _compile_templates, get_renderer().env, structure)
+
+    def warm_uv_cache(self, structure: ProjectStructure, python_version: PythonVersion) -> None:
+        """Download the dev dependencies for structure and python_version into the uv cache."""
+        if self.sync:
+            self.start("uv", self._sync_placeholder, structure, python_version)
+
+    def cancel(self) -> None:
+        """Stop pending warm-up work, terminating a running uv process."""
+        self._cancelled.set()
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                self._process.terminate()
+
+    def join(self) -> None:
+        """Wait for every warm-up thread to finish."""
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self, func: Callable[..., None], *args: object) -> None:
+        if self._cancelled.is_set():
+            return
+        try:
+            func(*args)
+        except Exception:  # warm-up is best effort; the real command reports errors
+            pass
+
+    def _sync_placeholder(self, structure: ProjectStructure, python_version: PythonVersion) -> None:
+        from mpm.generators.project import render_project
+
+        config = ProjectConfig(
+            project_name=WARMUP_PROJECT_SLUG.replace("-", "_"),
+            project_slug=WARMUP_PROJECT_SLUG,
+            structure=structure,
+            python_version=python_version,
+            init_git=False,
+            auto_sync=False,
+        )
+        cmd = [*uv_sync_command(structure == ProjectStructure.MONOREPO, index=self.index), "--no-install-workspace"]
+        with tempfile.TemporaryDirectory(prefix="mpm-warmup-") as tmp:
+            project = Path(tmp) / WARMUP_PROJECT_SLUG
+            render_project(config, project).flush()
+            with self._lock:
+                if self._cancelled.is_set():
+                    return
+                self._process = subprocess.Popen(cmd, cwd=project, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self._process.wait()
+
+
+def _compile_templates(env: "Environment", structure: ProjectStructure) -> None:
+    for name in warmup_templates(structure):
+        env.get_template(name)
@@ -0,0 +1,123 @@
+"""Wheelhouse - a local directory of the wheels generated projects install.
+
+`mpm new --offline --wheelhouse DIR` points uv sync at the directory as a
+--find-links index, so projects can be created without network access. The
+wheelhouse is filled by resolving the placeholder project of every standard
+shape (the same ones lock seeds are built for), exporting the pinned
+requirements plus the build backends, and downloading their wheels.
+"""
+
+import subprocess
+import tempfile
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from mpm.config import ProjectConfig, ProjectStructure
+from mpm.generators.lockseed import SEED_PROJECT_SLUG, seed_key
+from mpm.generators.steps import Step, StepResult, run_step
+from mpm.generators.tree import FileTree
+
+
+def uv_export_command(config: ProjectConfig) -> list[str]:
+    """The uv command printing every third-party requirement of a project, pinned."""
+    cmd = [
+        "uv",
+        "export",
+        "--format",
+        "requirements-txt",
+        "--no-hashes",
+        "--no-emit-project",
+        "--no-emit-workspace",
+        "--all-groups",
+        "--quiet",
+    ]
+    if config.structure == ProjectStructure.MONOREPO:
+        cmd.append("--all-packages")
+    return cmd
+
+
+def parse_requirements(text: str) -> list[str]:
+    """Requirement lines of a `uv export` output, without comments, annotations and local paths."""
+    requirements = []
+    for line in text.splitlines():
+        if not line or line[0].isspace() or line.startswith(("#", "-")):
+            continue
+        requirements.append(line.strip())
+    return requirements
+
+
+def build_requirements(tree: FileTree) -> list[str]:
+    """The build-system requirements of every package in a rendered project."""
+    requirements: dict[str, None] = {}
+    for path in tree:
+        if path.name == "pyproject.toml":
+            data = tomllib.loads(tree.read_text(path))
+            requirements.update(dict.fromkeys(data.get("build-system", {}).get("requires", [])))
+    return list(requirements)
+
+
+def pip_download_command(requirements: Path, directory: Path, config: ProjectConfig) -> list[str]:
+    """The command downloading the wheels in a requirements file for the project's Python version."""
+    return [
+        "uvx",
+        "pip",
+        "download",
+        "--quiet",
+        "--only-binary",
+        ":all:",
+        "--python-version",
+        config.python_version.value,
+        "--dest",
+        str(directory),
+        "--requirement",
+        str(requirements),
+    ]
+
+
+def fill_wheelhouse(config: ProjectConfig, directory: Path) -> tuple[bool, str]:
+    """Download the wheels the placeholder project for config installs into directory.
+
+    Returns:
+        A tuple of (succeeded, message to show).
+    """
+    from mpm.generators.project import render_project
+
+    key = seed_key(config)
+    with tempfile.TemporaryDirectory(prefix="mpm-wheelhouse-") as tmp:
+        project = Path(tmp) / SEED_PROJECT_SLUG
+        tree = render_project(config, project)
+        tree.flush()
+        try:
+            result = subprocess.run(uv_export_command(config), cwd=project, capture_output=True, text=True)
+        except FileNotFoundError:
+            return False, f"{key}: uv not found"
+        if result.returncode != 0:
+            error_msg = result.stderr.strip() if result.stderr else "Unknown error"
+            return False, f"{key}: uv export failed (exit {result.returncode}): {error_msg}"
+
+        requirements = [*parse_requirements(result.stdout), *build_requirements(tree)]
+        requirements_file = Path(tmp) / "requirements.txt"
+        requirements_file.write_text("\n".join(requirements) + "\n")
+        directory.mkdir(parents=True, exist_ok=True)
+        try:
+            result = subprocess.run(
+                pip_download_command(requirements_file, directory, config), capture_output=True, text=True
+            )
+        except FileNotFoundError:
+            return False, f"{key}: uvx not found"
+        if result.returncode != 0:
+            error_msg = result.stderr.strip() if result.stderr else "Unknown error"
+            return False, f"{key}: pip download failed (exit {result.returncode}): {error_msg}"
+
+    return True, f"{key}: {len(requirements)} requirements"
+
+
+def build_wheelhouse(configs: list[ProjectConfig], directory: Path, jobs: int) -> list[StepResult]:
+    """Fill directory for several configurations, running up to jobs downloads at once.
+
+    Wheels already in the directory are not downloaded again.
+    """
+    steps = [Step(seed_key(config), lambda config=config: fill_wheelhouse(config, directory)) for config in configs]
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        return list(pool.map(run_step, steps))
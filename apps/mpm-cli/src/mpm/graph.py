@@ -0,0 +1,255 @@
+"""Import graph - which workspace packages import which, from an ast scan of their modules.
+
+Every module of every package in libs/ and apps/ is parsed with ast (on a
+process pool when there are many) and its absolute imports are mapped to the
+packages that provide them: `{namespace}.{package}` for the namespace layout
+generated by mpm. Parse results are cached in `.mpm/imports` by file content
+hash, and files whose (mtime, size) stamp is unchanged are not even read, so
+after an edit only the edited file is parsed again.
+"""
+
+import ast
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+
+from mpm.workspace import WorkspaceMember, workspace_members
+
+# Import cache file, relative to the project root
+IMPORTS_CACHE_PATH = Path(".mpm") / "imports"
+
+# Bump when the cache format changes; older caches are discarded
+IMPORTS_CACHE_VERSION = 1
+
+# Below this many files to parse, a process pool costs more than it saves
+MIN_FILES_FOR_POOL = 64
+
+# Directories inside a package that never hold its modules
+_SKIP_DIRS = {"tests", ".venv", "__pycache__", "build", "dist"}
+
+
+class GraphFormat(str, Enum):
+    """Output format of mpm graph."""
+
+    JSON = "json"
+    DOT = "dot"
+
+
+@dataclass
+class ImportGraph:
+    """Workspace packages (by project name) and the internal packages each one imports."""
+
+    members: dict[str, WorkspaceMember]
+    edges: dict[str, set[str]]
+    # Files parsed in this run (the rest came from the cache)
+    parsed: int = 0
+    files: int = 0
+    module_names: dict[str, str] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        data = {
+            "packages": [
+                {
+                    "name": name,
+                    "path": member.path,
+                    "kind": member.kind,
+                    "module": self.module_names[name],
+                    "depends_on": sorted(self.edges[name]),
+                }
+                for name, member in sorted(self.members.items())
+            ]
+        }
+        return json.dumps(data, indent=2)
+
+    def to_dot(self) -> str:
+        lines = ["digraph workspace {", "  rankdir=LR;"]
+        for name, member in sorted(self.members.items()):
+            shape = "box" if member.kind == "app" else "ellipse"
+            lines.append(f'  "{name}" [shape={shape}];')
+        for name in sorted(self.edges):
+            lines.extend(f'  "{name}" -> "{target}";' for target in sorted(self.edges[name]))
+        lines.append("}")
+        return "\n".join(lines)
+
+
+def parse_imports(source: str | bytes) -> list[str]:
+    """Absolute module names a module imports, including `from x import y` as x.y.
+
+    Relative imports stay inside the package, so they are left out.
+    """
+    tree = ast.parse(source)
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names if alias.name != "*")
+    return sorted(names)
+
+
+def build_import_graph(root: Path, namespace: str, jobs: int = 1) -> ImportGraph:
+    """Scan the packages of the project at root and build their dependency graph.
+
+    Args:
+        root: Project root
+        namespace: Import namespace of the packages (the project name in mpm.toml)
+        jobs: Worker processes for parsing (1 parses in this process)
+    """
+    members = {member.project_name or member.name: member for member in workspace_members(root)}
+    module_names = {name: f"{namespace}.{member.name.replace('-', '_')}" for name, member in members.items()}
+    owners = {module: name for name, module in module_names.items()}
+
+    cache = _ImportCache(root)
+    package_files = {name: _module_files(root / member.path, namespace) for name, member in members.items()}
+    all_files = [path for files in package_files.values() for path in files]
+    imports = cache.lookup(all_files, jobs)
+
+    edges: dict[str, set[str]] = {name: set() for name in members}
+    for name, files in package_files.items():
+        for path in files:
+            for module in imports[path]:
+                owner = _owner(module, owners)
+                if owner is not None and owner != name:
+                    edges[name].add(owner)
+    return ImportGraph(members, edges, parsed=cache.parsed, files=len(all_files), module_names=module_names)
+
+
+def _owner(module: str, owners: dict[str, str]) -> str | None:
+    """The package providing a module: the longest `{namespace}.{package}` prefix."""
+    parts = module.split(".")
+    for size in range(len(parts), 1, -1):
+        owner = owners.get(".".join(parts[:size]))
+        if owner is not None:
+            return owner
+    return None
+
+
+def _module_files(package_dir: Path, namespace: str) -> list[str]:
+    """Python files of a package: its namespace directory, or the whole package without tests."""
+    top = package_dir / namespace if (package_dir / namespace).is_dir() else package_dir
+    files = []
+    for dirpath, dirnames, filenames in os.walk(top):
+        dirnames[:] = [name for name in dirnames if name not in _SKIP_DIRS and not name.startswith(".")]
+        files.extend(os.path.join(dirpath, name) for name in filenames if name.endswith(".py"))
+    return sorted(files)
+
+
+def _parse_file(path: str) -> list[str]:
+    """Imports of one file (runs in a worker process)."""
+    try:
+        return parse_imports(Path(path).read_bytes())
+    except (SyntaxError, ValueError):
+        # A file that does not parse imports nothing we can see
+        return []
+
+
+class _ImportCache:
+    """Per-file imports in .mpm/imports, keyed by path and validated by stamp, then content hash."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.path = root / IMPORTS_CACHE_PATH
+        self.parsed = 0
+        try:
+            data = json.loads(self.path.read_text())
+            self.entries: dict[str, dict] = data["files"] if data.get("version") == IMPORTS_CACHE_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            self.entries = {}
+
+    def lookup(self, files: list[str], jobs: int) -> dict[str, list[str]]:
+        """Imports of every file, parsing only new or changed ones, then save the cache."""
+        entries: dict[str, dict] = {}
+        changed: list[tuple[str, str]] = []
+        for path in files:
+            key = os.path.relpath(path, self.root)
+            stat = os.stat(path)
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            entry = self.entries.get(key)
+            if entry is not None and entry["stamp"] == stamp:
+                entries[key] = entry
+                continue
+            digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+            if entry is not None and entry["hash"] == digest:
+                # Touched but not changed: keep the imports, record the new stamp
+                entries[key] = {**entry, "stamp": stamp}
+            else:
+                entries[key] = {"stamp": stamp, "hash": digest, "imports": []}
+                changed.append((path, key))
+
+        for (_, key), imports in zip(changed, self._parse([path for path, _ in changed], jobs), strict=True):
+            entries[key]["imports"] = imports
+        self.parsed = len(changed)
+
+        if entries != self.entries:
+            self._save(entries)
+        return {path: entries[os.path.relpath(path, self.root)]["imports"] for path in files}
+
+    def _parse(self, paths: list[str], jobs: int) -> list[list[str]]:
+        if jobs <= 1 or len(paths) < MIN_FILES_FOR_POOL:
+            return [_parse_file(path) for path in paths]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(_parse_file, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+
+    def _save(self, entries: dict[str, dict]) -> None:
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({"version": IMPORTS_CACHE_VERSION, "files": entries}))
+            os.replace(tmp, self.path)
+        except OSError:
+            # The cache only saves time; a read-only tree still works
+            pass
+
+
+def find_cycles(edges: dict[str, set[str]]) -> list[list[str]]:
+    """Groups of packages that depend on each other in a cycle (strongly connected components).
+
+    Returns:
+        Each cycle's packages, sorted, in a sorted list; empty for a DAG.
+    """
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    cycles: list[list[str]] = []
+
+    # Iterative Tarjan, so deep dependency chains cannot hit the recursion limit
+    for start in sorted(edges):
+        if start in index:
+            continue
+        work = [(start, iter(sorted(edges[start])))]
+        index[start] = lowlink[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, targets = work[-1]
+            for target in targets:
+                if target not in index:
+                    index[target] = lowlink[target] = len(index)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(sorted(edges.get(target, ())))))
+                    break
+                if target in on_stack:
+                    lowlink[node] = min(lowlink[node], index[target])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in edges.get(node, ()):
+                        cycles.append(sorted(component))
+    return sorted(cycles)
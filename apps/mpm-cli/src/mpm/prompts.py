@@ -1,5 +1,7 @@
 """Questionary prompts for interactive mode."""
 
+from typing import TYPE_CHECKING
+
 import questionary
 from questionary import Choice
 
@@ -12,6 +14,9 @@ from mpm.config import (
 )
 from mpm.utils import validate_project_name
 
+if TYPE_CHECKING:
+    from mpm.generators.warmup import Warmup
+
 
 def _validate_name_prompt(name: str) -> bool | str:
     """Validate project/package name for questionary prompt."""
@@ -145,13 +150,22 @@ def prompt_agents_md() -> bool:
     return result
 
 
-def gather_project_config(name: str | None = None) -> ProjectConfig:
-    """Gather all configuration via interactive prompts."""
+def gather_project_config(name: str | None = None, warmup: "Warmup | None" = None) -> ProjectConfig:
+    """Gather all configuration via interactive prompts.
+
+    Args:
+        name: Project name (prompted for when not given)
+        warmup: Started on templates and the uv cache as soon as the answers allow
+    """
     project_name = name or prompt_project_name()
     project_slug = project_name.replace("_", "-").lower()
 
     structure = prompt_structure()
+    if warmup is not None:
+        warmup.compile_templates(structure)
     python_version = prompt_python_version()
+    if warmup is not None:
+        warmup.warm_uv_cache(structure, python_version)
     features = prompt_features()
     with_samples = prompt_samples() if structure == ProjectStructure.MONOREPO else False
     with_docs, docs_theme = prompt_docs()
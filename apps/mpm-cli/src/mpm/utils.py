@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import os
 import re
+import sys
 import tomllib
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -31,6 +34,11 @@ def to_kebab_case(name: str) -> str:
     return name.lower()
 
 
+def normalize_name(name: str) -> str:
+    """PEP 503 normalized distribution name, as uv writes it into uv.lock (e.g. 'My_Lib' -> 'my-lib')."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
 def is_valid_python_identifier(name: str) -> bool:
     """Check if a name is a valid Python identifier."""
     snake = to_snake_case(name)
@@ -150,22 +158,24 @@ def validate_project_name(name: str) -> tuple[bool, str]:
 
 def find_mpm_config(start_path: Path | None = None) -> Path | None:
     """Find mpm.toml by walking up directory tree."""
-    path = start_path or Path.cwd()
+    root = find_project_root(start_path)
+    return root / "mpm.toml" if root is not None else None
 
-    while path != path.parent:
-        mpm_toml = path / "mpm.toml"
-        if mpm_toml.exists():
-            return mpm_toml
-        path = path.parent
 
-    return None
+# Set to a project directory to use it instead of searching for mpm.toml
+PROJECT_ROOT_ENV = "MPM_PROJECT_ROOT"
 
 
 def find_project_root(start_path: Path | None = None) -> Path | None:
     """Find the project root by looking for mpm.toml.
 
-    All mpm-managed projects have an mpm.toml file at the root.
+    All mpm-managed projects have an mpm.toml file at the root. Lookups from
+    the current directory honour MPM_PROJECT_ROOT, which skips the search.
     """
+    if start_path is None and (override := os.environ.get(PROJECT_ROOT_ENV)):
+        root = Path(override).expanduser()
+        return root if (root / "mpm.toml").exists() else None
+
     path = start_path or Path.cwd()
 
     while path != path.parent:
@@ -190,6 +200,22 @@ def get_namespace_from_project(project_root: Path) -> str | None:
         return None
 
 
+def user_cache_dir() -> Path:
+    """Return the per-user cache directory for mpm.
+
+    Honours MPM_CACHE_DIR, then the platform convention (XDG_CACHE_HOME on Linux).
+    The directory is not created.
+    """
+    if override := os.environ.get("MPM_CACHE_DIR"):
+        return Path(override)
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+        return base / "mpm" / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "mpm"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "mpm"
+
+
 def load_mpm_config(path: Path) -> MpmConfig:
     """Load and parse mpm.toml file into MpmConfig."""
     from mpm.config import MpmConfig
@@ -210,3 +236,43 @@ def save_mpm_config(config: MpmConfig, path: Path) -> None:
     toml_content = tomli_w.dumps(toml_dict)
 
     path.write_text(header + toml_content)
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectContext:
+    """An mpm-managed project: its root directory and parsed mpm.toml.
+
+    Commands resolve it once (see resolve_project) and pass it to the
+    generators, so the directory walk and the mpm.toml parse happen once.
+    """
+
+    root: Path
+    config: MpmConfig
+
+    @property
+    def config_path(self) -> Path:
+        return self.root / "mpm.toml"
+
+    @property
+    def namespace(self) -> str:
+        """Python namespace of the project's packages (the project name)."""
+        return self.config.project_name
+
+    def save_config(self) -> None:
+        """Write the (modified) configuration back to mpm.toml."""
+        save_mpm_config(self.config, self.config_path)
+
+
+def resolve_project(start_path: Path | None = None) -> ProjectContext | None:
+    """Find the project enclosing start_path (default: cwd) and load its mpm.toml.
+
+    Returns:
+        The project, or None outside an mpm-managed project.
+
+    Raises:
+        OSError, ValueError: If mpm.toml cannot be read or is invalid.
+    """
+    root = find_project_root(start_path)
+    if root is None:
+        return None
+    return ProjectContext(root, load_mpm_config(root / "mpm.toml"))
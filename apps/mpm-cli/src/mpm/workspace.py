@@ -0,0 +1,186 @@
+"""Workspace index - a cached inventory of the packages in libs/ and apps/.
+
+The index lives in `.mpm/index` at the project root and records, for every
+directory under libs/ and apps/, its pyproject metadata and whether it has a
+Dockerfile or tests. It is refreshed incrementally: a group directory whose
+mtime is unchanged has the same entries, and an entry whose directory and
+pyproject.toml stamps are unchanged is reused without reading anything. A
+refresh therefore costs a couple of stats per package instead of a scan.
+"""
+
+import json
+import os
+import tomllib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+# Index file, relative to the project root
+INDEX_PATH = Path(".mpm") / "index"
+
+# Bump when the index format changes; older indexes are rebuilt
+INDEX_VERSION = 1
+
+# Workspace member directories and the package type they hold
+MEMBER_GROUPS = {"libs": "lib", "apps": "app"}
+
+
+@dataclass(frozen=True, slots=True)
+class WorkspaceMember:
+    """A directory under libs/ or apps/, with the stamps its record was read at.
+
+    Directories without a pyproject.toml are recorded too (is_package unset),
+    so one that gains a pyproject.toml is picked up by its own mtime.
+    """
+
+    path: str
+    kind: str
+    is_package: bool
+    project_name: str = ""
+    version: str = ""
+    description: str = ""
+    dependencies: list[str] = field(default_factory=list)
+    has_dockerfile: bool = False
+    has_tests: bool = False
+    dir_stamp: list[int] = field(default_factory=list)
+    pyproject_stamp: list[int] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        """Directory name of the package, e.g. 'api' for apps/api."""
+        return self.path.rsplit("/", 1)[-1]
+
+
+class WorkspaceIndex:
+    """The packages of one project, refreshed from `.mpm/index` and the directory stamps."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.path = root / INDEX_PATH
+        self.groups: dict[str, list[int]] = {}
+        self.entries: dict[str, WorkspaceMember] = {}
+        self._load()
+
+    def members(self, kind: str | None = None) -> list[WorkspaceMember]:
+        """Packages in the workspace, sorted by path, optionally only libs or apps."""
+        members = [self.entries[path] for path in sorted(self.entries)]
+        return [member for member in members if member.is_package and (kind is None or member.kind == kind)]
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with the tree and save it if anything changed.
+
+        Returns:
+            Whether any entry changed.
+        """
+        changed = False
+        groups: dict[str, list[int]] = {}
+        entries: dict[str, WorkspaceMember] = {}
+        for group, kind in MEMBER_GROUPS.items():
+            stamp = _stamp(self.root / group)
+            if stamp is None:
+                continue
+            groups[group] = stamp
+            if self.groups.get(group) == stamp:
+                paths = [path for path in self.entries if path.startswith(f"{group}/")]
+            else:
+                paths = [f"{group}/{child.name}" for child in _subdirectories(self.root / group)]
+            for path in paths:
+                member = self._refresh_entry(path, kind)
+                if member is not None:
+                    entries[path] = member
+                changed = changed or member != self.entries.get(path)
+
+        changed = changed or groups != self.groups or entries.keys() != self.entries.keys()
+        self.groups, self.entries = groups, entries
+        if changed:
+            self._save()
+        return changed
+
+    def _refresh_entry(self, path: str, kind: str) -> WorkspaceMember | None:
+        directory = self.root / path
+        dir_stamp = _stamp(directory)
+        if dir_stamp is None:
+            return None
+        pyproject_stamp = _stamp(directory / "pyproject.toml") or []
+        cached = self.entries.get(path)
+        if cached is not None and cached.dir_stamp == dir_stamp and cached.pyproject_stamp == pyproject_stamp:
+            return cached
+        return _read_member(directory, path, kind, dir_stamp, pyproject_stamp)
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text())
+            if data.get("version") != INDEX_VERSION:
+                return
+            self.groups = data["groups"]
+            self.entries = {entry["path"]: WorkspaceMember(**entry) for entry in data["members"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            # A missing or unreadable index is rebuilt from the tree
+            self.groups, self.entries = {}, {}
+
+    def _save(self) -> None:
+        data = {
+            "version": INDEX_VERSION,
+            "groups": self.groups,
+            "members": [asdict(member) for member in self.entries.values()],
+        }
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, indent=1))
+            os.replace(tmp, self.path)
+        except OSError:
+            # The index is only a cache; a read-only tree still works
+            pass
+
+
+def workspace_members(root: Path, kind: str | None = None) -> list[WorkspaceMember]:
+    """Return the up-to-date packages of the project at root (see WorkspaceIndex)."""
+    index = WorkspaceIndex(root)
+    index.refresh()
+    return index.members(kind)
+
+
+def _stamp(path: Path) -> list[int] | None:
+    """The (mtime, size) of path, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _subdirectories(directory: Path) -> list[Path]:
+    return [child for child in directory.iterdir() if child.is_dir() and not child.name.startswith(".")]
+
+
+def _read_member(
+    directory: Path, path: str, kind: str, dir_stamp: list[int], pyproject_stamp: list[int]
+) -> WorkspaceMember:
+    """Read the record of a member directory from the tree."""
+    has_dockerfile = (directory / "Dockerfile").is_file()
+    has_tests = (directory / "tests").is_dir()
+    try:
+        project = tomllib.loads((directory / "pyproject.toml").read_text()).get("project", {})
+    except (OSError, ValueError):
+        return WorkspaceMember(
+            path=path,
+            kind=kind,
+            is_package=False,
+            has_dockerfile=has_dockerfile,
+            has_tests=has_tests,
+            dir_stamp=dir_stamp,
+            pyproject_stamp=pyproject_stamp,
+        )
+    return WorkspaceMember(
+        path=path,
+        kind=kind,
+        is_package=True,
+        project_name=project.get("name", ""),
+        version=project.get("version", ""),
+        description=project.get("description", ""),
+        dependencies=list(project.get("dependencies", [])),
+        has_dockerfile=has_dockerfile,
+        has_tests=has_tests,
+        dir_stamp=dir_stamp,
+        pyproject_stamp=pyproject_stamp,
+    )
@@ -1,8 +1,9 @@
 """Shared test fixtures for MPM CLI tests."""
 
 import os
+import subprocess
 import tempfile
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from pathlib import Path
 from typing import Any
 
@@ -10,6 +11,7 @@ import pytest
 from typer.testing import CliRunner
 
 from mpm.cli import app
+from mpm.config import ProjectConfig, PythonVersion
 
 # Store the original directory at module load time
 _PROJECT_ROOT = Path(__file__).parent.parent.parent.parent.parent.resolve()
@@ -64,6 +66,68 @@ def run_mpm(cli_runner: CliRunner, temp_dir: Path) -> Any:
     return _run_mpm
 
 
+class FakeUv:
+    """Stand-in for subprocess.run that records uv commands instead of running them.
+
+    `uv lock` writes `lock` to uv.lock in the working directory, `uv export`
+    prints `export`, and `uvx pip download` writes a wheel to its --dest and
+    keeps the requirements it was given. Every command exits with
+    `returncode` and `stderr`.
+    """
+
+    def __init__(self, returncode: int = 0, stderr: str = "") -> None:
+        self.calls: list[list[str]] = []
+        self.cwds: list[Path | None] = []
+        self.returncode = returncode
+        self.stderr = stderr
+        self.lock = "version = 1\n"
+        self.export = ""
+        self.requirements = ""
+
+    def __call__(self, cmd: list[str], cwd: Path | None = None, **kwargs: Any) -> subprocess.CompletedProcess[str]:
+        self.calls.append(cmd)
+        self.cwds.append(cwd)
+        stdout = ""
+        if cmd[:2] == ["uv", "lock"]:
+            (Path(cwd or ".") / "uv.lock").write_text(self.lock)
+        elif cmd[:2] == ["uv", "export"]:
+            stdout = self.export
+        elif cmd[:3] == ["uvx", "pip", "download"]:
+            self.requirements = Path(cmd[cmd.index("--requirement") + 1]).read_text()
+            dest = Path(cmd[cmd.index("--dest") + 1])
+            (dest / "ruff-0.8.0-py3-none-any.whl").write_bytes(b"wheel")
+        return subprocess.CompletedProcess(cmd, self.returncode, stdout, self.stderr)
+
+
+@pytest.fixture
+def fake_uv(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> FakeUv:
+    """Replace subprocess.run with a FakeUv, with the mpm cache in tmp_path."""
+    monkeypatch.setenv("MPM_CACHE_DIR", str(tmp_path / "cache"))
+    fake = FakeUv()
+    monkeypatch.setattr(subprocess, "run", fake)
+    return fake
+
+
+@pytest.fixture
+def make_config() -> Callable[..., ProjectConfig]:
+    """Factory fixture for the ProjectConfig of a Python 3.12 project without git.
+
+    Keyword arguments override the defaults.
+    """
+
+    def _make_config(**overrides: Any) -> ProjectConfig:
+        values: dict[str, Any] = {
+            "project_name": "test_app",
+            "project_slug": "test-app",
+            "python_version": PythonVersion.PY312,
+            "init_git": False,
+        }
+        values.update(overrides)
+        return ProjectConfig(**values)
+
+    return _make_config
+
+
 def pytest_configure(config: pytest.Config) -> None:
     """Configure pytest markers."""
     config.addinivalue_line("markers", "slow: marks tests as slow (deselect with '-m \"not slow\"')")
@@ -303,6 +303,108 @@ class TestAddDocsCommand:
         finally:
             os.chdir(original_dir)
 
+    def test_add_docs_keeps_existing_index(self, run_mpm: Any, temp_dir: Path) -> None:
+        """Test that add docs never replaces a hand-written docs/index.md."""
+        exit_code, _output, project = run_mpm("docs-keep-test", "--monorepo", "-y")
+        assert exit_code == 0
+        (project / "docs").mkdir()
+        (project / "docs" / "index.md").write_text("# My docs\n")
+
+        runner = CliRunner()
+        original_dir = os.getcwd()
+        os.chdir(project)
+
+        try:
+            result = runner.invoke(app, ["add", "docs"])
+            assert result.exit_code == 0
+            assert "Kept existing docs/index.md" in result.stdout
+            assert "1 skipped" in result.stdout
+            assert (project / "docs" / "index.md").read_text() == "# My docs\n"
+        finally:
+            os.chdir(original_dir)
+
+
+class TestAddSeveralFeatures:
+    """Test 'mpm add features' with several features at once."""
+
+    def test_add_all_features_in_one_pass(self, run_mpm: Any, temp_dir: Path, monkeypatch: Any) -> None:
+        """Test that mpm.toml is loaded and saved once and uv sync runs once."""
+        import mpm.utils
+        from mpm.generators import sync
+
+        exit_code, _output, project = run_mpm("combo-test", "--single", "-y")
+        assert exit_code == 0
+
+        saves: list[Path] = []
+        original_save = mpm.utils.save_mpm_config
+        monkeypatch.setattr(mpm.utils, "save_mpm_config", lambda c, p: (saves.append(p), original_save(c, p)))
+        syncs: list[list[str]] = []
+        monkeypatch.setattr(sync, "run_uv", lambda cmd, root: (syncs.append(cmd), (True, "Dependencies installed"))[1])
+
+        runner = CliRunner()
+        original_dir = os.getcwd()
+        os.chdir(project)
+
+        try:
+            result = runner.invoke(app, ["add", "features", "docs", "pypi", "ci", "docker", "--theme", "shadcn"])
+            assert result.exit_code == 0, result.stdout
+            assert "CI is not enabled" not in result.stdout
+            assert result.stdout.index("Added Docker") < result.stdout.index("Added MkDocs")
+
+            for name in (".dockerignore", "Dockerfile", ".github/workflows/pr.yml", ".github/workflows/release.yml"):
+                assert (project / name).exists(), name
+            assert "name: shadcn" in (project / "mkdocs.yml").read_text()
+
+            with open(project / "mpm.toml", "rb") as f:
+                features = tomllib.load(f)["features"]
+            assert features["docker"] and features["ci"] and features["pypi"] and features["docs"]
+            assert len(saves) == 1
+            assert syncs == [["uv", "sync"]]
+        finally:
+            os.chdir(original_dir)
+
+    def test_add_features_skips_enabled_and_rejects_unknown(self, run_mpm: Any, temp_dir: Path) -> None:
+        """Test that enabled features are reported and unknown names fail before any change."""
+        exit_code, _output, project = run_mpm("combo-skip-test", "--monorepo", "--with-ci", "-y")
+        assert exit_code == 0
+
+        runner = CliRunner()
+        original_dir = os.getcwd()
+        os.chdir(project)
+
+        try:
+            result = runner.invoke(app, ["add", "features", "ci", "kubernetes"])
+            assert result.exit_code == 1
+            assert "Unknown feature 'kubernetes'" in result.stdout
+
+            result = runner.invoke(app, ["add", "features", "ci", "pypi"])
+            assert result.exit_code == 0
+            assert "CI is already enabled" in result.stdout
+            assert "Added PyPI publishing workflow" in result.stdout
+            assert "Added GitHub Actions CI" not in result.stdout
+        finally:
+            os.chdir(original_dir)
+
+    def test_add_features_checks_theme_only_for_docs(self, run_mpm: Any, temp_dir: Path) -> None:
+        """Test that --theme is ignored unless docs are being added."""
+        exit_code, _output, project = run_mpm("combo-theme-test", "--single", "--with-docs", "-y")
+        assert exit_code == 0
+
+        runner = CliRunner()
+        original_dir = os.getcwd()
+        os.chdir(project)
+
+        try:
+            result = runner.invoke(app, ["add", "features", "docs", "ci", "--theme", "whatever", "--no-sync"])
+            assert result.exit_code == 0, result.stdout
+            assert "Added GitHub Actions CI" in result.stdout
+
+            result = runner.invoke(app, ["add", "features", "docker", "--theme", "whatever", "--no-sync"])
+            assert result.exit_code == 0, result.stdout
+            assert "Invalid theme" not in result.stdout
+        finally:
+            os.chdir(original_dir)
+
 
 class TestAddFeaturesRequiresMpmToml:
     """Test that feature commands require mpm.toml."""
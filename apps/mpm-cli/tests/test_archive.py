@@ -0,0 +1,134 @@
+"""Tests for streaming generated projects into archives."""
+
+import io
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from mpm.cli import app
+from mpm.generators.archive import archive_format, write_archive
+from mpm.generators.tree import FileTree
+
+
+@pytest.mark.parametrize(
+    ("target", "expected"),
+    [
+        ("out.tar.gz", "w|gz"),
+        ("out.tgz", "w|gz"),
+        ("out.tar.xz", "w|xz"),
+        ("out.tar.bz2", "w|bz2"),
+        ("out.tar", "w|"),
+        ("OUT.ZIP", "zip"),
+        ("-", "w|gz"),
+    ],
+)
+def test_archive_format(target: str, expected: str) -> None:
+    """Test archive format detection from the target name."""
+    assert archive_format(target) == expected
+
+
+def test_archive_format_rejects_unknown_suffix() -> None:
+    """Test that unsupported archive types raise ValueError."""
+    with pytest.raises(ValueError, match="Unsupported archive type"):
+        archive_format("out.rar")
+
+
+def _sample_tree() -> FileTree:
+    tree = FileTree(Path("demo"))
+    tree.add_file("README.md", b"# Demo\n")
+    tree.add_file("bin/run.sh", b"#!/bin/sh\n", mode=0o755)
+    tree.add_directory("libs")
+    return tree
+
+
+def test_write_tar_archive(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test tar output includes files, empty directories and modes under the prefix."""
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    buffer = io.BytesIO()
+    write_archive(_sample_tree(), buffer, "w|gz", "demo")
+
+    with tarfile.open(fileobj=io.BytesIO(buffer.getvalue()), mode="r:gz") as archive:
+        members = {member.name: member for member in archive.getmembers()}
+        assert set(members) == {"demo", "demo/bin", "demo/libs", "demo/README.md", "demo/bin/run.sh"}
+        assert members["demo/libs"].isdir()
+        assert members["demo/bin/run.sh"].mode == 0o755
+        assert members["demo/README.md"].mtime == 1700000000
+        extracted = archive.extractfile("demo/README.md")
+        assert extracted is not None
+        assert extracted.read() == b"# Demo\n"
+
+
+def test_write_zip_archive() -> None:
+    """Test zip output includes files and empty directories under the prefix."""
+    buffer = io.BytesIO()
+    write_archive(_sample_tree(), buffer, "zip", "demo")
+
+    with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as archive:
+        assert set(archive.namelist()) == {"demo/", "demo/bin/", "demo/libs/", "demo/README.md", "demo/bin/run.sh"}
+        assert archive.read("demo/bin/run.sh") == b"#!/bin/sh\n"
+
+
+def test_new_archive_to_file(cli_runner: CliRunner, temp_dir: Path) -> None:
+    """Test mpm new --archive writes an archive and no project directory."""
+    original_dir = os.getcwd()
+    os.chdir(temp_dir)
+    try:
+        result = cli_runner.invoke(app, ["new", "archived", "--monorepo", "--with-samples", "--archive", "out.zip"])
+    finally:
+        os.chdir(original_dir)
+
+    assert result.exit_code == 0
+    assert [p.name for p in temp_dir.iterdir()] == ["out.zip"]
+    with zipfile.ZipFile(temp_dir / "out.zip") as archive:
+        names = archive.namelist()
+    assert "archived/pyproject.toml" in names
+    assert "archived/libs/greeter/pyproject.toml" in names
+    assert "archived/apps/" in names
+
+
+def test_new_archive_to_stdout(cli_runner: CliRunner, temp_dir: Path) -> None:
+    """Test mpm new --archive - streams a gzipped tar to stdout."""
+    original_dir = os.getcwd()
+    os.chdir(temp_dir)
+    try:
+        result = cli_runner.invoke(app, ["new", "streamed", "--single", "--archive", "-"])
+    finally:
+        os.chdir(original_dir)
+
+    assert result.exit_code == 0
+    assert list(temp_dir.iterdir()) == []
+    with tarfile.open(fileobj=io.BytesIO(result.stdout_bytes), mode="r:gz") as archive:
+        assert "streamed/src/streamed/__init__.py" in archive.getnames()
+
+
+def test_new_archive_unsupported_type(cli_runner: CliRunner, temp_dir: Path) -> None:
+    """Test that an unsupported archive suffix fails cleanly."""
+    original_dir = os.getcwd()
+    os.chdir(temp_dir)
+    try:
+        result = cli_runner.invoke(app, ["new", "bad-archive", "--archive", "out.rar"])
+    finally:
+        os.chdir(original_dir)
+
+    assert result.exit_code == 1
+    assert "Unsupported archive type" in result.output
+    assert list(temp_dir.iterdir()) == []
+
+
+def test_new_archive_missing_directory(cli_runner: CliRunner, temp_dir: Path) -> None:
+    """Test that an archive in a missing directory fails cleanly, before anything is rendered."""
+    original_dir = os.getcwd()
+    os.chdir(temp_dir)
+    try:
+        result = cli_runner.invoke(app, ["new", "lost-archive", "-y", "--archive", "missing/dir/out.tar.gz"])
+    finally:
+        os.chdir(original_dir)
+
+    assert result.exit_code == 1
+    assert "Could not write archive missing/dir/out.tar.gz" in result.output
+    assert "does not exist" in result.output
+    assert list(temp_dir.iterdir()) == []
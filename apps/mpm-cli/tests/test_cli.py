@@ -288,3 +288,71 @@ class TestProjectNameValidation:
         result = cli_runner.invoke(app, ["new", "my_awesome_project", "--monorepo", "-y"])
         assert result.exit_code == 0
         assert "Project Created" in result.stdout
+
+
+class TestBulkAdd:
+    """Test adding many packages with one 'mpm add' command."""
+
+    def test_add_several_libs(self, cli_runner: CliRunner, temp_dir) -> None:
+        """Test that 'mpm add lib' accepts several names."""
+        os.chdir(temp_dir)
+        result = cli_runner.invoke(app, ["new", "bulk-project", "--monorepo", "--no-git", "--no-sync"])
+        assert result.exit_code == 0
+        os.chdir(temp_dir / "bulk-project")
+
+        result = cli_runner.invoke(app, ["add", "lib", "billing", "ledger", "audit", "--jobs", "2"])
+
+        assert result.exit_code == 0, result.stdout
+        assert "Created 3 libraries and 0 applications" in result.stdout
+        for name in ("billing", "ledger", "audit"):
+            assert (temp_dir / "bulk-project" / "libs" / name / "pyproject.toml").exists()
+
+    def test_add_from_manifest(self, cli_runner: CliRunner, temp_dir) -> None:
+        """Test that 'mpm add --from' creates every package with its description and Docker flag."""
+        os.chdir(temp_dir)
+        result = cli_runner.invoke(app, ["new", "bulk-project", "--monorepo", "--no-git", "--no-sync"])
+        assert result.exit_code == 0
+        project = temp_dir / "bulk-project"
+        os.chdir(project)
+        (project / "packages.toml").write_text(
+            '[[package]]\nname = "billing"\ndescription = "Billing rules"\n\n'
+            '[[package]]\nname = "api"\ntype = "app"\ndocker = true\n'
+        )
+
+        result = cli_runner.invoke(app, ["add", "--from", "packages.toml"])
+
+        assert result.exit_code == 0, result.stdout
+        assert "Created 1 libraries and 1 applications" in result.stdout
+        assert 'description = "Billing rules"' in (project / "libs" / "billing" / "pyproject.toml").read_text()
+        assert (project / "apps" / "api" / "Dockerfile").exists()
+
+    def test_manifest_entries_must_be_tables(self, cli_runner: CliRunner, temp_dir) -> None:
+        """Test that a manifest entry that is not a table is reported by its position."""
+        os.chdir(temp_dir)
+        result = cli_runner.invoke(app, ["new", "bulk-project", "--monorepo", "--no-git", "--no-sync"])
+        assert result.exit_code == 0
+        project = temp_dir / "bulk-project"
+        os.chdir(project)
+        (project / "packages.toml").write_text('package = ["billing"]\n')
+
+        result = cli_runner.invoke(app, ["add", "--from", "packages.toml"])
+
+        assert result.exit_code == 1
+        assert "package #1 must be a [[package]] table" in result.stdout
+        assert not (project / "libs" / "billing").exists()
+
+    def test_invalid_name_stops_whole_batch(self, cli_runner: CliRunner, temp_dir) -> None:
+        """Test that names are validated before any package is generated."""
+        os.chdir(temp_dir)
+        result = cli_runner.invoke(app, ["new", "bulk-project", "--monorepo", "--no-git", "--no-sync"])
+        assert result.exit_code == 0
+        os.chdir(temp_dir / "bulk-project")
+
+        result = cli_runner.invoke(app, ["add", "lib", "billing", "import"])
+        assert result.exit_code == 1
+        assert "Invalid package name 'import'" in result.stdout
+        assert not (temp_dir / "bulk-project" / "libs" / "billing").exists()
+
+        result = cli_runner.invoke(app, ["add", "app", "api", "api"])
+        assert result.exit_code == 1
+        assert "listed more than once" in result.stdout
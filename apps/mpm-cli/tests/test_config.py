@@ -408,10 +408,10 @@ def test_mpm_config_to_toml_dict_created_at_includes_timezone() -> None:
 
 def test_project_generator_context_created_at_includes_timezone(tmp_path: Path) -> None:
     """Test that project generator creates timezone-aware created_at in context."""
+    from mpm.generators.plan import RenderPlan
     from mpm.generators.project import _generate_base_files
-    from mpm.generators.renderer import TemplateRenderer
 
-    renderer = TemplateRenderer()
+    plan = RenderPlan(tmp_path)
     ctx = {
         "project_name": "test_project",
         "project_slug": "test-project",
@@ -433,7 +433,7 @@ def test_project_generator_context_created_at_includes_timezone(tmp_path: Path)
         "project_description": "",
     }
 
-    _generate_base_files(renderer, tmp_path, ctx)
+    _generate_base_files(plan, tmp_path, ctx)
 
     # Verify created_at was added to context and includes timezone info
     assert "created_at" in ctx
@@ -0,0 +1,117 @@
+"""Tests for writing detected internal dependencies (mpm deps sync)."""
+
+import tomllib
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from mpm.cli import app
+from mpm.generators.deps import requirement_name, sync_dependencies, sync_package_dependencies
+from mpm.generators.tree import FileStatus
+from mpm.graph import build_import_graph, find_cycles
+
+PYPROJECT = """[project]
+name = "{name}"
+version = "0.1.0"
+dependencies = {dependencies}
+
+[tool.uv]
+dev-dependencies = []
+"""
+
+
+def _package(root: Path, group: str, name: str, source: str, dependencies: str = "[]") -> Path:
+    module = root / group / name / "acme" / name / "__init__.py"
+    module.parent.mkdir(parents=True)
+    module.write_text(source)
+    pyproject = root / group / name / "pyproject.toml"
+    pyproject.write_text(PYPROJECT.format(name=name, dependencies=dependencies))
+    return pyproject
+
+
+def _load(path: Path) -> dict:
+    return tomllib.loads(path.read_text())
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    (tmp_path / "mpm.toml").write_text('[project]\nname = "acme"\nslug = "acme"\n')
+    _package(tmp_path, "libs", "core", "import json\n")
+    _package(tmp_path, "libs", "billing", "from acme import core\n", '["requests>=2", "core"]')
+    _package(tmp_path, "apps", "api", "from acme import billing, core\n", '["requests>=2"]')
+    return tmp_path
+
+
+def test_requirement_name() -> None:
+    """Test that requirement strings are reduced to normalized project names."""
+    assert requirement_name("Foo_Bar[extra]>=1.0 ; python_version > '3.10'") == "foo-bar"
+    assert requirement_name("greeter") == "greeter"
+
+
+def test_sync_dependencies_writes_only_changed_files(workspace: Path) -> None:
+    """Test that missing internal dependencies and sources are added, and complete files left alone."""
+    billing = workspace / "libs" / "billing" / "pyproject.toml"
+    billing.write_text(billing.read_text() + "\n[tool.uv.sources]\ncore = { workspace = true }\n")
+    before = billing.stat().st_mtime_ns
+
+    updates = {u.path.parent.name: u for u in sync_dependencies(workspace, build_import_graph(workspace, "acme"))}
+
+    assert updates["api"].status == FileStatus.MODIFIED
+    assert updates["api"].added == ("billing", "core")
+    api = _load(workspace / "apps" / "api" / "pyproject.toml")
+    assert api["project"]["dependencies"] == ["requests>=2", "billing", "core"]
+    assert api["tool"]["uv"]["sources"] == {"billing": {"workspace": True}, "core": {"workspace": True}}
+    assert updates["billing"].status == FileStatus.UNCHANGED
+    assert billing.stat().st_mtime_ns == before
+    assert updates["core"].status == FileStatus.UNCHANGED
+    assert "sources" not in _load(workspace / "libs" / "core" / "pyproject.toml")["tool"]["uv"]
+
+    again = sync_dependencies(workspace, build_import_graph(workspace, "acme"))
+    assert all(update.status == FileStatus.UNCHANGED for update in again)
+
+
+def test_sync_leaves_pyproject_without_project_table(tmp_path: Path) -> None:
+    """Test that a pyproject.toml without [project] is not given an empty one."""
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text("[tool.uv]\ndev-dependencies = []\n")
+
+    update = sync_package_dependencies(pyproject, {"core"}, {"core", "tools"})
+
+    assert update.status == FileStatus.UNCHANGED
+    assert pyproject.read_text() == "[tool.uv]\ndev-dependencies = []\n"
+
+
+def test_sync_dependencies_prune(workspace: Path) -> None:
+    """Test that --prune removes workspace dependencies that are no longer imported."""
+    (workspace / "libs" / "billing" / "acme" / "billing" / "__init__.py").write_text("import json\n")
+
+    sync_dependencies(workspace, build_import_graph(workspace, "acme"))
+    assert "core" in _load(workspace / "libs" / "billing" / "pyproject.toml")["project"]["dependencies"]
+
+    [update] = [u for u in sync_dependencies(workspace, build_import_graph(workspace, "acme"), prune=True) if u.removed]
+    assert update.removed == ("core",)
+    assert _load(update.path)["project"]["dependencies"] == ["requests>=2"]
+
+
+def test_find_cycles() -> None:
+    """Test that dependency cycles are found as groups of packages."""
+    edges = {"a": {"b"}, "b": {"c"}, "c": {"a"}, "d": {"a"}, "e": {"f"}, "f": {"e"}, "g": set()}
+    assert find_cycles(edges) == [["a", "b", "c"], ["e", "f"]]
+    assert find_cycles({"a": {"b"}, "b": set()}) == []
+
+
+def test_deps_sync_command_reports_cycles(workspace: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that mpm deps sync updates the files, then fails on a dependency cycle."""
+    monkeypatch.chdir(workspace)
+
+    result = CliRunner().invoke(app, ["deps", "sync", "--no-sync", "--jobs", "2"])
+    assert result.exit_code == 0, result.stdout
+    assert "Updated apps/api/pyproject.toml (+billing, +core)" in result.stdout
+    assert "Updated libs/billing/pyproject.toml (core source)" in result.stdout
+    assert "Files: 2 written, 1 unchanged, 0 skipped" in result.stdout
+
+    (workspace / "libs" / "core" / "acme" / "core" / "__init__.py").write_text("from acme import billing\n")
+    result = CliRunner().invoke(app, ["deps", "sync", "--no-sync"])
+    assert result.exit_code == 1
+    assert "Dependency cycle between: billing, core" in result.stdout
@@ -0,0 +1,110 @@
+"""Tests for fast static file copies."""
+
+import errno
+import os
+from pathlib import Path
+
+import pytest
+
+from mpm.generators import filecopy
+from mpm.generators.filecopy import CopyMode, copy_file, default_copy_mode
+from mpm.generators.renderer import TemplateRenderer
+from mpm.generators.tree import FileStatus
+
+
+@pytest.fixture(autouse=True)
+def _reset_unsupported(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each test starts with every copy strategy enabled."""
+    monkeypatch.setattr(filecopy, "_unsupported", set())
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    src = tmp_path / "logo.png"
+    src.write_bytes(os.urandom(256 * 1024))
+    return src
+
+
+def test_copy_file_auto(source: Path, tmp_path: Path) -> None:
+    """Test the default chain produces an independent copy."""
+    dest = tmp_path / "out" / "logo.png"
+    method = copy_file(source, dest)
+
+    assert method in ("reflink", "copy_file_range", "copy")
+    assert dest.read_bytes() == source.read_bytes()
+    assert not os.path.samefile(source, dest)
+
+
+def test_copy_file_falls_back_to_plain_copy(source: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that unsupported kernel copies fall back to a plain copy and are not retried."""
+    calls = []
+
+    def no_copy_file_range(*args: object) -> int:
+        calls.append(args)
+        raise OSError(errno.ENOSYS, "not supported")
+
+    monkeypatch.setattr(filecopy, "_reflink", lambda src_fd, dst_fd: False)
+    monkeypatch.setattr(os, "copy_file_range", no_copy_file_range, raising=False)
+
+    assert copy_file(source, tmp_path / "a.png") == "copy"
+    assert copy_file(source, tmp_path / "b.png") == "copy"
+    assert len(calls) == 1
+    assert (tmp_path / "b.png").read_bytes() == source.read_bytes()
+
+
+def test_copy_file_hardlink(source: Path, tmp_path: Path) -> None:
+    """Test hardlink mode links the destination to the source, replacing existing files."""
+    dest = tmp_path / "linked.png"
+    dest.write_bytes(b"old")
+
+    assert copy_file(source, dest, CopyMode.HARDLINK) == "hardlink"
+    assert os.path.samefile(source, dest)
+
+
+def test_copy_file_hardlink_cross_device(source: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test hardlink mode falls back to copying across filesystems."""
+
+    def cross_device(src: Path, dst: Path) -> None:
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr(os, "link", cross_device)
+    dest = tmp_path / "copied.png"
+
+    assert copy_file(source, dest, CopyMode.HARDLINK) != "hardlink"
+    assert dest.read_bytes() == source.read_bytes()
+    assert "hardlink" not in filecopy._unsupported
+
+
+def test_copy_over_hardlink_leaves_source_intact(source: Path, tmp_path: Path) -> None:
+    """Test that copying over a hardlinked file never writes through to the source."""
+    original = source.read_bytes()
+    other = tmp_path / "other.png"
+    other.write_bytes(b"different")
+    dest = tmp_path / "linked.png"
+    copy_file(source, dest, CopyMode.HARDLINK)
+
+    copy_file(other, dest)
+
+    assert dest.read_bytes() == b"different"
+    assert source.read_bytes() == original
+
+
+def test_default_copy_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test selecting hardlink mode with MPM_STATIC_COPY."""
+    monkeypatch.delenv("MPM_STATIC_COPY", raising=False)
+    assert default_copy_mode() == CopyMode.AUTO
+    monkeypatch.setenv("MPM_STATIC_COPY", "hardlink")
+    assert default_copy_mode() == CopyMode.HARDLINK
+    monkeypatch.setenv("MPM_STATIC_COPY", "bogus")
+    assert default_copy_mode() == CopyMode.AUTO
+
+
+def test_copy_static_hardlinks_templates(tmp_path: Path) -> None:
+    """Test that copy_static links to the packaged file in hardlink mode."""
+    renderer = TemplateRenderer(copy_mode=CopyMode.HARDLINK)
+    source = renderer.static_source("base/.gitignore")
+    assert source is not None
+
+    assert renderer.copy_static("base/.gitignore", tmp_path / ".gitignore") == FileStatus.ADDED
+    assert os.path.samefile(source, tmp_path / ".gitignore")
+    assert renderer.copy_static("base/.gitignore", tmp_path / ".gitignore") == FileStatus.UNCHANGED
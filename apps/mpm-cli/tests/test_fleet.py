@@ -0,0 +1,129 @@
+"""Tests for generating a fleet of projects from a spec file."""
+
+import os
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from mpm.cli import app
+from mpm.config import ProjectStructure, PythonVersion
+from mpm.generators.fleet import generate_fleet, load_fleet_spec
+
+SPEC = """
+[defaults]
+structure = "single"
+python_version = "3.12"
+init_git = false
+auto_sync = false
+
+[[project]]
+name = "cohort-a"
+
+[[project]]
+name = "cohort_b"
+structure = "monorepo"
+with_samples = true
+"""
+
+
+def test_load_fleet_spec(tmp_path: Path) -> None:
+    """Test that entries are merged with the defaults and named like mpm new names projects."""
+    spec = tmp_path / "fleet.toml"
+    spec.write_text(SPEC)
+
+    first, second = load_fleet_spec(spec)
+
+    assert (first.project_name, first.project_slug) == ("cohort_a", "cohort-a")
+    assert first.structure == ProjectStructure.SINGLE
+    assert second.structure == ProjectStructure.MONOREPO and second.with_samples
+    assert second.python_version == PythonVersion.PY312
+
+
+@pytest.mark.parametrize(
+    ("extra", "error"),
+    [
+        ('[[project]]\nname = "cohort-a"\n', "listed more than once"),
+        ('[[project]]\nname = "class"\n', "invalid project name"),
+        ('[[project]]\nname = "extra"\nwith_dokcer = true\n', "unknown settings: with_dokcer"),
+    ],
+)
+def test_load_fleet_spec_rejects_bad_entries(tmp_path: Path, extra: str, error: str) -> None:
+    """Test that the whole spec is checked before anything is generated."""
+    spec = tmp_path / "fleet.toml"
+    spec.write_text(SPEC + extra)
+
+    with pytest.raises(ValueError, match=error):
+        load_fleet_spec(spec)
+
+
+@pytest.mark.parametrize(
+    ("text", "error"),
+    [
+        ('project = ["cohort-a"]\n', "project #1 must be a \\[\\[project\\]\\] table"),
+        ('defaults = "single"\n[[project]]\nname = "cohort-a"\n', "\\[defaults\\] must be a table"),
+    ],
+)
+def test_load_fleet_spec_rejects_non_tables(tmp_path: Path, text: str, error: str) -> None:
+    """Test that entries and defaults that are not tables are reported, not merged."""
+    spec = tmp_path / "fleet.toml"
+    spec.write_text(text)
+
+    with pytest.raises(ValueError, match=error):
+        load_fleet_spec(spec)
+
+
+def test_generate_fleet(tmp_path: Path) -> None:
+    """Test that every project is generated by the worker pool and reported in spec order."""
+    spec = tmp_path / "fleet.toml"
+    spec.write_text(SPEC)
+    configs = load_fleet_spec(spec)
+    finished: list[str] = []
+
+    results = generate_fleet(
+        configs, tmp_path / "out", jobs=2, log_dir=tmp_path / "logs", on_done=lambda r: finished.append(r.name)
+    )
+
+    assert [result.name for result in results] == ["cohort-a", "cohort-b"]
+    assert all(result.ok for result in results), results
+    assert sorted(finished) == ["cohort-a", "cohort-b"]
+    assert (tmp_path / "out" / "cohort-a" / "pyproject.toml").exists()
+    assert (tmp_path / "out" / "cohort-b" / "libs" / "greeter" / "pyproject.toml").exists()
+    assert "Creating project at" in (tmp_path / "logs" / "cohort-b.log").read_text()
+
+
+def test_new_from_spec(cli_runner: CliRunner, temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that mpm new --from-spec prints a per-project report."""
+    monkeypatch.setenv("MPM_CACHE_DIR", str(temp_dir / "cache"))
+    (temp_dir / "fleet.toml").write_text(SPEC)
+    os.chdir(temp_dir)
+
+    result = cli_runner.invoke(app, ["new", "--from-spec", "fleet.toml", "--no-sync", "--jobs", "2"])
+
+    assert result.exit_code == 0, result.stdout
+    assert "Project timings" in result.stdout
+    assert "Created 2 projects" in result.stdout
+    assert (temp_dir / "cohort-b" / "apps" / "printer").is_dir()
+
+
+def test_new_from_spec_rejects_project_options(cli_runner: CliRunner, temp_dir: Path) -> None:
+    """Test that options the spec provides are rejected instead of silently ignored."""
+    (temp_dir / "fleet.toml").write_text(SPEC)
+    os.chdir(temp_dir)
+
+    result = cli_runner.invoke(app, ["new", "--from-spec", "fleet.toml", "--monorepo", "--dry-run", "--no-sync"])
+
+    assert result.exit_code == 1
+    assert "--monorepo, --dry-run cannot be used with --from-spec" in result.stdout
+    assert not (temp_dir / "cohort-a").exists()
+
+
+def test_new_from_spec_reports_invalid_spec(cli_runner: CliRunner, temp_dir: Path) -> None:
+    """Test that spec errors are printed as written, not eaten as markup."""
+    (temp_dir / "fleet.toml").write_text('project = ["cohort-a"]\n')
+    os.chdir(temp_dir)
+
+    result = cli_runner.invoke(app, ["new", "--from-spec", "fleet.toml"])
+
+    assert result.exit_code == 1
+    assert "project #1 must be a [[project]] table" in result.stdout
@@ -0,0 +1,95 @@
+"""Tests for the workspace import graph (mpm graph)."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from mpm.cli import app
+from mpm.graph import build_import_graph, parse_imports
+
+
+def _module(root: Path, package: str, source: str, name: str = "__init__.py") -> Path:
+    group = "apps" if package in ("api", "worker") else "libs"
+    path = root / group / package / "acme" / package / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source)
+    pyproject = root / group / package / "pyproject.toml"
+    if not pyproject.exists():
+        pyproject.write_text(f'[project]\nname = "{package}"\nversion = "0.1.0"\n')
+    return path
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    _module(tmp_path, "core", "import json\n")
+    _module(tmp_path, "billing", "from acme.core import helpers\nfrom . import rules\n")
+    _module(tmp_path, "api", "from acme import billing\nimport acme.core.models as models\n")
+    _module(tmp_path, "worker", "import os\n")
+    (tmp_path / "libs" / "core" / "tests").mkdir()
+    (tmp_path / "libs" / "core" / "tests" / "test_core.py").write_text("from acme import api\n")
+    return tmp_path
+
+
+def test_parse_imports() -> None:
+    """Test that absolute imports are collected and relative ones left out."""
+    source = "import a.b\nfrom c import d, e\nfrom . import f\nfrom g import *\n"
+    assert parse_imports(source) == ["a.b", "c", "c.d", "c.e", "g"]
+
+
+def test_build_import_graph(workspace: Path) -> None:
+    """Test that imports in the namespace layout become package edges (tests are not scanned)."""
+    graph = build_import_graph(workspace, "acme")
+
+    assert graph.edges == {"api": {"billing", "core"}, "billing": {"core"}, "core": set(), "worker": set()}
+    assert graph.files == graph.parsed == 4
+    dot = graph.to_dot()
+    assert '"api" -> "billing";' in dot and '"api" [shape=box];' in dot
+
+
+def test_graph_rescans_only_changed_files(workspace: Path) -> None:
+    """Test that unchanged files come from the cache and a touched file is not parsed again."""
+    build_import_graph(workspace, "acme")
+
+    graph = build_import_graph(workspace, "acme")
+    assert graph.parsed == 0
+
+    worker = workspace / "apps" / "worker" / "acme" / "worker" / "__init__.py"
+    worker.write_text("import os\nfrom acme import core\n")
+    billing = workspace / "libs" / "billing" / "acme" / "billing" / "__init__.py"
+    stat = billing.stat()
+    os.utime(billing, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    graph = build_import_graph(workspace, "acme")
+    assert graph.parsed == 1
+    assert graph.edges["worker"] == {"core"}
+
+
+def test_graph_parallel_matches_serial(workspace: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that parsing on a process pool gives the same graph."""
+    import mpm.graph
+
+    for index in range(8):
+        _module(workspace, "billing", f"from acme.core import m{index}\n", name=f"m{index}.py")
+    monkeypatch.setattr(mpm.graph, "MIN_FILES_FOR_POOL", 2)
+
+    graph = build_import_graph(workspace, "acme", jobs=2)
+
+    assert graph.parsed == 12
+    assert graph.edges["billing"] == {"core"}
+
+
+def test_graph_command(workspace: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that mpm graph prints the package DAG as JSON."""
+    (workspace / "mpm.toml").write_text('[project]\nname = "acme"\nslug = "acme"\n')
+    monkeypatch.chdir(workspace)
+
+    result = CliRunner().invoke(app, ["graph", "--jobs", "1"])
+
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.stdout)
+    packages = {package["name"]: package for package in data["packages"]}
+    assert packages["api"]["depends_on"] == ["billing", "core"]
+    assert packages["billing"]["module"] == "acme.billing"
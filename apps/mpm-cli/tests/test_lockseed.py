@@ -0,0 +1,121 @@
+"""Tests for pre-resolved uv.lock seeds."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from mpm.cli import app
+from mpm.config import DocsTheme, ProjectConfig, ProjectStructure, PythonVersion
+from mpm.generators.lockseed import (
+    FINGERPRINT_HEADER,
+    build_lock_seed,
+    find_lock_seed,
+    lock_fingerprint,
+    seed_configs,
+    seed_key,
+)
+from mpm.generators.project import generate_project, render_project
+from tests.conftest import FakeUv
+
+FAKE_LOCK = """version = 1
+requires-python = ">=3.12"
+
+[manifest]
+members = ["greeter", "mpm-lock-seed", "printer"]
+
+[[package]]
+name = "mpm-lock-seed"
+version = "0.1.0"
+source = { virtual = "." }
+"""
+
+
+@pytest.fixture
+def fake_uv(fake_uv: FakeUv) -> FakeUv:
+    """The shared fake uv, locking to FAKE_LOCK."""
+    fake_uv.lock = FAKE_LOCK
+    return fake_uv
+
+
+def test_seed_key(make_config: Callable[..., ProjectConfig]) -> None:
+    """Test seed names cover the settings that change the dependency set."""
+    assert seed_key(make_config(with_samples=True)) == "py3.12-monorepo-samples-nodocs"
+    assert seed_key(make_config(structure=ProjectStructure.SINGLE, with_docs=True)) == "py3.12-single-material"
+    assert seed_key(make_config(with_docs=True, docs_theme=DocsTheme.SHADCN)) == ("py3.12-monorepo-shadcn")
+
+
+def test_seed_configs_cover_every_shape() -> None:
+    """Test that the maintainer command builds one seed per shape and Python version."""
+    keys = [seed_key(config) for config in seed_configs()]
+    assert len(keys) == len(set(keys)) == len(PythonVersion) * 3 * 3
+
+
+def test_fingerprint_ignores_project_name_only(make_config: Callable[..., ProjectConfig], tmp_path: Path) -> None:
+    """Test that the fingerprint tracks dependencies, not names or metadata."""
+    base = render_project(make_config(with_samples=True), tmp_path)
+    renamed = render_project(
+        make_config(with_samples=True, project_name="other", project_slug="other", author_name="Someone"), tmp_path
+    )
+    with_docs = render_project(make_config(with_samples=True, with_docs=True), tmp_path)
+
+    assert lock_fingerprint(base) == lock_fingerprint(renamed)
+    assert lock_fingerprint(base) != lock_fingerprint(with_docs)
+
+
+def test_new_project_uses_seed_with_frozen_sync(
+    fake_uv: FakeUv, make_config: Callable[..., ProjectConfig], tmp_path: Path
+) -> None:
+    """Test that a matching seed becomes uv.lock and uv sync skips resolution."""
+    config = make_config(with_samples=True)
+    [seed_config] = [c for c in seed_configs([PythonVersion.PY312]) if seed_key(c) == seed_key(config)]
+    assert build_lock_seed(seed_config, tmp_path / "cache" / "locks") == (True, f"{seed_key(config)}.lock")
+
+    generate_project(config, tmp_path / "test-app")
+
+    lock = (tmp_path / "test-app" / "uv.lock").read_text()
+    assert lock.startswith("version = 1\n")
+    assert 'members = ["greeter", "test-app", "printer"]' in lock
+    assert "mpm-lock-seed" not in lock
+    assert fake_uv.calls[-1] == ["uv", "sync", "--all-packages", "--frozen"]
+
+
+def test_dry_run_does_not_use_seed(fake_uv: FakeUv, make_config: Callable[..., ProjectConfig], tmp_path: Path) -> None:
+    """Test that a dry run lists the same files whether or not a seed matches."""
+    config = make_config(with_samples=True)
+    [seed_config] = [c for c in seed_configs([PythonVersion.PY312]) if seed_key(c) == seed_key(config)]
+    build_lock_seed(seed_config, tmp_path / "cache" / "locks")
+
+    tree = generate_project(config, tmp_path / "test-app", dry_run=True)
+
+    assert "uv.lock" not in tree
+    assert not (tmp_path / "test-app").exists()
+
+
+def test_stale_or_missing_seed_is_ignored(
+    fake_uv: FakeUv, make_config: Callable[..., ProjectConfig], tmp_path: Path
+) -> None:
+    """Test that seeds are only used for a matching fingerprint."""
+    config = make_config(with_samples=True)
+    assert find_lock_seed(config, render_project(config, tmp_path)) is None
+
+    seeds = tmp_path / "cache" / "locks"
+    seeds.mkdir(parents=True)
+    (seeds / f"{seed_key(config)}.lock").write_text(f"{FINGERPRINT_HEADER}outdated\n{FAKE_LOCK}")
+    assert find_lock_seed(config, render_project(config, tmp_path)) is None
+
+    generate_project(config, tmp_path / "test-app")
+    assert not (tmp_path / "test-app" / "uv.lock").exists()
+    assert fake_uv.calls[-1] == ["uv", "sync", "--all-packages"]
+
+
+def test_locks_build_command(fake_uv: FakeUv, cli_runner: CliRunner, tmp_path: Path) -> None:
+    """Test that mpm locks build writes one seed per shape for the chosen Python version."""
+    result = cli_runner.invoke(app, ["locks", "build", "--python", "3.13", "--output", str(tmp_path / "out")])
+
+    assert result.exit_code == 0, result.output
+    seeds = sorted(path.name for path in (tmp_path / "out").iterdir())
+    assert len(seeds) == 9
+    assert "py3.13-single-nodocs.lock" in seeds
+    assert fake_uv.calls.count(["uv", "lock"]) == 9
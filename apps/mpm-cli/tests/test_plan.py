@@ -0,0 +1,82 @@
+"""Unit tests for render plans."""
+
+from pathlib import Path, PurePosixPath
+
+import pytest
+
+from mpm.config import ProjectConfig, ProjectStructure, PythonVersion
+from mpm.generators.plan import RenderPlan
+from mpm.generators.project import generate_project
+from mpm.generators.renderer import get_renderer
+
+
+def _snapshot(root: Path) -> dict[str, bytes | None]:
+    """Map every path under root to its bytes (None for directories)."""
+    return {
+        str(path.relative_to(root)): None if path.is_dir() else path.read_bytes() for path in sorted(root.rglob("*"))
+    }
+
+
+def test_plan_defers_all_io(tmp_path: Path) -> None:
+    """Test that recording a plan does not touch the filesystem."""
+    plan = RenderPlan(tmp_path / "project")
+    plan.render_to_file("base/.python-version.jinja", tmp_path / "project" / ".python-version", {})
+    plan.copy_static("base/.gitignore", tmp_path / "project" / ".gitignore")
+    plan.touch(tmp_path / "project" / "src" / "py.typed")
+    plan.mkdir(tmp_path / "project" / "libs")
+
+    assert len(plan) == 3
+    assert not (tmp_path / "project").exists()
+
+
+def test_plan_deduplicates_directories(tmp_path: Path) -> None:
+    """Test that only leaf directories are created explicitly."""
+    plan = RenderPlan(tmp_path)
+    plan.touch(tmp_path / "a" / "b" / "one")
+    plan.touch(tmp_path / "a" / "b" / "two")
+    plan.touch(tmp_path / "a" / "three")
+    plan.mkdir(tmp_path / "a")
+    plan.mkdir(tmp_path / "empty")
+
+    tree = plan.render_tree(get_renderer())
+    assert tree.directories() == [PurePosixPath("a/b"), PurePosixPath("empty")]
+
+
+def test_plan_snapshots_context(tmp_path: Path) -> None:
+    """Test that later context changes do not leak into recorded entries."""
+    plan = RenderPlan(tmp_path)
+    ctx = {"python_version": PythonVersion.PY312}
+    plan.render_to_file("base/.python-version.jinja", tmp_path / ".python-version", ctx)
+    ctx["python_version"] = PythonVersion.PY313
+
+    plan.execute(get_renderer(), jobs=1)
+    assert (tmp_path / ".python-version").read_text().strip() == "3.12"
+
+
+@pytest.mark.parametrize("structure", [ProjectStructure.MONOREPO, ProjectStructure.SINGLE])
+def test_parallel_output_matches_serial(tmp_path: Path, structure: ProjectStructure) -> None:
+    """Test that parallel generation is byte-identical to serial generation."""
+
+    def generate(output: Path, jobs: int) -> None:
+        config = ProjectConfig(
+            project_name="parallel_test",
+            project_slug="parallel-test",
+            structure=structure,
+            with_samples=structure == ProjectStructure.MONOREPO,
+            with_docker=True,
+            with_ci=True,
+            with_pypi=True,
+            init_git=False,
+            auto_sync=False,
+        )
+        generate_project(config, output, jobs=jobs)
+
+    generate(tmp_path / "serial", jobs=1)
+    generate(tmp_path / "parallel", jobs=8)
+
+    serial = _snapshot(tmp_path / "serial")
+    parallel = _snapshot(tmp_path / "parallel")
+    # mpm.toml records the creation timestamp
+    serial.pop("mpm.toml")
+    parallel.pop("mpm.toml")
+    assert serial == parallel
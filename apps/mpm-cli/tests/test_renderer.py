@@ -1,8 +1,29 @@
 """Unit tests for template rendering."""
 
+import os
 from pathlib import Path
 
-from mpm.generators.renderer import TemplateRenderer
+import pytest
+from jinja2 import Environment
+
+from mpm.generators.renderer import (
+    COMPILED_MARKER,
+    PackageTemplateLoader,
+    TemplateBytecodeCache,
+    TemplateRenderer,
+    _uptodate_check,
+    compile_templates,
+    default_bytecode_cache,
+    find_compiled_templates,
+    get_renderer,
+)
+
+_LIB_CONTEXT = {
+    "package_name": "mylib",
+    "package_description": "My library",
+    "namespace": "test_project",
+    "python_version": "3.13",
+}
 
 
 def test_renderer_initialization() -> None:
@@ -143,3 +164,154 @@ def test_copy_static(temp_dir: Path) -> None:
     content = output_file.read_text()
     assert "__pycache__" in content
     assert ".venv" in content
+
+
+def test_list_templates() -> None:
+    """Test the package loader lists only .jinja templates."""
+    names = PackageTemplateLoader().list_templates()
+    assert "base/pyproject.toml.jinja" in names
+    assert "monorepo/libs/pyproject.toml.jinja" in names
+    assert "base/.gitignore" not in names
+
+
+def test_source_checkout_has_no_compiled_templates() -> None:
+    """Test that development checkouts fall back to the source loader."""
+    assert find_compiled_templates() is None
+
+
+def test_compiled_templates_match_source(tmp_path: Path) -> None:
+    """Test that precompiled templates render identically to the sources."""
+    from mpm.config import DocsTheme, LicenseType, ProjectStructure, PythonVersion
+
+    count = compile_templates(tmp_path)
+    assert count == len(PackageTemplateLoader().list_templates())
+    assert (tmp_path / COMPILED_MARKER).exists()
+    assert len(list(tmp_path.glob("tmpl_*.py"))) == count
+
+    context = {
+        "project_name": "Compiled Test",
+        "project_slug": "compiled-test",
+        "project_description": "Compiled",
+        "python_version": PythonVersion.PY313,
+        "namespace": "compiled_test",
+        "structure": ProjectStructure.MONOREPO,
+        "with_docs": True,
+        "with_docker": True,
+        "with_samples": True,
+        "with_precommit": True,
+        "docs_theme": DocsTheme.MATERIAL,
+        "license_type": LicenseType.MIT,
+        "github_owner": "testuser",
+    }
+
+    source_renderer = TemplateRenderer()
+    compiled_renderer = TemplateRenderer(compiled_dir=tmp_path)
+    for template in ("base/README.md.jinja", "base/pyproject.toml.jinja"):
+        assert compiled_renderer.render(template, context) == source_renderer.render(template, context)
+        # Loaded from the compiled module, not the template source
+        assert str(compiled_renderer.env.get_template(template).filename).startswith(str(tmp_path))
+
+
+def test_uptodate_check_tracks_mtime(tmp_path: Path) -> None:
+    """Test that templates on disk are reported stale after modification."""
+    template = tmp_path / "t.jinja"
+    template.write_text("one")
+    uptodate = _uptodate_check(template)
+    assert uptodate()
+
+    stat = template.stat()
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert not uptodate()
+
+    template.unlink()
+    assert not uptodate()
+
+
+def test_bytecode_cache_disabled_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the on-disk bytecode cache is opt-in."""
+    monkeypatch.delenv("MPM_TEMPLATE_CACHE", raising=False)
+    assert default_bytecode_cache() is None
+
+
+def test_bytecode_cache_enabled_by_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test that MPM_TEMPLATE_CACHE=1 enables the cache under the user cache dir."""
+    monkeypatch.setenv("MPM_TEMPLATE_CACHE", "1")
+    monkeypatch.setenv("MPM_CACHE_DIR", str(tmp_path))
+    cache = default_bytecode_cache()
+    assert isinstance(cache, TemplateBytecodeCache)
+    assert Path(cache.directory) == tmp_path / "templates"
+
+
+def test_bytecode_cache_skips_compilation(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test that a warm bytecode cache renders without compiling templates."""
+    cache = TemplateBytecodeCache(tmp_path, version="1.0.0")
+    expected = TemplateRenderer(bytecode_cache=cache).render("monorepo/libs/pyproject.toml.jinja", _LIB_CONTEXT)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def fail_compile(*args: object, **kwargs: object) -> None:
+        raise AssertionError("template was recompiled")
+
+    monkeypatch.setattr(Environment, "compile", fail_compile)
+    warm = TemplateRenderer(bytecode_cache=TemplateBytecodeCache(tmp_path, version="1.0.0"))
+    assert warm.render("monorepo/libs/pyproject.toml.jinja", _LIB_CONTEXT) == expected
+
+
+def test_bytecode_cache_keyed_by_version(tmp_path: Path) -> None:
+    """Test that different mpm versions do not share cache entries."""
+    TemplateRenderer(bytecode_cache=TemplateBytecodeCache(tmp_path, version="1.0.0")).render(
+        "monorepo/libs/pyproject.toml.jinja", _LIB_CONTEXT
+    )
+    TemplateRenderer(bytecode_cache=TemplateBytecodeCache(tmp_path, version="2.0.0")).render(
+        "monorepo/libs/pyproject.toml.jinja", _LIB_CONTEXT
+    )
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_bytecode_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Test that the cache evicts the oldest entries once over its size limit."""
+    cache = TemplateBytecodeCache(tmp_path, version="1.0.0")
+    renderer = TemplateRenderer(bytecode_cache=cache)
+    renderer.render("monorepo/libs/pyproject.toml.jinja", _LIB_CONTEXT)
+    old_entry = next(tmp_path.iterdir())
+    os.utime(old_entry, ns=(0, 0))
+    renderer.render("monorepo/apps/pyproject.toml.jinja", {**_LIB_CONTEXT, "with_docker": False})
+    new_entry = next(p for p in tmp_path.iterdir() if p != old_entry)
+
+    cache.max_bytes = new_entry.stat().st_size
+    cache.evict()
+
+    assert list(tmp_path.iterdir()) == [new_entry]
+
+
+def test_get_renderer_is_shared() -> None:
+    """Test that generators share one renderer per process."""
+    assert get_renderer() is get_renderer()
+
+
+def test_shared_renderer_compiles_each_template_once(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test that repeated feature generation reuses compiled templates."""
+    from mpm.config import MpmConfig
+    from mpm.generators.features import add_ci_feature
+
+    compiled: list[str | None] = []
+    original_compile = Environment.compile
+
+    def counting_compile(
+        self: Environment,
+        source: str,
+        name: str | None = None,
+        filename: str | None = None,
+        raw: bool = False,
+        defer_init: bool = False,
+    ) -> object:
+        compiled.append(name)
+        return original_compile(self, source, name, filename, raw, defer_init)
+
+    monkeypatch.delenv("MPM_TEMPLATE_CACHE", raising=False)
+    get_renderer.cache_clear()
+    monkeypatch.setattr(Environment, "compile", counting_compile)
+    config = MpmConfig(project_name="shared", project_slug="shared")
+    for project in ("one", "two", "three"):
+        add_ci_feature(tmp_path / project, config)
+
+    assert compiled.count("ci/pr.yml.jinja") == 1
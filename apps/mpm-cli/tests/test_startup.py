@@ -0,0 +1,90 @@
+"""Startup budget tests for the mpm entry point.
+
+`mpm` is called from scripts and pre-commit hooks, so trivial invocations must not
+pay for importing the generators, prompts or config models.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Upper bound for the total import time of `python -m mpm --version`, in milliseconds.
+# Importing typer alone takes about 100 ms, so this leaves room for slow CI runners only.
+STARTUP_BUDGET_MS = 150
+
+# Upper bound for the import time mpm adds on top of `import typer`: its own modules
+# and any module typer does not import. Typically about 1 ms.
+OWN_BUDGET_MS = 10
+
+# Modules that only specific subcommands need
+HEAVY_MODULES = {"questionary", "prompt_toolkit", "jinja2", "pydantic", "tomli_w"}
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+@pytest.fixture
+def bytecode_env(tmp_path: Path) -> dict[str, str]:
+    """Environment that lets Python cache bytecode (in tmp_path), as an installed mpm would."""
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    env["PYTHONPYCACHEPREFIX"] = str(tmp_path / "pycache")
+    return env
+
+
+def _import_profile(*args: str, env: dict[str, str] | None = None) -> tuple[dict[str, float], float]:
+    """Run `python -X importtime <args>`.
+
+    Returns:
+        A tuple of (self import time of every imported module, total import time), in milliseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    assert result.returncode == 0, result.stderr
+
+    modules: dict[str, float] = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules[module] = int(self_us) / 1000
+            # Only top-level entries, their cumulative time already includes nested imports
+            if not indent:
+                total_us += int(cumulative_us)
+    return modules, total_us / 1000
+
+
+@pytest.mark.parametrize(
+    ("args", "forbidden"),
+    [
+        # --version needs nothing beyond typer
+        (("--version",), HEAVY_MODULES | {"rich"}),
+        # typer renders help with rich, but nothing else should load
+        (("add", "lib", "--help"), HEAVY_MODULES),
+    ],
+)
+def test_startup_does_not_import_heavy_modules(args: tuple[str, ...], forbidden: set[str]) -> None:
+    """Test that --version and subcommand help skip heavy dependencies."""
+    modules, _total_ms = _import_profile("-m", "mpm", *args)
+    loaded = {module.split(".")[0] for module in modules}
+    assert not loaded & forbidden, f"Heavy modules imported at startup: {loaded & forbidden}"
+
+
+def test_version_startup_budget(bytecode_env: dict[str, str]) -> None:
+    """Test that `python -X importtime -m mpm --version` stays within the import budgets."""
+    # The first runs fill the bytecode cache; best of three smooths out cold filesystem caches
+    _import_profile("-m", "mpm", "--version", env=bytecode_env)
+    baseline = _import_profile("-c", "import typer", env=bytecode_env)[0]
+    profiles = [_import_profile("-m", "mpm", "--version", env=bytecode_env) for _ in range(3)]
+
+    total = min(total_ms for _, total_ms in profiles)
+    assert total < STARTUP_BUDGET_MS, f"Startup import time {total:.1f} ms exceeds {STARTUP_BUDGET_MS} ms"
+    own = min(sum(ms for module, ms in modules.items() if module not in baseline) for modules, _ in profiles)
+    assert own < OWN_BUDGET_MS, f"mpm adds {own:.1f} ms of imports to typer's, over {OWN_BUDGET_MS} ms"
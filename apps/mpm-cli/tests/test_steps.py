@@ -0,0 +1,121 @@
+"""Tests for concurrent post-generation steps."""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from mpm.generators.steps import (
+    Step,
+    StepResult,
+    error_details,
+    format_timings,
+    get_step_log,
+    run_command,
+    run_steps,
+)
+
+SCRIPT = "import sys; print('resolved 3 packages'); print('warning: slow', file=sys.stderr); sys.exit(2)"
+
+
+@pytest.fixture
+def captured_log(monkeypatch: pytest.MonkeyPatch) -> Console:
+    """Point the step log at a recording console."""
+    console = Console(record=True, width=200)
+    monkeypatch.setattr(get_step_log(), "console", console)
+    return console
+
+
+def test_run_steps_runs_concurrently() -> None:
+    """Test that independent steps overlap instead of running one after another."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_other() -> tuple[bool, str]:
+        # Deadlocks (and times out) unless both steps run at the same time
+        barrier.wait()
+        return True, "done"
+
+    results = run_steps([Step("a", wait_for_other), Step("b", wait_for_other)])
+    assert [result.ok for result in results] == [True, True]
+
+
+def test_run_steps_keeps_order_and_times_steps() -> None:
+    """Test that results come back in step order with durations."""
+
+    def slow() -> tuple[bool, str]:
+        time.sleep(0.05)
+        return True, "slow done"
+
+    finished: list[str] = []
+    results = run_steps(
+        [Step("slow", slow), Step("fast", lambda: (False, "fast failed"))],
+        on_done=lambda result: finished.append(result.name),
+    )
+
+    assert [result.name for result in results] == ["slow", "fast"]
+    assert finished == ["fast", "slow"]
+    assert results[0].duration >= 0.05
+    assert results[1] == StepResult("fast", False, "fast failed", results[1].duration)
+
+
+def test_run_steps_turns_exceptions_into_failures() -> None:
+    """Test that one crashing step is reported without affecting the others."""
+
+    def crash() -> tuple[bool, str]:
+        raise RuntimeError("boom")
+
+    results = run_steps([Step("crash", crash), Step("ok", lambda: (True, "fine"))])
+    assert results[0].ok is False
+    assert results[0].message == "crash failed: boom"
+    assert results[1].ok is True
+
+
+def test_run_steps_empty() -> None:
+    """Test that no steps means no work."""
+    assert run_steps([]) == []
+
+
+def test_run_command_streams_output(captured_log: Console, tmp_path: Path) -> None:
+    """Test that stdout and stderr are streamed to the console, prefixed with step and elapsed time."""
+    result = run_command([sys.executable, "-c", SCRIPT], tmp_path, "demo")
+
+    assert result.returncode == 2
+    assert result.stdout.splitlines() == ["resolved 3 packages", "warning: slow"]
+    text = captured_log.export_text()
+    assert "demo" in text and "s │ resolved 3 packages" in text
+    assert "warning: slow" in text
+    assert error_details(result) == "resolved 3 packages\nwarning: slow"
+
+
+def test_run_command_writes_log_file_when_redirected(captured_log: Console, tmp_path: Path) -> None:
+    """Test that --quiet output goes to the log file only, and the console is restored afterwards."""
+    log_file = tmp_path / "logs" / "new.log"
+    with get_step_log().redirect(log_file):
+        run_command([sys.executable, "-c", SCRIPT], tmp_path, "demo")
+
+    assert captured_log.export_text() == ""
+    lines = log_file.read_text().splitlines()
+    assert lines[0].startswith("[demo ") and lines[0].endswith("] resolved 3 packages")
+    assert get_step_log().path is None
+
+
+def test_error_details_prefers_stderr() -> None:
+    """Test the failure message for captured and streamed output."""
+    assert error_details(subprocess.CompletedProcess([], 1, "out", "fatal: nope\n")) == "fatal: nope"
+    assert error_details(subprocess.CompletedProcess([], 1, "\n".join(map(str, range(20))), None), 2) == "18\n19"
+    assert error_details(subprocess.CompletedProcess([], 1, "", None)) == "Unknown error"
+
+
+def test_format_timings() -> None:
+    """Test the summary table of step durations."""
+    console = Console(record=True, width=80)
+    console.print(format_timings([StepResult("git init", True, "", 0.04), StepResult("uv sync", False, "", 2.5)]))
+
+    text = console.export_text()
+    assert "git init" in text and "0.0s" in text
+    assert "uv sync" in text and "failed" in text
+    assert "Total" in text and "2.5s" in text
@@ -0,0 +1,98 @@
+"""Tests for the deferred dependency sync queue."""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from mpm.cli import app
+from mpm.generators.sync import SyncQueue, get_sync_queue
+from tests.conftest import FakeUv
+
+
+def test_queue_coalesces_requests_per_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that several requests for a project cost a single uv sync."""
+    fake = FakeUv()
+    monkeypatch.setattr(subprocess, "run", fake)
+    queue = SyncQueue()
+    queue.request(tmp_path / "a", "docs dependencies")
+    queue.request(tmp_path / "a", "docker", all_packages=True)
+    queue.request(tmp_path / "a", "docs dependencies")
+    queue.request(tmp_path / "b", "ci")
+
+    assert queue.reasons() == ["docs dependencies", "docker", "ci"]
+    results = queue.run()
+
+    assert fake.calls == [["uv", "sync", "--all-packages"], ["uv", "sync"]]
+    assert fake.cwds == [tmp_path / "a", tmp_path / "b"]
+    assert [result.ok for result in results] == [True, True]
+    assert all(result.duration >= 0 for result in results)
+    assert len(queue) == 0
+
+
+def test_queue_reports_exit_status(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a failing sync surfaces uv's exit code and error output."""
+    monkeypatch.setattr(subprocess, "run", FakeUv(returncode=2, stderr="No solution found"))
+    queue = SyncQueue()
+    queue.request(tmp_path, "docs dependencies")
+
+    [result] = queue.run()
+    assert not result.ok
+    assert result.message == "uv sync failed (exit 2): No solution found"
+
+
+def test_queue_skip(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that skipping drops pending syncs without running uv."""
+    fake = FakeUv()
+    monkeypatch.setattr(subprocess, "run", fake)
+    queue = SyncQueue()
+    queue.request(tmp_path, "docs dependencies")
+
+    assert queue.skip() == ["docs dependencies"]
+    assert queue.run() == []
+    assert fake.calls == []
+
+
+def test_add_docs_defers_and_skips_sync(run_mpm: Any, cli_runner: CliRunner, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that add docs --no-sync records the sync but never runs uv."""
+    exit_code, _output, project = run_mpm("deferred-sync", "--monorepo", "-y")
+    assert exit_code == 0
+    fake = FakeUv()
+    monkeypatch.setattr(subprocess, "run", fake)
+
+    original_dir = os.getcwd()
+    os.chdir(project)
+    try:
+        result = cli_runner.invoke(app, ["add", "docs", "--no-sync"])
+    finally:
+        os.chdir(original_dir)
+
+    assert result.exit_code == 0
+    assert "Skipped uv sync (docs dependencies)" in result.stdout
+    assert fake.calls == []
+    assert len(get_sync_queue()) == 0
+
+
+def test_add_docs_runs_one_sync_at_the_end(
+    run_mpm: Any, cli_runner: CliRunner, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that add docs syncs all workspace members once, after writing its files."""
+    exit_code, _output, project = run_mpm("final-sync", "--monorepo", "-y")
+    assert exit_code == 0
+    fake = FakeUv()
+    monkeypatch.setattr(subprocess, "run", fake)
+
+    original_dir = os.getcwd()
+    os.chdir(project)
+    try:
+        result = cli_runner.invoke(app, ["add", "docs"])
+    finally:
+        os.chdir(original_dir)
+
+    assert result.exit_code == 0
+    assert fake.calls == [["uv", "sync", "--all-packages"]]
+    assert fake.cwds == [project]
+    assert "Dependencies installed" in result.stdout
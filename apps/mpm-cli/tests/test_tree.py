@@ -0,0 +1,191 @@
+"""Unit tests for in-memory file trees and dry-run generation."""
+
+import os
+import stat
+import subprocess
+from pathlib import Path, PurePosixPath
+
+import pytest
+from typer.testing import CliRunner
+
+from mpm.cli import app
+from mpm.config import DocsTheme, ProjectConfig
+from mpm.generators.project import generate_project, render_project
+from mpm.generators.renderer import get_renderer
+from mpm.generators.tree import FileStatus, FileTree, WriteSummary, write_if_changed
+
+
+def test_tree_paths_are_relative_posix(tmp_path: Path) -> None:
+    """Test that absolute and relative paths map to the same entry."""
+    tree = FileTree(tmp_path)
+    tree.add_file(tmp_path / "pkg" / "__init__.py", b"x = 1\n")
+    tree.add_file("README.md", b"# Readme\n")
+
+    assert list(tree) == [PurePosixPath("README.md"), PurePosixPath("pkg/__init__.py")]
+    assert "pkg/__init__.py" in tree
+    assert tree.read_text(tmp_path / "pkg" / "__init__.py") == "x = 1\n"
+
+
+def test_tree_diff(tmp_path: Path) -> None:
+    """Test comparing a tree with the files on disk."""
+    (tmp_path / "same.txt").write_bytes(b"same")
+    (tmp_path / "changed.txt").write_bytes(b"old")
+
+    tree = FileTree(tmp_path)
+    tree.add_file("same.txt", b"same")
+    tree.add_file("changed.txt", b"new")
+    tree.add_file("new/file.txt", b"new")
+
+    assert tree.diff() == {
+        PurePosixPath("changed.txt"): FileStatus.MODIFIED,
+        PurePosixPath("new/file.txt"): FileStatus.ADDED,
+        PurePosixPath("same.txt"): FileStatus.UNCHANGED,
+    }
+
+
+def test_tree_flush_writes_files_dirs_and_modes(tmp_path: Path) -> None:
+    """Test flushing a tree to disk."""
+    tree = FileTree(tmp_path / "out")
+    tree.add_file("bin/run.sh", b"#!/bin/sh\n", mode=0o755)
+    tree.add_file("a/b/c.txt", b"c")
+    tree.add_directory("empty")
+
+    assert not (tmp_path / "out").exists()
+    tree.flush(jobs=4)
+
+    assert (tmp_path / "out" / "a" / "b" / "c.txt").read_bytes() == b"c"
+    assert (tmp_path / "out" / "empty").is_dir()
+    assert stat.S_IMODE((tmp_path / "out" / "bin" / "run.sh").stat().st_mode) == 0o755
+
+
+def test_write_if_changed(tmp_path: Path) -> None:
+    """Test that identical content is not rewritten and overwrite=False keeps files."""
+    target = tmp_path / "sub" / "file.txt"
+    assert write_if_changed(target, b"one") == FileStatus.ADDED
+
+    os.utime(target, ns=(1_000_000_000, 1_000_000_000))
+    assert write_if_changed(target, b"one") == FileStatus.UNCHANGED
+    assert target.stat().st_mtime_ns == 1_000_000_000
+
+    assert write_if_changed(target, b"two", overwrite=False) == FileStatus.SKIPPED
+    assert target.read_bytes() == b"one"
+    assert write_if_changed(target, b"two") == FileStatus.MODIFIED
+    assert target.read_bytes() == b"two"
+
+
+def test_tree_flush_skips_unchanged_files(tmp_path: Path) -> None:
+    """Test that flushing over an existing tree only writes changed files."""
+    tree = FileTree(tmp_path)
+    tree.add_file("a.txt", b"a")
+    tree.add_file("b.txt", b"b")
+    tree.add_file("c.txt", b"c")
+    assert tree.flush(jobs=2) == WriteSummary(written=3)
+
+    (tmp_path / "b.txt").write_bytes(b"edited")
+    os.utime(tmp_path / "a.txt", ns=(1_000_000_000, 1_000_000_000))
+
+    assert tree.flush(jobs=2, overwrite=False) == WriteSummary(unchanged=2, skipped=1)
+    assert (tmp_path / "b.txt").read_bytes() == b"edited"
+    assert tree.flush(jobs=1) == WriteSummary(written=1, unchanged=2)
+    assert (tmp_path / "a.txt").stat().st_mtime_ns == 1_000_000_000
+    assert str(WriteSummary(1, 2, 3)) == "1 written, 2 unchanged, 3 skipped"
+
+
+def test_tree_flush_reports_writes_in_tree_order(tmp_path: Path) -> None:
+    """Test that on_write sees paths sorted, whatever order they were added in."""
+    tree = FileTree(tmp_path)
+    for name in ("c.txt", "a/z.txt", "b.txt"):
+        tree.add_file(name, name.encode())
+    seen: list[str] = []
+
+    tree.flush(jobs=2, on_write=lambda path, status: seen.append(str(path)))
+
+    assert seen == ["a/z.txt", "b.txt", "c.txt"]
+
+
+def test_renderer_writes_only_if_changed(tmp_path: Path) -> None:
+    """Test render_to_file and copy_static report unchanged files."""
+    renderer = get_renderer()
+    ctx = {"python_version": "3.12"}
+    assert renderer.render_to_file("base/.python-version.jinja", tmp_path / ".python-version", ctx) == FileStatus.ADDED
+    assert renderer.render_to_file("base/.python-version.jinja", tmp_path / ".python-version", ctx) == (
+        FileStatus.UNCHANGED
+    )
+    assert renderer.copy_static("base/.gitignore", tmp_path / ".gitignore") == FileStatus.ADDED
+    assert renderer.copy_static("base/.gitignore", tmp_path / ".gitignore") == FileStatus.UNCHANGED
+
+
+def test_render_project_does_not_touch_disk(tmp_path: Path) -> None:
+    """Test that rendering a project in memory matches what generation writes."""
+    config = ProjectConfig(
+        project_name="memory_test",
+        project_slug="memory-test",
+        with_samples=True,
+        init_git=False,
+        auto_sync=False,
+    )
+    output = tmp_path / "memory-test"
+
+    tree = render_project(config, output)
+    assert not output.exists()
+    assert "libs/greeter/pyproject.toml" in tree
+
+    generate_project(config, output)
+    statuses = tree.diff()
+    # Only the creation timestamp in mpm.toml may differ
+    statuses.pop(PurePosixPath("mpm.toml"))
+    assert set(statuses.values()) == {FileStatus.UNCHANGED}
+
+
+def test_render_project_includes_docs(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test that docs scaffolding is rendered from templates without running subprocesses."""
+
+    def no_subprocess(*args: object, **kwargs: object) -> None:
+        raise AssertionError("docs scaffolding must not run subprocesses")
+
+    monkeypatch.setattr(subprocess, "run", no_subprocess)
+    config = ProjectConfig(
+        project_name="docs_test",
+        project_slug="docs-test",
+        project_description="All about docs",
+        with_docs=True,
+        docs_theme=DocsTheme.SHADCN,
+        init_git=False,
+        auto_sync=False,
+    )
+
+    tree = render_project(config, tmp_path / "docs-test")
+    assert "shadcn" in tree.read_text("mkdocs.yml")
+    assert tree.read_text("docs/index.md").startswith("# Welcome to docs-test\n\nAll about docs\n")
+
+
+def test_new_dry_run_creates_nothing(cli_runner: CliRunner, temp_dir: Path) -> None:
+    """Test that mpm new --dry-run lists files without writing them."""
+    original_dir = os.getcwd()
+    os.chdir(temp_dir)
+    try:
+        result = cli_runner.invoke(app, ["new", "dry-run-test", "--monorepo", "--with-samples", "--dry-run"])
+    finally:
+        os.chdir(original_dir)
+
+    assert result.exit_code == 0
+    assert "Dry run" in result.stdout
+    assert "pyproject.toml" in result.stdout
+    assert list(temp_dir.iterdir()) == []
+
+
+def test_add_lib_dry_run_creates_nothing(cli_runner: CliRunner, temp_dir: Path) -> None:
+    """Test that mpm add lib --dry-run lists files without writing them."""
+    original_dir = os.getcwd()
+    os.chdir(temp_dir)
+    try:
+        result = cli_runner.invoke(app, ["new", "dry-run-add", "--monorepo", "--no-git", "--no-sync"])
+        assert result.exit_code == 0
+        os.chdir(temp_dir / "dry-run-add")
+        result = cli_runner.invoke(app, ["add", "lib", "mylib", "--dry-run"])
+    finally:
+        os.chdir(original_dir)
+
+    assert result.exit_code == 0
+    assert "libs/mylib/pyproject.toml" in result.stdout
+    assert not (temp_dir / "dry-run-add" / "libs" / "mylib").exists()
@@ -2,13 +2,17 @@
 
 from pathlib import Path
 
+import pytest
+
 from mpm.config import MpmConfig, ProjectStructure, PythonVersion
 from mpm.utils import (
     find_mpm_config,
     find_project_root,
     get_namespace_from_project,
     load_mpm_config,
+    resolve_project,
     save_mpm_config,
+    user_cache_dir,
     validate_project_name,
 )
 
@@ -117,6 +121,74 @@ def test_get_namespace_not_found(tmp_path: Path) -> None:
     assert result is None
 
 
+def test_find_project_root_env_override(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that MPM_PROJECT_ROOT replaces the search from the current directory."""
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "mpm.toml").write_text("[project]\nname = 'p'\n")
+    monkeypatch.chdir(tmp_path)
+
+    monkeypatch.setenv("MPM_PROJECT_ROOT", str(project))
+    assert find_project_root() == project
+    # An explicit start path still searches from there
+    assert find_project_root(tmp_path) is None
+
+    monkeypatch.setenv("MPM_PROJECT_ROOT", str(tmp_path))
+    assert find_project_root() is None
+
+
+def test_find_project_root_sees_new_nested_project(tmp_path: Path) -> None:
+    """Test that an mpm.toml created closer to the start path after a lookup wins."""
+    root = tmp_path / "project"
+    deep = root / "libs" / "core" / "src"
+    deep.mkdir(parents=True)
+    (root / "mpm.toml").write_text("[project]\nname = 'p'\n")
+    assert find_project_root(deep) == root
+
+    (root / "libs" / "mpm.toml").write_text("[project]\nname = 'nested'\n")
+    assert find_project_root(deep) == root / "libs"
+
+
+def test_resolve_project(tmp_path: Path) -> None:
+    """Test that the project context carries the root, parsed config and namespace."""
+    save_mpm_config(MpmConfig(project_name="ctx_ns", project_slug="ctx-ns"), tmp_path / "mpm.toml")
+    subdir = tmp_path / "libs" / "core"
+    subdir.mkdir(parents=True)
+
+    project = resolve_project(subdir)
+
+    assert project is not None
+    assert project.root == tmp_path
+    assert project.config_path == tmp_path / "mpm.toml"
+    assert project.namespace == "ctx_ns"
+    assert resolve_project(tmp_path.parent) is None
+
+
+def test_add_lib_parses_mpm_toml_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that one `mpm add lib` walks up to the root and parses mpm.toml a single time."""
+    from typer.testing import CliRunner
+
+    import mpm.utils
+    from mpm.cli import app
+
+    save_mpm_config(MpmConfig(project_name="once", project_slug="once"), tmp_path / "mpm.toml")
+    loads: list[Path] = []
+    walks: list[Path | None] = []
+    original_load, original_find = mpm.utils.load_mpm_config, mpm.utils.find_project_root
+    monkeypatch.setattr(mpm.utils, "load_mpm_config", lambda path: (loads.append(path), original_load(path))[1])
+    monkeypatch.setattr(
+        mpm.utils, "find_project_root", lambda start=None: (walks.append(start), original_find(start))[1]
+    )
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(app, ["add", "lib", "core"])
+
+    assert result.exit_code == 0, result.stdout
+    assert (tmp_path / "libs" / "core" / "pyproject.toml").exists()
+    assert loads == [tmp_path / "mpm.toml"]
+    assert len(walks) == 1
+
+
 def test_load_mpm_config(tmp_path: Path) -> None:
     """Test loading mpm.toml."""
     mpm_toml = tmp_path / "mpm.toml"
@@ -318,3 +390,17 @@ class TestValidateProjectName:
         """Test that mixed case names are valid."""
         is_valid, error = validate_project_name("MyAwesomeProject")
         assert is_valid, f"Should be valid but got error: {error}"
+
+
+def test_user_cache_dir_override(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that MPM_CACHE_DIR overrides the platform cache directory."""
+    monkeypatch.setenv("MPM_CACHE_DIR", str(tmp_path))
+    assert user_cache_dir() == tmp_path
+
+
+def test_user_cache_dir_xdg(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that XDG_CACHE_HOME is honoured on Linux."""
+    monkeypatch.delenv("MPM_CACHE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr("sys.platform", "linux")
+    assert user_cache_dir() == tmp_path / "mpm"
@@ -0,0 +1,152 @@
+"""Tests for the shared environment cache."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from mpm.config import ProjectConfig, ProjectStructure
+from mpm.generators.filecopy import CopyMode
+from mpm.generators.project import generate_project
+from mpm.generators.tree import FileTree
+from mpm.generators.venvcache import VenvCache, default_venv_cache, venv_key
+
+
+def _make_venv(project: Path) -> None:
+    """Create a small stand-in for a uv-built .venv inside project."""
+    venv = project / ".venv"
+    site = venv / "lib" / "python3" / "site-packages"
+    (venv / "bin").mkdir(parents=True)
+    site.mkdir(parents=True)
+    (venv / "pyvenv.cfg").write_text(f"home = {Path(sys.executable).parent}\nprompt = demo\n")
+    (venv / "bin" / "activate").write_text(f"VIRTUAL_ENV='{venv}'\n")
+    (venv / "bin" / "tool").write_text(f"#!{venv}/bin/python\nprint('hi')\n")
+    (venv / "bin" / "tool").chmod(0o755)
+    (venv / "bin" / "python").symlink_to(sys.executable)
+    (venv / "lib64").symlink_to("lib")
+    (site / "_demo.pth").write_text(f"{project}/src\n")
+    (site / "big_module.py").write_bytes(b"x = 1\n" * 10_000)
+    (project / "uv.lock").write_text("version = 1\n")
+
+
+@pytest.mark.parametrize("mode", [CopyMode.AUTO, CopyMode.HARDLINK])
+def test_store_and_restore(tmp_path: Path, mode: CopyMode) -> None:
+    """Test that a restored environment points at the new project."""
+    old = tmp_path / "old" / "demo"
+    new = tmp_path / "new" / "demo"
+    old.mkdir(parents=True)
+    new.mkdir(parents=True)
+    _make_venv(old)
+    cache = VenvCache(tmp_path / "cache", mode)
+
+    assert not cache.restore("key", new)
+    cache.store("key", old)
+    assert cache.restore("key", new)
+
+    venv = new / ".venv"
+    site = venv / "lib" / "python3" / "site-packages"
+    assert (venv / "bin" / "activate").read_text() == f"VIRTUAL_ENV='{venv}'\n"
+    assert (venv / "bin" / "tool").read_text().startswith(f"#!{venv}/bin/python\n")
+    assert os.access(venv / "bin" / "tool", os.X_OK)
+    assert (site / "_demo.pth").read_text() == f"{new}/src\n"
+    assert os.readlink(venv / "lib64") == "lib"
+    assert (venv / "bin" / "python").resolve() == Path(sys.executable).resolve()
+    assert (new / "uv.lock").read_text() == "version = 1\n"
+
+    cached = cache.entry("key") / ".venv" / "lib" / "python3" / "site-packages" / "big_module.py"
+    assert (site / "big_module.py").read_bytes() == cached.read_bytes()
+    assert os.path.samefile(site / "big_module.py", cached) == (mode == CopyMode.HARDLINK)
+    # The cache never shares inodes with the project it was stored from
+    assert not os.path.samefile(old / ".venv" / "lib" / "python3" / "site-packages" / "big_module.py", cached)
+
+
+def test_restore_skips_missing_interpreter(tmp_path: Path) -> None:
+    """Test that entries whose base interpreter was removed count as misses."""
+    project = tmp_path / "demo"
+    project.mkdir()
+    _make_venv(project)
+    (project / ".venv" / "pyvenv.cfg").write_text(f"home = {tmp_path / 'gone'}\n")
+    cache = VenvCache(tmp_path / "cache")
+    cache.store("key", project)
+
+    assert not cache.restore("key", tmp_path)
+
+
+def test_venv_key_tracks_pyprojects_and_lock(tmp_path: Path) -> None:
+    """Test that only pyproject.toml files and uv.lock feed the key."""
+    tree = FileTree(tmp_path)
+    tree.add_file("pyproject.toml", b"[project]\nname = 'a'\n")
+    tree.add_file("README.md", b"one")
+    key = venv_key(tree)
+
+    tree.add_file("README.md", b"two")
+    assert venv_key(tree) == key
+    tree.add_file("uv.lock", b"version = 1\n")
+    assert venv_key(tree) != key
+
+
+def test_default_venv_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test enabling the cache with MPM_VENV_CACHE."""
+    monkeypatch.setenv("MPM_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("MPM_VENV_CACHE", raising=False)
+    assert default_venv_cache() is None
+
+    monkeypatch.setenv("MPM_VENV_CACHE", "1")
+    cache = default_venv_cache()
+    assert cache is not None
+    assert cache.directory == tmp_path / "venvs"
+    assert cache.mode == CopyMode.AUTO
+
+    monkeypatch.setenv("MPM_VENV_CACHE", "hardlink")
+    cache = default_venv_cache()
+    assert cache is not None
+    assert cache.mode == CopyMode.HARDLINK
+
+
+def test_new_project_clones_cached_environment(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test that a second project with the same shape skips uv sync."""
+    monkeypatch.setenv("MPM_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("MPM_VENV_CACHE", "1")
+    syncs: list[Path] = []
+
+    def fake_run(cmd: list[str], cwd: Path, **kwargs: Any) -> subprocess.CompletedProcess[str]:
+        syncs.append(Path(cwd))
+        _make_venv(Path(cwd))
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    config = ProjectConfig(
+        project_name="cached", project_slug="cached", structure=ProjectStructure.SINGLE, init_git=False
+    )
+
+    generate_project(config, tmp_path / "first" / "cached")
+    generate_project(config, tmp_path / "second" / "cached")
+
+    assert syncs == [tmp_path / "first" / "cached"]
+    pth = tmp_path / "second" / "cached" / ".venv" / "lib" / "python3" / "site-packages" / "_demo.pth"
+    assert pth.read_text() == f"{tmp_path / 'second' / 'cached'}/src\n"
+
+
+def test_differently_named_monorepos_share_environment(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test that monorepos differing only in name hit one entry and get a lock with their own name."""
+    monkeypatch.setenv("MPM_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("MPM_VENV_CACHE", "1")
+    syncs: list[Path] = []
+
+    def fake_run(cmd: list[str], cwd: Path, **kwargs: Any) -> subprocess.CompletedProcess[str]:
+        syncs.append(Path(cwd))
+        _make_venv(Path(cwd))
+        (Path(cwd) / "uv.lock").write_text(f'[[package]]\nname = "{Path(cwd).name}"\n')
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    for name in ("alpha", "beta"):
+        config = ProjectConfig(project_name=name, project_slug=name, init_git=False)
+        generate_project(config, tmp_path / name)
+
+    assert syncs == [tmp_path / "alpha"]
+    assert len(list((tmp_path / "cache" / "venvs").iterdir())) == 1
+    assert (tmp_path / "beta" / "uv.lock").read_text() == '[[package]]\nname = "beta"\n'
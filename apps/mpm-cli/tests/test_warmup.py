@@ -0,0 +1,102 @@
+"""Tests for the background warm-up run during interactive prompts."""
+
+import subprocess
+from pathlib import Path
+from typing import Any, ClassVar
+
+import pytest
+
+from mpm import prompts
+from mpm.config import DocsTheme, LicenseType, ProjectStructure, PythonVersion
+from mpm.generators.renderer import get_renderer
+from mpm.generators.warmup import Warmup, warmup_templates
+
+
+class _FakePopen:
+    """Stand-in for subprocess.Popen recording the command and the placeholder project."""
+
+    instances: ClassVar[list["_FakePopen"]] = []
+
+    def __init__(self, cmd: list[str], cwd: Path, **kwargs: Any) -> None:
+        self.cmd = cmd
+        self.pyproject = (Path(cwd) / "pyproject.toml").read_text()
+        self.terminated = False
+        self.instances.append(self)
+
+    def poll(self) -> int | None:
+        return None if not self.terminated else -15
+
+    def wait(self) -> int:
+        return 0
+
+    def terminate(self) -> None:
+        self.terminated = True
+
+
+@pytest.fixture
+def fake_popen(monkeypatch: pytest.MonkeyPatch) -> list[_FakePopen]:
+    _FakePopen.instances = []
+    monkeypatch.setattr(subprocess, "Popen", _FakePopen)
+    return _FakePopen.instances
+
+
+def _answer_prompts(monkeypatch: pytest.MonkeyPatch, structure: ProjectStructure) -> None:
+    monkeypatch.setattr(prompts, "prompt_structure", lambda: structure)
+    monkeypatch.setattr(prompts, "prompt_python_version", lambda: PythonVersion.PY312)
+    monkeypatch.setattr(prompts, "prompt_features", lambda: {})
+    monkeypatch.setattr(prompts, "prompt_samples", lambda: False)
+    monkeypatch.setattr(prompts, "prompt_docs", lambda: (False, None))
+    monkeypatch.setattr(prompts, "prompt_license", lambda: LicenseType.MIT)
+    monkeypatch.setattr(prompts, "prompt_agents_md", lambda: True)
+
+
+def test_warmup_templates_follow_structure() -> None:
+    """Test that only the templates the chosen structure can render are compiled."""
+    monorepo = warmup_templates(ProjectStructure.MONOREPO)
+    single = warmup_templates(ProjectStructure.SINGLE)
+
+    assert "monorepo/libs/pyproject.toml.jinja" in monorepo
+    assert "single/__init__.py.jinja" not in monorepo
+    assert "single/__init__.py.jinja" in single
+    assert not any(name.startswith(("monorepo/", "samples/")) for name in single)
+    assert "base/pyproject.toml.jinja" in monorepo and "base/pyproject.toml.jinja" in single
+    assert all(name.endswith(".jinja") for name in monorepo)
+
+
+def test_prompts_start_warmup(monkeypatch: pytest.MonkeyPatch, fake_popen: list[_FakePopen]) -> None:
+    """Test that templates are compiled and the uv cache warmed while prompts are answered."""
+    _answer_prompts(monkeypatch, ProjectStructure.MONOREPO)
+    get_renderer.cache_clear()
+
+    with Warmup() as warmup:
+        config = prompts.gather_project_config("warm-project", warmup=warmup)
+
+    assert config.docs_theme == DocsTheme.MATERIAL
+    cache = get_renderer().env.cache
+    assert cache is not None
+    compiled = {name for _, name in cache.keys()}
+    assert set(warmup_templates(ProjectStructure.MONOREPO)) <= compiled
+    [process] = fake_popen
+    assert process.cmd == ["uv", "sync", "--all-packages", "--no-install-workspace"]
+    assert 'requires-python = ">=3.12"' in process.pyproject
+
+
+def test_warmup_without_sync_skips_uv(monkeypatch: pytest.MonkeyPatch, fake_popen: list[_FakePopen]) -> None:
+    """Test that --no-sync also disables the uv cache warm-up."""
+    _answer_prompts(monkeypatch, ProjectStructure.SINGLE)
+
+    with Warmup(sync=False) as warmup:
+        prompts.gather_project_config("warm-project", warmup=warmup)
+
+    assert fake_popen == []
+
+
+def test_interrupted_prompts_cancel_warmup(fake_popen: list[_FakePopen]) -> None:
+    """Test that Ctrl-C during a prompt stops the uv warm-up."""
+    with pytest.raises(KeyboardInterrupt), Warmup() as warmup:
+        warmup.warm_uv_cache(ProjectStructure.SINGLE, PythonVersion.PY313)
+        warmup.join()
+        raise KeyboardInterrupt
+
+    [process] = fake_popen
+    assert process.terminated
@@ -0,0 +1,107 @@
+"""Tests for offline generation from a local wheelhouse."""
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from mpm.cli import app
+from mpm.config import ProjectConfig, ProjectStructure, PythonVersion
+from mpm.generators.lockseed import build_lock_seed, seed_configs, seed_key
+from mpm.generators.project import generate_project, render_project
+from mpm.generators.sync import IndexOptions, uv_sync_command
+from mpm.generators.wheelhouse import build_requirements, fill_wheelhouse, parse_requirements
+from tests.conftest import FakeUv
+
+EXPORT_OUTPUT = """# This file was autogenerated by uv via the following command:
+#    uv export --format requirements-txt --no-hashes
+-e ./libs/greeter
+mypy==1.13.0
+    # via mpm-lock-seed
+ruff==0.8.0
+typing-extensions==4.12.2 ; python_full_version < '3.13'
+"""
+
+
+@pytest.fixture
+def fake_uv(fake_uv: FakeUv) -> FakeUv:
+    """The shared fake uv, exporting EXPORT_OUTPUT."""
+    fake_uv.export = EXPORT_OUTPUT
+    return fake_uv
+
+
+def test_index_options_args(tmp_path: Path) -> None:
+    """Test the uv arguments for offline mode and a wheelhouse."""
+    assert IndexOptions().args() == []
+    assert IndexOptions(offline=True).args() == ["--offline"]
+    assert IndexOptions(wheelhouse=tmp_path).args() == ["--find-links", str(tmp_path)]
+    assert uv_sync_command(True, index=IndexOptions(offline=True, wheelhouse=tmp_path)) == [
+        "uv",
+        "sync",
+        "--all-packages",
+        "--offline",
+        "--no-index",
+        "--find-links",
+        str(tmp_path),
+    ]
+
+
+def test_parse_requirements_and_build_requirements(make_config: Callable[..., ProjectConfig], tmp_path: Path) -> None:
+    """Test that exported pins and build backends make up the download list."""
+    assert parse_requirements(EXPORT_OUTPUT) == [
+        "mypy==1.13.0",
+        "ruff==0.8.0",
+        "typing-extensions==4.12.2 ; python_full_version < '3.13'",
+    ]
+    tree = render_project(make_config(with_samples=True), tmp_path)
+    assert build_requirements(tree) == ["hatchling", "hatch-una"]
+
+
+def test_fill_wheelhouse(fake_uv: FakeUv, tmp_path: Path) -> None:
+    """Test that the placeholder project is exported and its wheels downloaded for its Python version."""
+    config = seed_configs([PythonVersion.PY312])[0]
+    ok, message = fill_wheelhouse(config, tmp_path / "wheels")
+
+    assert ok, message
+    assert message == f"{seed_key(config)}: 4 requirements"
+    assert (tmp_path / "wheels" / "ruff-0.8.0-py3-none-any.whl").exists()
+    download = fake_uv.calls[-1]
+    assert download[download.index("--python-version") + 1] == "3.12"
+    assert "--all-packages" not in fake_uv.calls[0]
+    assert "ruff==0.8.0" in fake_uv.requirements
+
+
+def test_new_project_syncs_from_wheelhouse(
+    fake_uv: FakeUv, make_config: Callable[..., ProjectConfig], tmp_path: Path
+) -> None:
+    """Test that uv sync is pointed at the wheelhouse and lock seeds are not used."""
+    config = make_config(structure=ProjectStructure.SINGLE)
+    [seed_config] = [c for c in seed_configs([PythonVersion.PY312]) if seed_key(c) == seed_key(config)]
+    build_lock_seed(seed_config, tmp_path / "cache" / "locks")
+    wheels = tmp_path / "wheels"
+    wheels.mkdir()
+
+    generate_project(config, tmp_path / "test-app", index=IndexOptions(offline=True, wheelhouse=wheels))
+
+    assert not (tmp_path / "test-app" / "uv.lock").exists()
+    assert fake_uv.calls[-1] == ["uv", "sync", "--offline", "--no-index", "--find-links", str(wheels)]
+
+
+def test_new_rejects_missing_wheelhouse(cli_runner: CliRunner, temp_dir: Path) -> None:
+    """Test that --wheelhouse must be an existing directory."""
+    os.chdir(temp_dir)
+    result = cli_runner.invoke(app, ["new", "offline-app", "--offline", "--wheelhouse", "missing", "--no-git"])
+
+    assert result.exit_code == 1
+    assert "Wheelhouse not found" in result.stdout
+
+
+def test_wheelhouse_build_command(fake_uv: FakeUv, cli_runner: CliRunner, tmp_path: Path) -> None:
+    """Test that mpm wheelhouse build downloads wheels for every shape of the chosen Python version."""
+    result = cli_runner.invoke(app, ["wheelhouse", "build", str(tmp_path / "wheels"), "--python", "3.13"])
+
+    assert result.exit_code == 0, result.output
+    assert sum(cmd[:3] == ["uvx", "pip", "download"] for cmd in fake_uv.calls) == 9
+    assert "Wheelhouse ready: 1 wheels" in result.output
@@ -0,0 +1,93 @@
+"""Tests for the workspace index in .mpm/index."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import mpm.workspace
+from mpm.workspace import INDEX_PATH, WorkspaceIndex, workspace_members
+
+
+def _package(root: Path, path: str, name: str, dockerfile: bool = False) -> None:
+    directory = root / path
+    (directory / "tests").mkdir(parents=True)
+    (directory / "pyproject.toml").write_text(
+        f'[project]\nname = "{name}"\nversion = "0.1.0"\ndependencies = ["{name}-core"]\n'
+    )
+    if dockerfile:
+        (directory / "Dockerfile").write_text("FROM python:3.13\n")
+
+
+@pytest.fixture
+def reads(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Paths of the member directories read from the tree (rather than from the index)."""
+    paths: list[str] = []
+    original = mpm.workspace._read_member
+
+    def read_member(
+        directory: Path, path: str, kind: str, dir_stamp: list[int], pyproject_stamp: list[int]
+    ) -> mpm.workspace.WorkspaceMember:
+        paths.append(path)
+        return original(directory, path, kind, dir_stamp, pyproject_stamp)
+
+    monkeypatch.setattr(mpm.workspace, "_read_member", read_member)
+    return paths
+
+
+def test_index_records_members(tmp_path: Path) -> None:
+    """Test that libs and apps are recorded with their metadata, Dockerfile and tests."""
+    _package(tmp_path, "libs/core", "core")
+    _package(tmp_path, "apps/api", "api", dockerfile=True)
+    (tmp_path / "apps" / "notes").mkdir()
+
+    members = workspace_members(tmp_path)
+
+    assert [(m.path, m.kind, m.project_name) for m in members] == [
+        ("apps/api", "app", "api"),
+        ("libs/core", "lib", "core"),
+    ]
+    [api] = workspace_members(tmp_path, "app")
+    assert api.has_dockerfile and api.has_tests and api.dependencies == ["api-core"]
+    data = json.loads((tmp_path / INDEX_PATH).read_text())
+    assert {entry["path"] for entry in data["members"]} == {"apps/api", "apps/notes", "libs/core"}
+
+
+def test_index_updates_incrementally(tmp_path: Path, reads: list[str]) -> None:
+    """Test that only new or changed members are read again."""
+    _package(tmp_path, "libs/core", "core")
+    _package(tmp_path, "apps/api", "api")
+    workspace_members(tmp_path)
+    assert sorted(reads) == ["apps/api", "libs/core"]
+
+    reads.clear()
+    assert not WorkspaceIndex(tmp_path).refresh()
+    assert reads == []
+
+    (tmp_path / "apps" / "api" / "Dockerfile").write_text("FROM python:3.13\n")
+    _package(tmp_path, "libs/billing", "billing")
+    members = {m.path: m for m in workspace_members(tmp_path)}
+    assert sorted(reads) == ["apps/api", "libs/billing"]
+    assert members["apps/api"].has_dockerfile
+
+    reads.clear()
+    pyproject = tmp_path / "libs" / "core" / "pyproject.toml"
+    pyproject.write_text(pyproject.read_text().replace("0.1.0", "0.2.0"))
+    members = {m.path: m for m in workspace_members(tmp_path)}
+    assert reads == ["libs/core"]
+    assert members["libs/core"].version == "0.2.0"
+
+
+def test_index_drops_removed_members_and_survives_corruption(tmp_path: Path) -> None:
+    """Test that deleted packages disappear and an unreadable index is rebuilt."""
+    _package(tmp_path, "libs/core", "core")
+    _package(tmp_path, "libs/old", "old")
+    workspace_members(tmp_path)
+
+    (tmp_path / "libs" / "old" / "pyproject.toml").unlink()
+    (tmp_path / "libs" / "old" / "tests").rmdir()
+    (tmp_path / "libs" / "old").rmdir()
+    assert [m.path for m in workspace_members(tmp_path)] == ["libs/core"]
+
+    (tmp_path / INDEX_PATH).write_text("{not json")
+    assert [m.path for m in workspace_members(tmp_path)] == ["libs/core"]